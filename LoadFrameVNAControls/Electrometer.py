@@ -10,7 +10,6 @@ Keitheley 6514 Electrometer: http://www.tunl.duke.edu/documents/public/electroni
 """
 
 # IMPORTS ===================================================================
-import visa
 import numpy as np
 import matplotlib.pyplot as plt
 import datetime
@@ -26,20 +25,23 @@ class Electrometer(instr.Instrument):
     6514 Electrometer where the user may set up an automated design of experiment.
 
     Attributes:
-        _rm                 : ResourceManager   : instance of visa's Resource Manager class
-        _instr              : Resource          : instrument, 6514 Electrometer in this case
+        _rm                 : ResourceManager   : visa's Resource Manager, shared by every instrument (see instrument.py)
+        _instr              : BatchedSession    : instrument, 6514 Electrometer in this case, shared with every instance using the same resource
     """
 
 
-    def __init__(self,start=None,stop=None,delay=None,sParam=None,trials=None,format='mlogarithmic'):
+    def __init__(self,start=None,stop=None,delay=None,sParam=None,trials=None,format='mlogarithmic',resource=None):
         """
         Constructor that initializes attributes of Experiment instance.
         By default the data format is 'mlogarithmic'.
 
         Parameters:
+                resource    : str   : VISA resource name of the electrometer (e.g. 'GPIB8::14::INSTR'),
+                                      there is no default so the VNA (GPIB8::1) is never opened by mistake
         """
-        self._rm = visa.ResourceManager()
-        self._instr = self._rm.open_resource('GPIB8::1::INSTR')
+        assert resource is not None, "give the VISA resource name of the electrometer"
+        self._rm = instr.getResourceManager()
+        self._instr = instr.openSession(resource)     # same session as any other instance on this resource
     
 
     def _configInst(self):
@@ -51,13 +53,15 @@ class Electrometer(instr.Instrument):
         self._instr.encoding = 'latin_1'
         self._instr.write_termination = None
         self._instr.read_termination = '\n'
-        print(self._instr.query('*idn?'))
+        print(self._instr.identify())
         self._instr.write('*rst')   # turns instrument settings to factory default
         self._instr.write('*cls')   # Clears these analyzer status data structures: 
                                     # Event Queue, Status Byte Register (except the MAV bit), Standard Event Status Register (SESR)
 
         self._instr.write('abort')  # Aborts the current measurement and changes the trigger sequence to idle state for all channel
+        self._instr.flush()         # *rst, *cls and abort go out as one message, which also clears the settings cached on the session
 
 # Execution =============================================
-test = Electrometer()
-test._configInst()
+if __name__ == "__main__":
+    test = Electrometer(resource='GPIB8::14::INSTR')     # 14 is the 6514's factory GPIB address
+    test._configInst()
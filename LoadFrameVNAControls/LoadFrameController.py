@@ -36,6 +36,8 @@ For confusions/questions/complaints: contact bvv4@cornell.edu
 import ttrvna as vna
 import pyMotorControl as mc
 import pyLoadControl as lc
+import touchstone as ts
+import forceControl as fc
 import matplotlib as plt
 import time
 import serial
@@ -57,11 +59,17 @@ class Controller(object):
         loadAvg         : int > 0       : number of samples to take for each load cell average
         forceStep       : float/int > 0 : if stepping by force, this is the step size
         _ser            : Serial        : establishes serial communication for experiment
+        touchstone      : tuple of str  : S parameters written to a Touchstone file each load step, None for a normal sweep
+        _series         : TouchstoneSeries : writes the Touchstone file and index of each load step
+        streaming       : bool          : True if the load cell streams its readings, see LoadCell.startStreaming
+        forceControl    : ForceController : reaches the force of each step when stepping by force, see forceControl.py
+        _forceSamples   : int           : samples per force control measurement, None to follow loadAvg
     """
 
 
     def __init__(self,com,start=None,stop=None,delay=None,sParam=None,trials=None,format='mlogarithmic',
-                            stepSize=1,degrees=1,byStep=False,baseStep=None,loadAvg=3,forceStep=None):
+                            stepSize=1,degrees=1,byStep=False,baseStep=None,loadAvg=3,forceStep=None,
+                            touchstone=None,touchstoneForm='RI',resource='GPIB8::1::INSTR',streaming=False):
         """
         Constructor that initializes attributes of Controller instance
         
@@ -79,22 +87,29 @@ class Controller(object):
                 baseStep        : float > 0         : sets base step size at full step in degrees
                 loadAvg         : int > 0           : number of samples to take for each load cell average
                 forceStep       : float/int > 0     : if stepping by force, this is the step size in N
+                touchstone      : tuple of str      : S parameters to write as one Touchstone file per load step, see setTouchstone
+                touchstoneForm  : str               : 'RI' or 'MA', form of the Touchstone files
+                resource        : str               : VISA resource name of the VNA (e.g. 'SIM::TTR506A' for the simulated one)
+                streaming       : bool              : True to have the load cell stream its readings (needs the streaming firmware)
         """
-        self.setVNA(start=start,stop=stop,delay=delay,sParam=sParam,trials=trials,format=format)
+        self.setVNA(start=start,stop=stop,delay=delay,sParam=sParam,trials=trials,format=format,resource=resource)
         self._ser = serial.Serial(com,9800,timeout=1)
         self.setMotor(self._ser,stepSize,baseStep)
         self.setDegrees(degrees)
         self.setByStep(byStep)
         self.setLoadcell(self._ser)
         self.setLoadAvg(loadAvg)
+        self.setStreaming(streaming)
+        self.setForceControl()
 
         if trials is not None:
             self.setTrials(trials)
             if forceStep is not None:
                 self.setForceStep(forceStep)
+        self.setTouchstone(touchstone,touchstoneForm)
             
 
-    def setVNA(self,start,stop,delay,sParam,trials,format):
+    def setVNA(self,start,stop,delay,sParam,trials,format,resource='GPIB8::1::INSTR'):
         """
         Setter for vna attribute to control VNA.
         Preconditions are enforced in Ttrvna class
@@ -106,8 +121,9 @@ class Controller(object):
                 sParam       : str               : determines which S Parameter is measured
                 trials       : int > 0           : determines the number of trials/sweeps
                 format       : str               : determines format for the data to be outputted into
+                resource     : str               : VISA resource name of the VNA
         """
-        self.vna = vna.Ttrvna(start=start,stop=stop,delay=delay,sParam=sParam,trials=trials,format=format)
+        self.vna = vna.Ttrvna(start=start,stop=stop,delay=delay,sParam=sParam,trials=trials,format=format,resource=resource)
 
 
     def setMotor(self,ser,stepSize,baseStep=None):
@@ -187,6 +203,8 @@ class Controller(object):
         assert loadAvg > 0
 
         self.loadAvg = loadAvg
+        if hasattr(self,'forceControl') and self._forceSamples is None:
+            self.forceControl.samples = loadAvg
     
 
     def setForceStep(self, forceStep):
@@ -204,64 +222,124 @@ class Controller(object):
         self.forceStep = forceStep
 
 
+    def setStreaming(self,streaming):
+        """
+        Setter for the streaming mode of the load cell. When streaming,
+        every load measurement averages the next loadAvg readings the
+        Arduino sends, so it takes a fraction of a second instead of
+        requesting each sample and sleeping.
+
+        Parameters:
+                streaming : bool : True to stream
+        """
+        assert type(streaming) == bool
+        if streaming:
+            if self.loadcell._reader is None:
+                self.loadcell.startStreaming()
+        else:
+            self.loadcell.stopStreaming()
+        self.streaming = streaming
+
+
+    def setForceControl(self,**settings):
+        """
+        Setter for the closed-loop force control used by tuneForForce.
+        Its measurements take loadAvg samples, also after setLoadAvg,
+        unless samples is given.
+
+        Example: setForceControl(stiffness=0.5, tolerance=0.5, ki=0.1)
+
+        Parameters:
+                settings : keywords : settings of ForceController, see forceControl.py
+        """
+        self._forceSamples = settings.get('samples')
+        settings.setdefault('samples',self.loadAvg)
+        self.forceControl = fc.ForceController(self.motor,self.loadcell,**settings)
+
+
+    def _measureLoad(self,record=True):
+        """
+        Takes the load measurement of a step. When streaming, only readings
+        that arrive after the call count, so the motor has finished moving.
+
+        Return: the average force as float
+
+        Parameters:
+                record : bool : True to record it in loadcell.data as well
+        """
+        if self.streaming:
+            return self.loadcell.takeMeasurement(self.loadAvg,record,since=time.time())
+        return self.loadcell.takeMeasurement(self.loadAvg,record)
+
+
+    def setTouchstone(self,sParams,form='RI'):
+        """
+        Setter for the Touchstone mode. With sParams set, each load step
+        measures all of them in one sweep (Ttrvna.makeSweepMulti) and writes
+        them to one Touchstone file in Touchstone/ (.s1p for one S parameter,
+        .s2p for all four), plus an index csv with the step, trial, and
+        force of every file. The VNA format must carry the complex
+        S parameter (e.g. 'polar'), see touchstone.py.
+
+        Parameters:
+                sParams : tuple of str  : ('S21',) or ('S11','S21','S12','S22'), None for a normal sweep
+                form    : str           : 'RI' or 'MA'
+        """
+        if sParams is not None:
+            assert len(sParams) in [1,4]
+            self._series = ts.TouchstoneSeries('Touchstone/',self.vna.getDateFormatted(precise=True),form,columns=['force'])
+        else:
+            self._series = None
+        self.touchstone = sParams
+
+
+    def _sweepLoadStep(self):
+        """
+        Takes the VNA measurement of a load step, as a normal sweep or as
+        a Touchstone file with the force of the step if setTouchstone was used.
+        """
+        if self.touchstone is None:
+            self.vna.makeSweep()
+        else:
+            sweeps = self.vna.makeSweepMulti(self.touchstone)
+            self._series.write(sweeps,force=self.loadcell.store.latest(recorded=True))
+
+
     def tuneForForce(self,forceDesired):
         """
         Turns the motor until the desired force is reached 
-        and read by the load cell.
-        Gets desired force within 1 N. 
+        and read by the load cell, with the closed-loop
+        force control (see setForceControl).
+        Gets desired force within its tolerance (1 N by default).
+
+        Return: the force reached as float
         """
         assert type(forceDesired) == int or float
-        min = forceDesired - 1
-        max = forceDesired + 1
-        self.loadcell.doRead()
-        time.sleep(1)
-        self.loadcell.takeMeasurement(self.loadAvg,False)
-        current = self.loadcell.allData[len(self.loadcell.allData)-1][1]
-        time.sleep(3)
-
-        # Step forward until load cell reading is greater than min
-        while current <= min or current >= max:
-            if current <= min:
-                print('less')
-                print(current)
-                self.motor.doStep()
-                time.sleep(1)
-                self.loadcell.takeMeasurement(self.loadAvg,False)
-                current = self.loadcell.allData[len(self.loadcell.allData)-1][1]
-        # Step backward until load cell reading is less than max
-            if current >= max:
-                print('greater')
-                self.motor.changeDirection()
-                print(current)
-                self.motor.doStep()
-                time.sleep(1)
-                self.loadcell.takeMeasurement(self.loadAvg,False)
-                current = self.loadcell.allData[len(self.loadcell.allData)-1][1]          
-                self.motor.changeDirection()
+        return self.forceControl.tune(forceDesired)['force']
 
         
     def runByDeg(self):
         """
         Runs the experiment by stepping by degrees after a controller has been constructed 
         """
-        # Dud trial to set up the experiment because first trial is always incorrect with this set up
-        self.vna.makeSweep()    
         print('Beginning Collection')
         if self.byStep:
             for _ in range(self.trials):
-                self.loadcell.takeMeasurement(self.loadAvg)
+                self._measureLoad()
                 time.sleep(2)
-                self.vna.makeSweep()
+                self._sweepLoadStep()
                 time.sleep(1)
                 self.motor.doStep()
         else:
             for _ in range(self.trials):
-                self.loadcell.takeMeasurement(self.loadAvg)
+                self._measureLoad()
                 time.sleep(2)
-                self.vna.makeSweep()
+                self._sweepLoadStep()
                 time.sleep(5)
                 self.motor.turnByDeg(self.degrees)
                 time.sleep(1)
+        self.vna.flushOutput()
+        self.vna.renderDeferredPlots()
         self.loadcell.saveData()
         print('Done!')
 
@@ -270,17 +348,16 @@ class Controller(object):
         """
         Runs the experiment by stepping by force after a controller has been constructed 
         """
-        # Dud trial to set up the experiment because first trial is always incorrect with this set up
         assert self.trials is not None
         assert self.forceStep is not None
-        self.vna.makeSweep() 
-        forceDesired = 0
-        for _ in range(0,self.trials*self.forceStep,self.forceStep):
+        for forceDesired in range(0,self.trials*self.forceStep,self.forceStep):
             self.tuneForForce(forceDesired)
-            self.loadcell.takeMeasurement(self.loadAvg)
+            self._measureLoad()
             time.sleep(2)
-            self.vna.makeSweep()
+            self._sweepLoadStep()
             time.sleep(5)
+        self.vna.flushOutput()
+        self.vna.renderDeferredPlots()
         self.loadcell.saveData()
         print('Done!')
         
@@ -0,0 +1,370 @@
+"""
+arduinoSimulator
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the ArduinoSimulator class which stands in for the
+Arduino of the load frame. It opens a pseudo-terminal pair and answers
+on it the way the firmware does, so LoadCell, Motor, and Controller can
+be run through pyserial without the hardware:
+
+    R   : reads the HX711 and sends the force as 14 bytes of fixed-width ascii
+    S   : steps the motor once
+    D   : changes the direction of the motor
+    H   : turns the motor half a turn
+    P   : switches the polarity relay (PowSup.changePolarity)
+    C   : starts streaming: every HX711 conversion is sent like a reading
+    B   : starts streaming every conversion as a binary frame, see loadCellProtocol.py
+    X   : stops streaming
+
+The force is taken from a stiffness curve at the position the motor has
+moved the crosshead to. Readings wait for the HX711 conversions and
+steps take as long as at the real step rate; with speed > 1 everything
+runs that many times faster than real time. Like the Uno, the board
+resets when the port is opened: bytes sent while it boots are lost, and
+then it sends its greeting.
+
+Pseudo-terminals only exist on Linux and macOS, so the simulator does
+not run on Windows.
+
+Example:
+    with ArduinoSimulator(stiffness=50, speed=10) as arduino:
+        loadcell = LoadCell(arduino.connect())
+        ...
+"""
+
+# IMPORTS ===================================================================
+import os
+import select
+import threading
+import time
+import numpy as np
+import serial
+import loadCellProtocol as lcp
+try:
+    import pty
+    import termios
+    import tty
+except ImportError:                                                     # Windows has no pseudo-terminals
+    pty = termios = tty = None
+
+
+# Sent once when the firmware starts, LoadCell reads it before measuring
+GREETING = b'Load cell ready\r\n'
+
+
+# ArduinoSimulator ==========================================================
+
+class ArduinoSimulator(object):
+    """
+    Simulated Arduino with HX711 load cell amplifier, stepper driver, and
+    polarity relay, on a pseudo-terminal. Commands are handled one at a
+    time in a background thread, so like the firmware a command sent
+    while a reading or a half turn is in progress waits for it.
+
+    Attributes:
+            stepRate        : float > 0     : motor steps per second
+            stepsPerHalfTurn: int > 0       : steps made by H
+            mmPerStep       : float > 0     : crosshead travel per step in mm
+            hx711Rate       : float > 0     : HX711 conversions per second (10 or 80 on the board)
+            samplesPerRead  : int > 0       : conversions averaged by the firmware for each R
+            noise           : float >= 0    : standard deviation of the force noise in N
+            speed           : float > 0     : how many times faster than real time the simulation runs
+            bootTime        : float >= 0    : seconds the board takes to boot after the port is opened
+            position        : int           : motor position in steps from the start
+            direction       : int           : +1 or -1, the direction S and H move in
+            polarity        : int           : +1 or -1, state of the polarity relay
+            streaming       : str           : 'ascii' or 'framed' while every conversion is sent, None otherwise
+            countsPerNewton : float         : raw HX711 counts per N in the frames
+            rawOffset       : int           : raw HX711 value at 0 N in the frames
+            commands        : dict          : number of each command received
+            resets          : int           : times the board was reset by the port being opened
+            port            : str           : name of the serial port to open, None until started
+            _force          : function      : force in N at a crosshead position in mm
+            _master         : int           : file descriptor of the simulator's end of the pseudo-terminal
+            _slave          : int           : file descriptor of the port's end, kept open so the port exists
+            _attributes     : list          : terminal settings of the port while nobody has opened it
+            _thread         : Thread        : handles the commands
+            _stop           : Event         : set to stop the thread
+            _started        : float         : perf_counter time the simulation started
+            _random         : RandomState   : noise of the readings
+            _conversion     : int           : number of the last conversion sent while streaming
+            _sequence       : int           : sequence number of the next frame
+    """
+
+    def __init__(self,stiffness=50.0,stepRate=200.0,stepsPerHalfTurn=100,mmPerStep=0.01,
+                            hx711Rate=10.0,samplesPerRead=1,noise=0.05,speed=1.0,bootTime=1.6,
+                            countsPerNewton=1000.0,rawOffset=8000,seed=0):
+        """
+        Constructor that initializes attributes of ArduinoSimulator instance.
+
+        Parameters:
+                stiffness       : float, tuple or function  : N/mm of a linear spring, (positions in mm, forces in N)
+                                                              interpolated between, or a function of the position in mm
+                stepRate        : float > 0     : motor steps per second
+                stepsPerHalfTurn: int > 0       : steps made by H (100 for a 1.8 degree motor at full step)
+                mmPerStep       : float > 0     : crosshead travel per step in mm
+                hx711Rate       : float > 0     : HX711 conversions per second
+                samplesPerRead  : int > 0       : conversions averaged for each reading
+                noise           : float >= 0    : standard deviation of the force noise in N
+                speed           : float > 0     : how many times faster than real time the simulation runs
+                bootTime        : float >= 0    : seconds the board takes to boot after the port is opened
+                countsPerNewton : float         : raw HX711 counts per N in the frames
+                rawOffset       : int           : raw HX711 value at 0 N in the frames
+                seed            : int           : seed of the noise
+        """
+        assert stepRate > 0 and hx711Rate > 0 and mmPerStep > 0 and speed > 0 and noise >= 0 and bootTime >= 0
+        assert type(stepsPerHalfTurn) == int and stepsPerHalfTurn > 0
+        assert type(samplesPerRead) == int and samplesPerRead > 0
+        self.stepRate = stepRate
+        self.stepsPerHalfTurn = stepsPerHalfTurn
+        self.mmPerStep = mmPerStep
+        self.hx711Rate = hx711Rate
+        self.samplesPerRead = samplesPerRead
+        self.noise = noise
+        self.speed = speed
+        self.bootTime = bootTime
+        self.countsPerNewton = countsPerNewton
+        self.rawOffset = rawOffset
+        self.setStiffness(stiffness)
+        self.position = 0
+        self.direction = 1
+        self.polarity = 1
+        self.streaming = None
+        self._conversion = -1
+        self._sequence = 0
+        self.commands = {}
+        self.resets = 0
+        self.port = None
+        self._master = None
+        self._slave = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._started = time.perf_counter()
+        self._random = np.random.RandomState(seed)
+
+
+    def setStiffness(self,stiffness):
+        """
+        Setter for the force the load cell reads at each crosshead position.
+
+        Example: stiffness = 50 (N/mm), ([0, 1, 2], [0, 20, 100]), or lambda x: 30*x**1.5
+        """
+        if callable(stiffness):
+            self._force = stiffness
+        elif isinstance(stiffness, tuple):
+            positions, forces = (np.asarray(values, dtype=np.float64) for values in stiffness)
+            assert len(positions) == len(forces) > 1
+            self._force = lambda position: float(np.interp(position, positions, forces))
+        else:
+            assert stiffness >= 0
+            self._force = lambda position: stiffness*position
+
+
+    # PORT ==================================================================
+
+    def start(self):
+        """
+        Opens the pseudo-terminal and starts handling commands.
+
+        Return: name of the port to open as str
+        """
+        assert pty is not None, "pseudo-terminals are not available on this system"
+        assert self._thread is None, "already started"
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)                                         # no echo or line editing, bytes as sent
+        self._attributes = termios.tcgetattr(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._started = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='ArduinoSimulator', daemon=True)
+        self._thread.start()
+        return self.port
+
+
+    def stop(self):
+        """
+        Stops handling commands and closes the pseudo-terminal.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        os.close(self._master)
+        os.close(self._slave)
+        self._master = self._slave = None
+
+
+    def connect(self,baudrate=9800,timeout=1):
+        """
+        Opens the port like the Controller does.
+
+        Return: Serial
+        """
+        if self._thread is None:
+            self.start()
+        return serial.Serial(self.port, baudrate, timeout=timeout)
+
+
+    def __enter__(self):
+        """
+        Starts the simulator for a with block.
+        """
+        self.start()
+        return self
+
+
+    def __exit__(self,*args):
+        """
+        Stops the simulator at the end of a with block.
+        """
+        self.stop()
+
+
+    # FIRMWARE ==============================================================
+
+    def force(self):
+        """
+        Gets the force at the current position, without noise.
+
+        Return: force in N as float
+        """
+        return self._force(self.position*self.mmPerStep)
+
+
+    def elapsed(self):
+        """
+        Gets the simulated time since the simulator started.
+
+        Return: seconds as float
+        """
+        return (time.perf_counter() - self._started)*self.speed
+
+
+    def _run(self):
+        """
+        Handles the commands that come in until stop() is called.
+        """
+        while not self._stop.is_set():
+            if termios.tcgetattr(self._slave) != self._attributes:              # the port was opened and set up
+                self._boot()
+            wait = 0.05
+            if self.streaming:
+                wait = min(wait, self._streamConversion()/self.speed)
+            ready, _, _ = select.select([self._master], [], [], wait)
+            if not ready or termios.tcgetattr(self._slave) != self._attributes:     # opened while waiting: boot first,
+                continue                                                            # which drops what was sent
+            try:
+                received = os.read(self._master, 64)
+            except OSError:
+                return
+            for byte in received:
+                self._handle(chr(byte))
+
+
+    def _boot(self):
+        """
+        Resets the board like opening the port does on an Uno: the motor
+        direction and the relay go back to their defaults (the crosshead
+        stays where it is), what is sent while it boots is lost, and then
+        the greeting is sent.
+        """
+        self.resets += 1
+        self.direction = 1
+        self.polarity = 1
+        self.streaming = None
+        self._sleep(self.bootTime)
+        while select.select([self._master], [], [], 0)[0]:
+            os.read(self._master, 1024)
+        tty.setraw(self._slave)                                         # so the next open is noticed too
+        self._attributes = termios.tcgetattr(self._slave)
+        self._write(GREETING)
+
+
+    def _handle(self,command):
+        """
+        Carries out one command; anything else is ignored like the firmware does.
+        """
+        self.commands[command] = self.commands.get(command, 0) + 1
+        if command == 'R':
+            self._write(('%12.3f\r\n' % self._read()).encode('latin_1'))
+        elif command == 'S':
+            self._step(1)
+        elif command == 'H':
+            self._step(self.stepsPerHalfTurn)
+        elif command == 'D':
+            self.direction = -self.direction
+        elif command == 'P':
+            self.polarity = -self.polarity
+        elif command in ('C','B'):
+            self.streaming = 'ascii' if command == 'C' else 'framed'
+            self._conversion = int(np.floor(self.elapsed()*self.hx711Rate))     # from the next conversion on
+        elif command == 'X':
+            self.streaming = None
+
+
+    def _read(self):
+        """
+        Waits for samplesPerRead HX711 conversions, which come at a fixed
+        rate from when the board started, and averages them.
+
+        Return: force in N as float
+        """
+        period = 1/self.hx711Rate
+        now = self.elapsed()
+        ready = (np.floor(now/period) + self.samplesPerRead)*period      # next conversion, then the rest
+        self._sleep(ready - now)
+        samples = self.force() + self.noise*self._random.standard_normal(self.samplesPerRead)
+        return float(np.mean(samples))
+
+
+    def _streamConversion(self):
+        """
+        Sends the latest conversion if it was not sent yet. Conversions
+        made while the firmware was busy (stepping) are lost, like the
+        HX711 overwrites them.
+
+        Return: simulated seconds until the next conversion as float
+        """
+        period = 1/self.hx711Rate
+        now = self.elapsed()
+        conversion = int(np.floor(now/period))
+        if conversion > self._conversion:
+            self._conversion = conversion
+            force = self.force() + self.noise*self._random.standard_normal()
+            if self.streaming == 'ascii':
+                self._write(('%12.3f\r\n' % force).encode('latin_1'))
+            else:
+                raw = int(round(force*self.countsPerNewton)) + self.rawOffset
+                raw = min(max(raw, -2**23), 2**23 - 1)                          # the HX711 saturates
+                self._write(lcp.encodeFrames([self._sequence], [raw], [int(conversion*period*1e6)]))
+                self._sequence += 1
+        return (conversion + 1)*period - now
+
+
+    def _step(self,steps):
+        """
+        Moves the motor steps steps in the current direction at the step rate.
+        """
+        for _ in range(steps):
+            self._sleep(1/self.stepRate)
+            self.position += self.direction
+
+
+    def _sleep(self,seconds):
+        """
+        Waits seconds of simulated time, less if stop() is called.
+        """
+        if seconds > 0:
+            self._stop.wait(seconds/self.speed)
+
+
+    def _write(self,answer):
+        """
+        Sends an answer to the port.
+        """
+        try:
+            os.write(self._master, answer)
+        except OSError:
+            pass
@@ -0,0 +1,317 @@
+"""
+benchmarks
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains benchmarks for the data handling in ttrvna.py
+that do not need the VNA to be connected; the acquisition benchmark
+runs against the simulated VNA of simulatedVNA.py and the force control
+benchmark against the simulated Arduino of arduinoSimulator.py. Run it
+directly to print a timing table for each benchmark.
+"""
+
+# IMPORTS ===================================================================
+import os
+import tempfile
+import time
+import numpy as np
+import ttrvna as vna
+import plotting
+import simulatedVNA as sim
+import loadCellProtocol as lcp
+import arduinoSimulator as ard
+import pyLoadControl as lc
+import pyMotorControl as mc
+import forceControl as fc
+
+
+# HELPER FUNCTIONS ==========================================================
+
+def bestOf(func, arg, repeats=3):
+    """
+    Times func(arg) repeats times and keeps the fastest run so that
+    other programs running on the PC do not skew the result.
+
+    Return: fastest run time in seconds as float
+
+    Parameters:
+            func    : function  : what is timed
+            arg     : any       : argument passed to func
+            repeats : int > 0   : number of times func is run
+    """
+    assert type(repeats) == int
+    assert repeats > 0
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def makeFdataPayload(points):
+    """
+    Makes a payload like the one the TTR506A sends for
+    calculate1:selected:data:fdata? in ascii mode, two numbers per point.
+
+    Return: payload as bytes
+
+    Parameters:
+            points : int > 0 : number of points in the trace
+    """
+    values = np.random.randn(2*points)*10
+    return ','.join('%.11E' % value for value in values).encode('latin_1')
+
+
+def listifyLegacy(initial):
+    """
+    The original Ttrvna._listify, kept here so the new parser can be
+    compared against it. Slices off the rest of the string after every
+    comma, which is quadratic in the length of the payload.
+
+    Return: listified version of initial
+
+    Parameters:
+            initial : str : this is what is listified
+    """
+    listified = []
+
+    while ',' in initial:
+            pos = initial.find(',')
+            listified.append(initial[0:pos])
+            initial = initial[pos+1:]
+            if ',' not in initial:
+                    listified.append(initial)
+    final = []
+    for item in listified:
+            final.append(float(item))
+    return final
+
+
+# BENCHMARKS ================================================================
+
+def benchParser(pointCounts=(201, 10001, 100001)):
+    """
+    Compares Ttrvna._parseFdata against the original _listify for
+    traces of the given point counts. The legacy parser is only run
+    once for large traces since it takes tens of seconds at 100001 points.
+
+    Parameters:
+            pointCounts : tuple of int > 0 : trace lengths to benchmark
+    """
+    print('fdata parser: points, payload bytes, legacy (s), new (s), speed up')
+    for points in pointCounts:
+        payload = makeFdataPayload(points)
+        text = payload.decode('latin_1')
+        assert np.allclose(listifyLegacy(text), vna.Ttrvna._parseFdata(payload))
+
+        repeats = 3 if points <= 10001 else 1
+        legacy = bestOf(listifyLegacy, text, repeats)
+        new = bestOf(vna.Ttrvna._parseFdata, payload, 5)
+        print('%8d %10d %12.6f %12.6f %10.1fx' % (points, len(payload), legacy, new, legacy/new))
+
+
+def benchPlotting(sweeps=20, points=10001):
+    """
+    Compares the time per png of each way a sweep can be plotted:
+    a new figure per sweep, one reused figure, and deferred rendering
+    of all sweeps at the end in a process pool. The pngs are written
+    to a temporary directory that is removed afterwards.
+
+    Parameters:
+            sweeps  : int > 0 : number of pngs made by each strategy
+            points  : int > 0 : number of points in each sweep
+    """
+    freqDomain = np.linspace(50e6, 6e9, points)
+    traces = [np.random.randn(points).cumsum() for _ in range(sweeps)]
+
+    print('png rendering: strategy, total (s), per sweep (ms) for %d sweeps of %d points' % (sweeps, points))
+    with tempfile.TemporaryDirectory() as directory:
+        names = [os.path.join(directory, '%d.png' % i) for i in range(sweeps)]
+
+        start = time.perf_counter()
+        for trace, name in zip(traces, names):
+            plotting.renderSweepPlot(freqDomain, trace, name)
+        new = time.perf_counter() - start
+
+        plot = plotting.ReusablePlot()
+        start = time.perf_counter()
+        for trace, name in zip(traces, names):
+            plot.render(freqDomain, trace, name)
+        reuse = time.perf_counter() - start
+
+        start = time.perf_counter()
+        plotting.renderDeferred([(freqDomain, trace, name) for trace, name in zip(traces, names)])
+        deferred = time.perf_counter() - start
+
+    for strategy, total in (('new', new), ('reuse', reuse), ('deferred', deferred)):
+        print('%-10s %10.3f %12.1f' % (strategy, total, 1000*total/sweeps))
+
+
+def benchAcquisition(pointCounts=(201, 1601, 10001), sweeps=20, sweepTime=0.0):
+    """
+    Times makeSweep against the simulated VNA for each transfer mode, so
+    everything on the computer's side of a sweep (configuration, completion,
+    transfer, parsing) is measured without the instrument. With sweepTime 0
+    the simulated sweeps take no time and only the overhead is left; no
+    files are written.
+
+    Parameters:
+            pointCounts : tuple of int > 1  : points of the sweeps
+            sweeps      : int > 0           : sweeps timed for each setting
+            sweepTime   : float >= 0        : seconds each simulated sweep takes
+    """
+    print('acquisition: points, transfer, per sweep (ms), sweeps/s, messages per sweep')
+    for points in pointCounts:
+        for transfer in ('real64', 'real32', 'ascii'):
+            resource = sim.register('SIM::BENCH%d%s' % (points, transfer), points=points, sweepTime=sweepTime)
+            test = vna.Ttrvna(start='50 MHz', stop='6 GHz', delay='0s', sParam='S21', trials=sweeps,
+                                transfer=transfer, writers=0, plotMode='none', outputs=(),
+                                resource=resource, points=points)
+            test.makeSweep()                                                    # configures the simulated VNA
+            simulated = test._instr._resource
+            messages = simulated.messages
+            start = time.perf_counter()
+            for _ in range(sweeps):
+                test.makeSweep()
+            elapsed = time.perf_counter() - start
+            print('%8d %8s %12.3f %10.1f %8.1f' % (points, transfer, 1000*elapsed/sweeps, sweeps/elapsed,
+                                                    (simulated.messages - messages)/sweeps))
+
+
+def benchCompletion(sweeps=3, sweepTime=0.05, delay=0.5):
+    """
+    Measures the time per trial of run() against the simulated VNA with
+    the fixed sleeps used before completion was detected (1 s before each
+    sweep, and the sweep delay again after it) and without them, so the
+    time saved is measured rather than taken from the length of the sleeps.
+
+    Parameters:
+            sweeps      : int > 0       : trials timed each way
+            sweepTime   : float >= 0    : seconds each simulated sweep takes
+            delay       : float >= 0    : sweep delay in seconds
+    """
+    print('completion: method, per trial (s), saved per trial (s)')
+    resource = sim.register('SIM::BENCHCOMPLETION', points=201, sweepTime=sweepTime)
+    test = vna.Ttrvna(start='50 MHz', stop='6 GHz', delay=str(delay), sParam='S21', trials=1,
+                        writers=0, plotMode='none', outputs=(), resource=resource)
+    test.makeSweep()                                                        # configures the simulated VNA
+
+    def legacy(_):
+        for _ in range(sweeps):
+            time.sleep(1)                                                   # sleep after defining the parameter
+            test.run()
+            time.sleep(delay)                                               # sweep delay slept again in run()
+
+    def completion(_):
+        for _ in range(sweeps):
+            test.run()
+
+    legacyTime = bestOf(legacy, None, 1)/sweeps
+    completionTime = bestOf(completion, None, 1)/sweeps
+    print('%-12s %10.3f' % ('fixed sleeps', legacyTime))
+    print('%-12s %10.3f %10.3f' % ('completion', completionTime, legacyTime - completionTime))
+
+
+def benchLoadCellProtocol(samples=100000, baudrate=9600, chunk=256):
+    """
+    Compares the ascii readings of the load cell with the binary frames
+    of loadCellProtocol.py: bytes per reading, the most readings per second
+    the serial port can carry (10 bits per byte), and how fast each is
+    decoded when read in chunks like the streaming reader does.
+
+    Parameters:
+            samples     : int > 0   : readings decoded by each
+            baudrate    : int > 0   : baud rate of the port
+            chunk       : int > 0   : bytes handed to the decoder at a time
+    """
+    forces = np.random.randn(samples)*100
+    text = b''.join(('%12.3f\r\n' % force).encode('latin_1') for force in forces)
+    frames = lcp.encodeFrames(np.arange(samples), np.round(forces*1000).astype(int), np.arange(samples)*12500)
+
+    def decodeText(data):
+        pending = b''
+        values = []
+        for start in range(0, len(data), chunk):
+            lines = (pending + data[start:start+chunk]).split(b'\n')
+            pending = lines.pop()
+            values.extend(float(line) for line in lines)
+        return values
+
+    def decodeFrames(data):
+        parser = lcp.FrameParser()
+        return [parser.feed(data[start:start+chunk]) for start in range(0, len(data), chunk)]
+
+    print('load cell readings: protocol, bytes per reading, readings/s at %d baud, decoded readings/s' % baudrate)
+    for name, data, decode in (('ascii', text, decodeText), ('framed', frames, decodeFrames)):
+        perReading = len(data)/samples
+        elapsed = bestOf(decode, data)
+        print('%-8s %8.1f %12.1f %16.0f' % (name, perReading, baudrate/10/perReading, samples/elapsed))
+
+
+def benchForceControl(targets=(10, 50, 100, 200, 100), speed=20.0, tolerance=1.0):
+    """
+    Compares the time to reach each force step of the old tuneForForce
+    loop (one step, a one second sleep, a measurement, and back-and-forth
+    direction changes on overshoot) with ForceController, both measuring
+    from the stream of the simulated Arduino so only the control differs.
+    The specimen stiffens under load (30 N/mm**1.5). Times are simulated
+    seconds; the polled measurements of a real run add about 70 s to every
+    measurement, which makes the number of moves count even more.
+
+    Parameters:
+            targets     : tuple of float    : force steps in N, run in order
+            speed       : float > 0         : how many times faster than real time the Arduino runs
+            tolerance   : float > 0         : band around each target in N
+    """
+    def legacyTune(motor, loadcell, target):
+        start = time.time()
+        moves = 0
+        current = loadcell.takeMeasurement(5, False, since=time.time())
+        while abs(current - target) >= tolerance:
+            if current < target:
+                motor.doStep()
+            else:
+                motor.changeDirection()
+                motor.doStep()
+                motor.changeDirection()
+            time.sleep(1/speed)
+            current = loadcell.takeMeasurement(5, False, since=time.time())
+            moves += 1
+        return time.time() - start, moves
+
+    print('force control: target (N), legacy s, legacy moves, controlled s, controlled moves (simulated time)')
+    results = {}
+    for name in ('legacy', 'controlled'):
+        with ard.ArduinoSimulator(stiffness=lambda x: 30*max(x, 0)**1.5, hx711Rate=80, speed=speed, bootTime=0.2) as arduino:
+            ser = arduino.connect()
+            loadcell = lc.LoadCell(ser)
+            motor = mc.Motor(ser, 1)
+            loadcell.startStreaming()
+            loadcell.takeMeasurement(1, False)                              # waits for the board to boot
+            control = fc.ForceController(motor, loadcell, tolerance=tolerance, samples=5,
+                                            stepTime=1/arduino.stepRate/speed, settleTime=0.2/speed)
+            results[name] = []
+            for target in targets:
+                if name == 'legacy':
+                    seconds, moves = legacyTune(motor, loadcell, target)
+                else:
+                    attempt = control.tune(target)
+                    seconds, moves = attempt['seconds'], attempt['moves']
+                results[name].append((seconds*speed, moves))
+            loadcell.stopStreaming()
+            ser.close()
+    for target, legacy, controlled in zip(targets, results['legacy'], results['controlled']):
+        print('%8.1f %10.1f %8d %12.1f %8d' % (target, legacy[0], legacy[1], controlled[0], controlled[1]))
+
+
+# EXECUTION ============================================
+if __name__ == "__main__":
+    benchParser()
+    benchPlotting()
+    benchAcquisition()
+    benchCompletion()
+    benchLoadCellProtocol()
+    benchForceControl()
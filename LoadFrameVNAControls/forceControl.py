@@ -0,0 +1,272 @@
+"""
+forceControl
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the ForceController class which turns the motor
+until the load cell reads a target force. It replaces the old
+tuneForForce loop, which moved one step, slept, and took a full
+measurement before deciding on the next single step.
+
+Each move is a PID step on the force error, scaled by the stiffness of
+the specimen in N per motor step:
+
+    steps = gain*(error + ki*integral(error) + kd*d(error)/dt)/stiffness
+
+so large errors are closed with one multi-step move and small ones with
+a few single steps. With adaptive on, the stiffness is measured again
+after every move (the force change over the steps moved), which
+schedules the gain to the specimen as it stiffens under load. The
+motor direction is tracked (Motor.direction) and only changed when the
+sign of a move changes.
+
+The target is reached when the force stays within tolerance of it for
+settleReadings measurements in a row. Every attempt is logged with its
+time, moves, and force history so the convergence time per force step
+can be compared (see saveAttempts and benchmarks.py).
+
+Measurements use the load cell's estimator (LoadCell.setEstimator) and
+are fast when the load cell streams (LoadCell.startStreaming); polled
+measurements work too but take tens of seconds each.
+
+Example:
+    control = ForceController(motor, loadcell, stiffness=0.5, tolerance=0.5)
+    attempt = control.tune(100)
+"""
+
+# IMPORTS ===================================================================
+import csv
+import time
+import numpy as np
+
+
+# Columns of the attempt summary written by saveAttempts
+ATTEMPT_COLUMNS = ['target','force','converged','seconds','moves','steps','reversals']
+
+
+# ForceController ===========================================================
+
+class ForceController(object):
+    """
+    Closed-loop force control of the load frame with a gain-scheduled
+    PID on the motor steps.
+
+    Attributes:
+            motor           : Motor         : turns the crosshead, +1 direction increases the force
+            loadcell        : LoadCell      : measures the force
+            stiffness       : float > 0     : N per motor step, learned after each move if adaptive
+            gain            : float > 0     : fraction of the error a move corrects
+            ki              : float >= 0    : integral gain in 1/s
+            kd              : float >= 0    : derivative gain in s
+            adaptive        : bool          : True to measure the stiffness after every move
+            tolerance       : float > 0     : half width of the band around the target in N
+            settleReadings  : int > 0       : measurements in a row inside the band needed
+            samples         : int > 0       : samples per measurement
+            maxSteps        : int > 0       : most steps of one move
+            maxMoves        : int > 0       : most moves of one attempt
+            timeout         : float > 0     : longest attempt in seconds
+            stepTime        : float >= 0    : seconds the Arduino takes per step
+            settleTime      : float >= 0    : seconds waited after a move before measuring
+            attempts        : list of dict  : log of every attempt, see tune
+            _error          : float         : standard error of the last measurement
+            _lastMove       : int           : steps of the last move, also of an earlier attempt, 0 before the first
+    """
+
+    def __init__(self,motor,loadcell,stiffness=0.5,gain=0.7,ki=0.0,kd=0.0,adaptive=True,tolerance=1.0,
+                            settleReadings=3,samples=5,maxSteps=200,maxMoves=200,timeout=3600,stepTime=0.005,settleTime=0.2):
+        """
+        Constructor that initializes attributes of ForceController instance.
+
+        Parameters:
+                motor           : Motor         : turns the crosshead
+                loadcell        : LoadCell      : measures the force
+                stiffness       : float > 0     : first guess of the N per motor step
+                gain            : 0 < float <= 1 : fraction of the error a move corrects, < 1 to not overshoot
+                ki              : float >= 0    : integral gain in 1/s, 0 for none
+                kd              : float >= 0    : derivative gain in s, 0 for none
+                adaptive        : bool          : True to measure the stiffness after every move
+                tolerance       : float > 0     : half width of the band around the target in N
+                settleReadings  : int > 0       : measurements in a row inside the band needed
+                samples         : int > 0       : samples per measurement (the most if the estimator has a precision)
+                maxSteps        : int > 0       : most steps of one move
+                maxMoves        : int > 0       : most moves of one attempt
+                timeout         : float > 0     : longest attempt in seconds
+                stepTime        : float >= 0    : seconds the Arduino takes per step
+                settleTime      : float >= 0    : seconds waited after a move before measuring
+        """
+        assert stiffness > 0
+        assert 0 < gain <= 1
+        assert ki >= 0 and kd >= 0
+        assert type(adaptive) == bool
+        assert tolerance > 0
+        assert type(settleReadings) == int and settleReadings > 0
+        assert type(samples) == int and samples > 0
+        assert type(maxSteps) == int and maxSteps > 0
+        assert type(maxMoves) == int and maxMoves > 0
+        assert timeout > 0 and stepTime >= 0 and settleTime >= 0
+        self.motor = motor
+        self.loadcell = loadcell
+        self.stiffness = stiffness
+        self.gain = gain
+        self.ki = ki
+        self.kd = kd
+        self.adaptive = adaptive
+        self.tolerance = tolerance
+        self.settleReadings = settleReadings
+        self.samples = samples
+        self.maxSteps = maxSteps
+        self.maxMoves = maxMoves
+        self.timeout = timeout
+        self.stepTime = stepTime
+        self.settleTime = settleTime
+        self.attempts = []
+        self._error = np.inf
+        self._lastMove = 0
+
+
+    def tune(self,target):
+        """
+        Moves the motor until the force settles within tolerance of
+        target, or maxMoves or timeout is reached. The motor is turned
+        back to its +1 direction at the end so other moves go the usual way.
+
+        The attempt is appended to attempts as a dict with:
+            target, force       : target and last measured force in N
+            converged           : True if the force settled within tolerance
+            seconds             : time the attempt took
+            moves, steps        : number of moves and steps moved in total
+            reversals           : times the direction changed
+            history             : np.ndarray of (seconds, force, steps moved before it) per measurement
+
+        Return: the attempt as dict
+
+        Parameters:
+                target : float : force wanted in N
+        """
+        start = time.time()
+        history = []
+        moves = steps = reversals = 0
+        inBand = 0
+        integral = 0.0
+        previous = None                                                     # (time, error) of the last move
+        lastSteps = 0
+        converged = False
+
+        force = self.measure()
+        history.append((time.time() - start, force, 0))
+        while True:
+            error = target - force
+            if abs(error) <= self.tolerance:
+                inBand += 1
+                if inBand >= self.settleReadings:
+                    converged = True
+                    break
+                force = self.measure()
+                history.append((time.time() - start, force, 0))
+                continue
+            inBand = 0
+            if moves >= self.maxMoves or time.time() - start >= self.timeout:
+                break
+
+            now = time.time()
+            dt = now - previous[0] if previous is not None else 0.0
+            derivative = (error - previous[1])/dt if dt > 0 else 0.0
+            if previous is not None and np.sign(error) != np.sign(previous[1]):
+                integral = 0.0                                              # overshot, the old integral only pushes further
+            previous = (now, error)
+            integral += error*dt
+            move = self.gain*(error + self.ki*integral + self.kd*derivative)/self.stiffness
+            move = int(np.clip(np.round(move), -self.maxSteps, self.maxSteps))
+            if move == 0:
+                move = 1 if error > 0 else -1                               # outside the band, move at least a step
+            if abs(move) == self.maxSteps:
+                integral -= error*dt                                        # no windup while saturated
+
+            if lastSteps and np.sign(move) != np.sign(lastSteps):
+                reversals += 1
+            before, beforeError = force, self._error
+            self._move(move)
+            force = self.measure()
+            if self.adaptive:
+                self._learn(move,force - before,np.hypot(beforeError,self._error),
+                                self._lastMove != 0 and np.sign(move) != np.sign(self._lastMove))
+            self._lastMove = move
+            moves += 1
+            steps += abs(move)
+            lastSteps = move
+            history.append((time.time() - start, force, move))
+
+        self.motor.setDirection(1)
+        attempt = {'target':target, 'force':force, 'converged':converged, 'seconds':time.time() - start,
+                        'moves':moves, 'steps':steps, 'reversals':reversals, 'history':np.array(history)}
+        self.attempts.append(attempt)
+        print('%s %.3f N (target %.3f N) in %.1f s, %d moves' % ('tuned to' if converged else 'gave up at',
+                        force, target, attempt['seconds'], moves))
+        return attempt
+
+
+    def measure(self):
+        """
+        Measures the force without recording it in the load cell's data.
+        When streaming, only readings after the call count.
+
+        Return: force in N as float
+        """
+        if self.loadcell._reader is not None:
+            force = self.loadcell.takeMeasurement(self.samples,False,since=time.time())
+        else:
+            force = self.loadcell.takeMeasurement(self.samples,False)
+        self._error = self.loadcell.lastEstimate[1]
+        return force
+
+
+    def saveAttempts(self,filename):
+        """
+        Writes a summary row per attempt to a csv file (without the history).
+
+        Parameters:
+                filename : str : csv file to write (e.g. 'CSVs/force_control.csv')
+        """
+        with open(filename, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile, delimiter=',', quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(ATTEMPT_COLUMNS)
+            for attempt in self.attempts:
+                writer.writerow([attempt[column] for column in ATTEMPT_COLUMNS])
+
+
+    def _move(self,steps):
+        """
+        Moves the motor steps steps (negative to lower the force) and waits
+        until the Arduino has made them and the load has settled.
+        """
+        started = time.time()
+        self.motor.setDirection(1 if steps > 0 else -1)
+        self.motor.doSteps(abs(steps),self.stepTime)
+        time.sleep(max(0, started + abs(steps)*self.stepTime + self.settleTime - time.time()))
+
+
+    def _learn(self,steps,change,uncertainty,reversed):
+        """
+        Updates the stiffness from the force change of a move, if the
+        change stands out of the noise. A single move can at most change
+        the stiffness fourfold, so one bad measurement cannot make the
+        next move wild. Backlash takes up part of the first move after
+        a reversal, which makes the specimen look softer than it is, so
+        such a move can only raise the stiffness (an overshoot that
+        keeps reversing still raises it until the moves get smaller).
+        Reversals are counted from the last move made, which may be in
+        an earlier attempt (turning back to +1 at its end does not move).
+
+        Parameters:
+                steps       : int   : steps moved, negative to lower the force
+                change      : float : force change in N
+                uncertainty : float : standard error of the change in N
+                reversed    : bool  : True if the move changed the direction
+        """
+        measured = change/steps
+        if measured <= 0 or not abs(change) > 3*uncertainty:
+            return
+        if reversed and measured < self.stiffness:
+            return
+        measured = min(max(measured, self.stiffness/4), 4*self.stiffness)
+        self.stiffness = 0.5*(self.stiffness + measured)
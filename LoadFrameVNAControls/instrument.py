@@ -8,10 +8,16 @@ Python 3.6.0 64-bit (Anaconda 4.3.0)
 
 This file defines the instrument class which 
 many components of the loadframe-VNA-PowerSupply
-apparatus inherit from.
+apparatus inherit from, the BatchedSession class
+which the VISA instruments send their commands through,
+and the pool those sessions are shared from (see openSession),
+which can also hand out simulated instruments (see registerSimulator).
 """
 # IMPORTS ==========================================
+import atexit
 import datetime
+import contextlib
+import threading
 
 # Instrument =======================================
 class Instrument(object):
@@ -20,21 +26,24 @@ class Instrument(object):
     """
 
     @staticmethod
-    def getDateFormatted():
+    def getDateFormatted(date=None,precise=False):
         """
         Gets the current date and time formatted such that it can be used as
-        a filename for logs, plots, etc
+        a filename for logs, plots, etc (e.g. 2019-07-22_13-05-09). To the
+        second, several sweeps can share a name, so names that must be
+        unique are made precise, which adds the microseconds.
 
         Return: date as string
+
+        Parameters:
+                date    : datetime  : date and time to format, the current one if None
+                precise : bool      : True to add the microseconds (e.g. 2019-07-22_13-05-09-000125)
         """
-        date = datetime.datetime.today()
-        date = str(date)
-        pos = date.find('.')
-        date = date[:pos]
-        date = date.replace(" ","_")
-        date = date.replace(":","-")
-        date = date.replace(":","-")
-        return date   
+        if date is None:
+            date = datetime.datetime.today()
+        if precise:
+            return date.strftime('%Y-%m-%d_%H-%M-%S-%f')
+        return date.strftime('%Y-%m-%d_%H-%M-%S')
 
 
     def unitConverter(self,value):
@@ -99,4 +108,364 @@ class Instrument(object):
 
         # Check for units
         assert 'p' or 'n' or 'micro' or 'm' or 'c' or 'd' or 'd' \
-                        or 'h' or 'k' or 'M' or 'G' or 'T' in value, "fail"
\ No newline at end of file
+                        or 'h' or 'k' or 'M' or 'G' or 'T' in value, "fail"
+
+
+# BatchedSession ===================================
+class BatchedSession(object):
+    """
+    Wraps a VISA resource so that consecutive writes are not sent one by
+    one. They are held back and joined into one compound SCPI message
+    (e.g. 'display:enable 1;:sense1:frequency:start 5e7'), which is sent
+    together with the next query or read, or on its own when flush() is
+    called or an attribute of the resource is changed. Each message then
+    costs one trip over the bus instead of one per command.
+
+    Everything else (timeout, encoding, clear(), write_raw(), ...) is passed
+    through to the resource, so the session can be used wherever the
+    resource was. Methods passed through send the queued commands first,
+    so nothing reaches the instrument out of order.
+
+    The bus trips are counted per operation (see operation()) so
+    the effect of batching can be checked with report(). Each thread
+    counts for its own operation, so threads sharing the session do not
+    count their trips for each other.
+
+    Sessions are shared by every instance using the same instrument (see
+    openSession), so each call holds the lock of the session, and so
+    do the instances for anything that takes more than one call (e.g.
+    configure, sweep, and read). The settings last sent are kept on the
+    session too, so every instance sees what the others changed; they
+    are forgotten whenever *rst is written, as the instrument forgets them.
+
+    Attributes:
+            _resource   : Resource      : VISA resource the messages are sent to
+            _pending    : list of str   : commands written but not sent yet
+            _maxLength  : int > 0       : longest compound message sent before it is flushed
+            _local      : local         : name of the operation trips are currently counted for, per thread
+            operations  : dict          : [commands, bus trips] keyed by operation name
+            lock        : RLock         : held by whoever is talking to the instrument
+            state       : dict          : last command sent for each instrument setting, see Ttrvna._applySetting
+            identity    : str           : answer to *idn?, None until identify() is called
+    """
+
+    def __init__(self,resource,maxLength=512):
+        """
+        Constructor that wraps resource.
+
+        Parameters:
+                resource    : Resource  : opened VISA resource
+                maxLength   : int > 0   : longest compound message, many instruments have small input buffers
+        """
+        assert type(maxLength) == int
+        assert maxLength > 0
+        object.__setattr__(self, '_resource', resource)
+        object.__setattr__(self, '_pending', [])
+        object.__setattr__(self, '_maxLength', maxLength)
+        object.__setattr__(self, '_local', threading.local())
+        object.__setattr__(self, 'operations', {})
+        object.__setattr__(self, 'lock', threading.RLock())
+        object.__setattr__(self, 'state', {})
+        object.__setattr__(self, 'identity', None)
+
+
+    def __getattr__(self,name):
+        """
+        Passes anything the session does not define through to the resource.
+        Methods are wrapped so that they hold the lock and send the queued
+        commands before they are called.
+        """
+        attribute = getattr(self._resource, name)
+        if not callable(attribute):
+            return attribute
+
+        def passthrough(*args,**kwargs):
+            with self.lock:
+                self.flush()
+                return attribute(*args,**kwargs)
+        return passthrough
+
+
+    def __setattr__(self,name,value):
+        """
+        Sets attributes such as timeout on the resource, after sending the
+        commands written before so they are not affected by the change.
+        """
+        with self.lock:
+            self.flush()
+            setattr(self._resource, name, value)
+
+
+    @staticmethod
+    def joinCommands(commands):
+        """
+        Joins commands into one compound SCPI message. Every command after
+        the first, except common commands (*opc, *cls, ...), is prefixed
+        with ':' so it starts from the root of the command tree, like it
+        would on its own.
+
+        Return: message as str
+        """
+        return ';'.join([commands[0]] + [command if command.startswith('*') or command.startswith(':') else ':' + command
+                                            for command in commands[1:]])
+
+
+    def write(self,command):
+        """
+        Queues a command to be sent with the next message.
+
+        Parameters:
+                command : str : SCPI command (e.g. 'sense1:frequency:start 5e7')
+        """
+        with self.lock:
+            if self._pending and len(self.joinCommands(self._pending + [command])) > self._maxLength:
+                self.flush()
+            self._pending.append(command)
+            self._count(1,0)
+            if command.strip().lower() == '*rst':
+                self.state.clear()                      # factory defaults, every setting has to be sent again
+
+
+    def flush(self):
+        """
+        Sends the queued commands as one message, if there are any.
+        """
+        with self.lock:
+            if self._pending:
+                self._resource.write(self.joinCommands(self._pending))
+                del self._pending[:]
+                self._count(0,1)
+
+
+    def query(self,command):
+        """
+        Sends the queued commands and command as one message and reads the answer.
+
+        Return: answer as str
+        """
+        with self.lock:
+            answer = self._resource.query(self._withPending(command))
+            self._count(1,2)
+            return answer
+
+
+    def query_binary_values(self,command,*args,**kwargs):
+        """
+        Sends the queued commands and command as one message and reads the
+        binary block answer, see pyvisa's query_binary_values.
+        """
+        with self.lock:
+            values = self._resource.query_binary_values(self._withPending(command),*args,**kwargs)
+            self._count(1,2)
+            return values
+
+
+    def query_ascii_values(self,command,*args,**kwargs):
+        """
+        Sends the queued commands and command as one message and reads the
+        ascii answer, see pyvisa's query_ascii_values.
+        """
+        with self.lock:
+            values = self._resource.query_ascii_values(self._withPending(command),*args,**kwargs)
+            self._count(1,2)
+            return values
+
+
+    def read(self,*args,**kwargs):
+        """
+        Sends the queued commands and reads an answer as str.
+        """
+        with self.lock:
+            self.flush()
+            self._count(0,1)
+            return self._resource.read(*args,**kwargs)
+
+
+    def read_raw(self,*args,**kwargs):
+        """
+        Sends the queued commands and reads an answer as bytes.
+        """
+        with self.lock:
+            self.flush()
+            self._count(0,1)
+            return self._resource.read_raw(*args,**kwargs)
+
+
+    def wait_for_srq(self,*args,**kwargs):
+        """
+        Sends the queued commands and waits for a service request.
+        """
+        with self.lock:
+            self.flush()
+            self._count(0,1)
+            return self._resource.wait_for_srq(*args,**kwargs)
+
+
+    def close(self):
+        """
+        Sends the queued commands and closes the resource.
+        """
+        with self.lock:
+            self.flush()
+            self._resource.close()
+
+
+    @contextlib.contextmanager
+    def operation(self,name):
+        """
+        Counts the commands and bus trips of the block under name.
+        Nested operations count for the innermost one. The operation only
+        applies to the thread that entered it.
+
+        Example:
+            with session.operation('configure'):
+                ...
+        """
+        previous = getattr(self._local, 'name', 'other')
+        self._local.name = name
+        try:
+            yield
+        finally:
+            self._local.name = previous
+
+
+    def identify(self):
+        """
+        Asks the instrument what it is, once per session.
+
+        Return: answer to *idn? as str
+        """
+        with self.lock:
+            if self.identity is None:
+                object.__setattr__(self, 'identity', self.query('*idn?'))
+            return self.identity
+
+
+    def report(self):
+        """
+        Prints the commands and bus trips counted for each operation.
+        A query is two trips (the message and the answer).
+
+        Return: operations as dict
+        """
+        print('operation\tcommands\tbus trips')
+        for name in sorted(self.operations):
+            commands, trips = self.operations[name]
+            print('%s\t%d\t\t%d' % (name, commands, trips))
+        return self.operations
+
+
+    def _withPending(self,command):
+        """
+        Gets the message that sends the queued commands and command together.
+        """
+        message = self.joinCommands(self._pending + [command])
+        if len(message) > self._maxLength:
+            self.flush()
+            return command
+        del self._pending[:]
+        return message
+
+
+    def _count(self,commands,trips):
+        """
+        Adds to the counts of the current operation.
+        """
+        counts = self.operations.setdefault(getattr(self._local, 'name', 'other'), [0,0])
+        counts[0] += commands
+        counts[1] += trips
+
+
+# SESSION POOL =====================================
+_resourceManager = None     # one VISA resource manager for the whole program
+_sessions = {}              # open BatchedSession keyed by resource name
+_simulators = {}            # functions making a simulated resource, keyed by resource name
+_poolLock = threading.RLock()
+
+
+def getResourceManager():
+    """
+    Gets the VISA resource manager shared by every instrument, creating
+    it the first time. PyVISA is imported here, so modules that only need
+    Instrument work without it. Older installs provide the package as
+    visa, newer ones as pyvisa.
+
+    Return: ResourceManager
+    """
+    global _resourceManager
+    with _poolLock:
+        if _resourceManager is None:
+            try:
+                import visa
+            except ImportError:
+                import pyvisa as visa
+            _resourceManager = visa.ResourceManager()
+            atexit.register(closeSessions)
+        return _resourceManager
+
+
+def registerSimulator(resourceName,factory):
+    """
+    Makes openSession(resourceName) wrap factory() instead of opening a
+    VISA resource, so an instrument can be simulated without VISA
+    installed (see simulatedVNA.py). A session that is already open
+    keeps its resource.
+
+    Parameters:
+            resourceName    : str       : resource name instances are given (e.g. 'SIM::TTR506A')
+            factory         : function  : makes the simulated resource, called with no arguments
+    """
+    with _poolLock:
+        _simulators[resourceName] = factory
+
+
+def isSimulated(resourceName):
+    """
+    Checks if a resource name is simulated, see registerSimulator.
+
+    Return: True if simulated
+    """
+    with _poolLock:
+        return resourceName in _simulators
+
+
+def openSession(resourceName,maxLength=512):
+    """
+    Gets the session of an instrument. The first call opens the resource,
+    later calls for the same resource name get the same session, so
+    several controllers can share the instrument without opening and
+    identifying it again.
+
+    Return: BatchedSession
+
+    Parameters:
+            resourceName    : str       : VISA resource name (e.g. 'GPIB8::1::INSTR')
+            maxLength       : int > 0   : longest compound message, only used when the session is opened
+    """
+    with _poolLock:
+        session = _sessions.get(resourceName)
+        if session is None:
+            if resourceName in _simulators:
+                resource = _simulators[resourceName]()
+            else:
+                resource = getResourceManager().open_resource(resourceName)
+            session = BatchedSession(resource,maxLength)
+            _sessions[resourceName] = session
+        return session
+
+
+def closeSessions():
+    """
+    Sends what is still queued, closes every session, and closes the
+    resource manager. Called automatically when the program exits.
+    """
+    global _resourceManager
+    with _poolLock:
+        for name in list(_sessions):
+            try:
+                _sessions.pop(name).close()
+            except Exception as error:                  # keep closing the others
+                print('Could not close %s: %r' % (name, error))
+        if _resourceManager is not None:
+            _resourceManager.close()
+            _resourceManager = None
@@ -0,0 +1,213 @@
+"""
+loadCellProtocol
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the framed binary protocol the Arduino streams load
+cell readings in after it is sent 'B', and the FrameParser that decodes
+it on the computer. Every HX711 conversion is sent as one 10 byte frame:
+
+    byte 0      : sync byte 0xA5
+    byte 1      : sequence number, counts up by one per frame and wraps at 256
+    bytes 2-4   : raw HX711 value, 24-bit two's complement, little-endian
+    bytes 5-8   : time of the conversion in microseconds since the board
+                  started (micros()), uint32 little-endian
+    byte 9      : checksum, sum of bytes 1 to 8 modulo 256
+
+Compared to the ascii readings (14 bytes of text per reading) a frame is
+smaller, so more readings fit through the serial port each second, its
+length never changes, and the parser can find the frames again after
+bytes are lost or corrupted: it looks for a sync byte followed by a
+frame whose checksum matches. Gaps in the sequence numbers count the
+frames that were lost.
+
+The raw value is turned into a force with the calibration of the load
+cell, force = (raw - offset)/countsPerNewton, see LoadCell.setCalibration.
+
+See pyLoadControl.py for how it is used and arduinoSimulator.py for the
+firmware side.
+"""
+
+# IMPORTS ===================================================================
+import numpy as np
+
+
+# Frame layout
+SYNC = 0xA5
+FRAME_SIZE = 10
+_SYNC_BYTE = bytes([SYNC])
+
+# Frame layout as a NumPy record, so a buffer of frames can be read without copying
+# (the raw value is split in its low 16 bits and its signed high byte)
+FRAME_DTYPE = np.dtype([('sync','u1'), ('sequence','u1'), ('raw','<u2'), ('rawHigh','i1'),
+                        ('micros','<u4'), ('checksum','u1')])
+
+
+# FUNCTIONS =================================================================
+
+def encodeFrames(sequence,raw,micros):
+    """
+    Packs readings into frames, as the firmware sends them.
+
+    Return: frames as bytes
+
+    Parameters:
+            sequence    : array-like of int : sequence number of each frame (taken modulo 256)
+            raw         : array-like of int : raw HX711 value of each frame, -2**23 <= raw < 2**23
+            micros      : array-like of int : microseconds since the board started (taken modulo 2**32)
+    """
+    raw = np.atleast_1d(np.asarray(raw, dtype=np.int64))
+    assert np.all(raw >= -2**23) and np.all(raw < 2**23), "raw values are 24-bit"
+    frames = np.zeros((len(raw), FRAME_SIZE), dtype=np.uint8)
+    frames[:,0] = SYNC
+    frames[:,1] = np.asarray(sequence, dtype=np.int64) % 256
+    raw = raw % 2**24                                                       # two's complement
+    micros = np.asarray(micros, dtype=np.int64) % 2**32
+    for byte in range(3):
+        frames[:,2+byte] = (raw >> 8*byte) & 0xFF
+    for byte in range(4):
+        frames[:,5+byte] = (micros >> 8*byte) & 0xFF
+    frames[:,9] = frames[:,1:9].sum(axis=1, dtype=np.int64) % 256
+    return frames.tobytes()
+
+
+# FrameParser ===============================================================
+
+class FrameParser(object):
+    """
+    Incremental decoder of the frame stream. Bytes are fed as they are
+    read from the port, in chunks of any size; every complete frame in
+    them is decoded at once with NumPy and the bytes of an incomplete
+    frame at the end are kept for the next chunk.
+
+    A stream without errors is a run of back to back frames, which is
+    checked with one comparison of every tenth byte and one checksum pass,
+    and read in place as FRAME_DTYPE records. Only when that fails are the
+    frames searched for byte by byte (see _frameStarts).
+
+    Attributes:
+            frames      : int           : frames decoded
+            lost        : int           : frames missing from the sequence numbers
+            discarded   : int           : bytes skipped because they were not part of a valid frame
+            _pending    : bytes         : bytes of a frame that is not complete yet
+            _sequence   : int           : sequence number of the last frame, None before the first
+            _micros     : int           : unwrapped time of the last frame in microseconds, None before the first
+    """
+
+    def __init__(self):
+        """
+        Constructor that starts with nothing decoded.
+        """
+        self.frames = 0
+        self.lost = 0
+        self.discarded = 0
+        self._pending = b''
+        self._sequence = None
+        self._micros = None
+
+
+    def feed(self,data):
+        """
+        Decodes every complete frame in what was fed so far.
+
+        Return: (raw, seconds) as tuple of np.ndarray, raw HX711 values (int64) and
+                time of each conversion in seconds since the board started
+
+        Parameters:
+                data : bytes : bytes read from the port
+        """
+        data = self._pending + data
+        count = len(data)//FRAME_SIZE
+        frames = None
+        if count and data[0:count*FRAME_SIZE:FRAME_SIZE] == _SYNC_BYTE*count:        # back to back frames
+            frames = np.frombuffer(data, dtype=FRAME_DTYPE, count=count)
+            if _checksumsMatch(frames):
+                self._pending = data[count*FRAME_SIZE:]
+            else:
+                frames = None
+        if frames is None:
+            buffer = np.frombuffer(data, dtype=np.uint8)
+            starts = self._frameStarts(buffer)
+            if len(starts):
+                keepFrom = max(starts[-1] + FRAME_SIZE, len(buffer) - (FRAME_SIZE - 1))
+            else:
+                keepFrom = max(0, len(buffer) - (FRAME_SIZE - 1))          # a frame may still start in the last bytes
+            self.discarded += keepFrom - FRAME_SIZE*len(starts)             # every byte dropped that was not in a frame
+            self._pending = data[keepFrom:]
+            frames = buffer[starts[:,None] + np.arange(FRAME_SIZE)].view(FRAME_DTYPE).ravel()
+
+        raw = frames['raw'] + (frames['rawHigh'].astype(np.int64) << 16)
+        self._countLost(frames['sequence'])
+        self.frames += len(frames)
+        return raw, self._unwrap(frames['micros'])/1e6
+
+
+    def _frameStarts(self,buffer):
+        """
+        Finds where the frames in buffer start: at a sync byte, with the
+        whole frame in buffer and a matching checksum, and not inside the
+        frame found before it (a data byte can be 0xA5 too).
+
+        Return: start of each frame as np.ndarray of int
+        """
+        candidates = np.flatnonzero(buffer[:max(0, len(buffer) - FRAME_SIZE + 1)] == SYNC)
+        if len(candidates) == 0:
+            return candidates
+        frames = buffer[candidates[:,None] + np.arange(FRAME_SIZE)]
+        valid = candidates[frames[:,1:9].sum(axis=1, dtype=np.int64) % 256 == frames[:,9]]
+        if len(valid) < 2 or np.all(np.diff(valid) >= FRAME_SIZE):
+            return valid                                                    # aligned stream, the usual case
+        starts = []
+        end = -1
+        for start in valid:                                                 # false syncs inside frames
+            if start >= end:
+                starts.append(start)
+                end = start + FRAME_SIZE
+        return np.array(starts, dtype=np.int64)
+
+
+    def _countLost(self,sequence):
+        """
+        Adds the frames missing between consecutive sequence numbers to lost.
+        The numbers are uint8, so their differences wrap at 256 by themselves.
+        """
+        if len(sequence) == 0:
+            return
+        if self._sequence is not None:
+            self.lost += (int(sequence[0]) - self._sequence - 1) % 256
+        self.lost += int((sequence[1:] - sequence[:-1] - np.uint8(1)).sum(dtype=np.int64))
+        self._sequence = int(sequence[-1])
+
+
+    def _unwrap(self,micros):
+        """
+        Removes the wrap of the 32-bit microsecond counter (every 71 minutes).
+        The times are uint32, so their differences wrap at 2**32 by themselves.
+
+        Return: microseconds since the board started as np.ndarray of int64
+        """
+        if len(micros) == 0:
+            return micros.astype(np.int64)
+        if self._micros is None:
+            first = int(micros[0])
+        else:
+            first = self._micros + (int(micros[0]) - self._micros) % 2**32
+        unwrapped = np.empty(len(micros), dtype=np.int64)
+        unwrapped[0] = first
+        np.cumsum(micros[1:] - micros[:-1], dtype=np.int64, out=unwrapped[1:])
+        unwrapped[1:] += first
+        self._micros = int(unwrapped[-1])
+        return unwrapped
+
+
+# HELPER FUNCTIONS ==========================================================
+
+def _checksumsMatch(frames):
+    """
+    Checks the checksum of every frame: the uint8 sum of bytes 1 to 8
+    wraps at 256 like the checksum does.
+
+    Return: True if every checksum matches
+    """
+    data = frames.view(np.uint8).reshape(len(frames), FRAME_SIZE)
+    return bool((data[:,1:9].sum(axis=1, dtype=np.uint8) == data[:,9]).all())
@@ -0,0 +1,348 @@
+"""
+loadStore
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the LoadStore class which keeps the load measurements
+of a run in a growable NumPy structured array, one typed column each:
+
+    index       : int64     : number of the measurement, from 1 (the first column of allData)
+    timestamp   : float64   : POSIX time the measurement was taken
+    mean        : float64   : the measured load in N (the estimate, see robustStats.py)
+    std         : float64   : spread of the samples in N, NaN from a single sample
+    samples     : int32     : number of samples the measurement used
+    recorded    : bool      : True if it is part of the experiment (LoadCell.data)
+
+The latest measurement is kept aside, so reading it is O(1) however
+long the run is. For runs of several days the store can spill to a raw
+file: once memoryRows measurements are held they are appended to the
+file in one write and the memory is reused, so memory stays bounded and
+a crash loses at most memoryRows measurements. The positions of the
+recorded measurements are spilled the same way, to the spill file name
+with '.recorded' added, so the recorded ones can still be reached in
+O(1). Spilled measurements are read back with np.memmap.
+
+LoadCell.data and allData are MeasurementList views of the store that
+behave like the old lists of [index, load] pairs.
+
+Example:
+    store = LoadStore(spill='Logs/load_run.dat')
+    store.append(12.5, std=0.02, samples=3)
+    current = store.latest()
+"""
+
+# IMPORTS ===================================================================
+import os
+import time
+import numpy as np
+
+
+# Columns of a measurement, also the layout of the records in a spill file
+DTYPE = np.dtype([('index',np.int64), ('timestamp',np.float64), ('mean',np.float64),
+                    ('std',np.float64), ('samples',np.int32), ('recorded',np.bool_)])
+
+
+# FUNCTIONS =================================================================
+
+def load(filename):
+    """
+    Reads the measurements spilled to a file without reading them into memory.
+
+    Return: np.memmap of DTYPE records
+    """
+    if os.path.getsize(filename) == 0:
+        return np.zeros(0, dtype=DTYPE)
+    return np.memmap(filename, dtype=DTYPE, mode='r')
+
+
+# LoadStore =================================================================
+
+class LoadStore(object):
+    """
+    Columnar store of load measurements that grows in memory and can
+    spill to disk.
+
+    Attributes:
+            spill           : str           : raw file measurements are spilled to, None to keep them all in memory
+            memoryRows      : int > 0       : measurements held in memory before they are spilled
+            spilled         : int           : measurements in the spill file
+            _rows           : np.ndarray    : DTYPE records held in memory, doubled in size when full
+            _count          : int           : records of _rows in use
+            _recordedRows   : np.ndarray    : index - 1 of each recorded measurement held in memory, doubled in size when full
+            _recorded       : int           : recorded measurements
+            _recordedSpilled : int          : recorded measurements whose index - 1 is in the .recorded file
+            _latest         : np.void       : copy of the last measurement, None before the first
+            _latestRecorded : np.void       : copy of the last recorded measurement, None before the first
+            _mapped         : np.memmap     : the spill file, reopened when it grows
+            _mappedRecorded : np.memmap     : the .recorded file, reopened when it grows
+    """
+
+    def __init__(self,capacity=1024,spill=None,memoryRows=65536):
+        """
+        Constructor that initializes an empty store. An existing spill file
+        (and its .recorded file) is emptied.
+
+        Parameters:
+                capacity    : int > 0   : measurements room is made for at first
+                spill       : str       : raw file to spill to, None to keep everything in memory
+                memoryRows  : int > 0   : measurements held in memory before they are spilled
+        """
+        assert type(capacity) == int and capacity > 0
+        assert type(memoryRows) == int and memoryRows > 0
+        self.spill = spill
+        self.memoryRows = memoryRows
+        self.spilled = 0
+        self._rows = np.zeros(capacity if spill is None else min(capacity, memoryRows), dtype=DTYPE)
+        self._count = 0
+        self._recordedRows = np.zeros(len(self._rows), dtype=np.int64)
+        self._recorded = 0
+        self._recordedSpilled = 0
+        self._latest = None
+        self._latestRecorded = None
+        self._mapped = None
+        self._mappedRecorded = None
+        if spill is not None:
+            open(spill, 'wb').close()
+            open(spill + '.recorded', 'wb').close()
+
+
+    def __len__(self):
+        """
+        Gets the number of measurements stored.
+
+        Return: int
+        """
+        return self.spilled + self._count
+
+
+    def append(self,mean,std=np.nan,samples=1,recorded=True,timestamp=None):
+        """
+        Adds a measurement.
+
+        Return: index of the measurement as int
+
+        Parameters:
+                mean        : float     : measured load in N
+                std         : float     : spread of the samples in N
+                samples     : int > 0   : number of samples used
+                recorded    : bool      : True if it is part of the experiment
+                timestamp   : float     : POSIX time it was taken, now if None
+        """
+        assert samples > 0
+        if self._count == len(self._rows):
+            if self.spill is not None and self._count >= self.memoryRows:
+                self.flush()
+            else:
+                self._rows = _grown(self._rows, self.memoryRows if self.spill is not None else None)
+        index = len(self) + 1
+        row = self._rows[self._count]
+        row['index'] = index
+        row['timestamp'] = time.time() if timestamp is None else timestamp
+        row['mean'] = mean
+        row['std'] = std
+        row['samples'] = samples
+        row['recorded'] = recorded
+        self._count += 1
+        self._latest = row.copy()
+        if recorded:
+            held = self._recorded - self._recordedSpilled
+            if held == len(self._recordedRows):
+                self._recordedRows = _grown(self._recordedRows, self.memoryRows if self.spill is not None else None)
+            self._recordedRows[held] = index - 1
+            self._recorded += 1
+            self._latestRecorded = self._latest
+        return index
+
+
+    def latest(self,column='mean',recorded=False):
+        """
+        Gets a column of the last measurement in O(1).
+
+        Return: the value, None if there is no measurement yet
+
+        Parameters:
+                column      : str   : name of the column, see DTYPE
+                recorded    : bool  : True for the last recorded measurement
+        """
+        row = self._latestRecorded if recorded else self._latest
+        if row is None:
+            return None
+        return row[column].item()
+
+
+    def row(self,position,recorded=False):
+        """
+        Gets one measurement, from memory or the spill file.
+
+        Return: DTYPE record as np.void
+
+        Parameters:
+                position    : int   : position among all (or the recorded) measurements, negative from the end
+                recorded    : bool  : True to count only recorded measurements
+        """
+        length = self._recorded if recorded else len(self)
+        if position < 0:
+            position += length
+        if not 0 <= position < length:
+            raise IndexError('measurement %d out of range' % position)
+        if recorded:
+            if position >= self._recordedSpilled:
+                position = int(self._recordedRows[position - self._recordedSpilled])
+            else:
+                position = int(self._spilledRecorded()[position])
+        if position >= self.spilled:
+            return self._rows[position - self.spilled].copy()
+        return self._spilledRows()[position].copy()
+
+
+    def column(self,name,recorded=False):
+        """
+        Gets a column of every measurement, spilled ones included.
+
+        Return: np.ndarray
+
+        Parameters:
+                name        : str   : name of the column, see DTYPE
+                recorded    : bool  : True for the recorded measurements only
+        """
+        values = self._rows[name][:self._count]
+        if self.spilled:
+            values = np.concatenate((self._spilledRows()[name], values))
+        if recorded:
+            positions = self._recordedRows[:self._recorded - self._recordedSpilled]
+            if self._recordedSpilled:
+                positions = np.concatenate((self._spilledRecorded(), positions))
+            values = values[positions]
+        return values
+
+
+    def flush(self):
+        """
+        Appends the measurements held in memory to the spill file, and the
+        positions of the recorded ones to the .recorded file, in one write
+        each and frees their rows. Nothing happens without a spill file.
+        """
+        if self.spill is None or self._count == 0:
+            return
+        held = self._recorded - self._recordedSpilled
+        for filename, rows in ((self.spill, self._rows[:self._count]),
+                                (self.spill + '.recorded', self._recordedRows[:held])):
+            with open(filename, 'ab') as f:
+                rows.tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+        self.spilled += self._count
+        self._count = 0
+        self._recordedSpilled = self._recorded
+
+
+    def close(self):
+        """
+        Spills what is left in memory, so the file holds every measurement.
+        """
+        self.flush()
+        self._mapped = None
+        self._mappedRecorded = None
+
+
+    def _spilledRows(self):
+        """
+        Gets the spilled measurements, mapping the file again if it grew.
+
+        Return: np.memmap of DTYPE records
+        """
+        if self._mapped is None or len(self._mapped) != self.spilled:
+            self._mapped = load(self.spill)
+        return self._mapped
+
+
+    def _spilledRecorded(self):
+        """
+        Gets the positions of the spilled recorded measurements, mapping
+        the .recorded file again if it grew.
+
+        Return: np.memmap of int64
+        """
+        if self._mappedRecorded is None or len(self._mappedRecorded) != self._recordedSpilled:
+            self._mappedRecorded = np.memmap(self.spill + '.recorded', dtype=np.int64, mode='r')
+        return self._mappedRecorded
+
+
+# MeasurementList ===========================================================
+
+class MeasurementList(object):
+    """
+    Read-only view of a LoadStore that looks like the lists of
+    [index, load] pairs LoadCell.data and allData used to be: it has a
+    length, can be indexed and sliced, and iterated. In the recorded
+    view the index counts the recorded measurements only.
+
+    Attributes:
+            store       : LoadStore : the measurements
+            recorded    : bool      : True to show only the recorded measurements
+    """
+
+    def __init__(self,store,recorded=False):
+        """
+        Constructor that initializes attributes of MeasurementList instance.
+
+        Parameters:
+                store       : LoadStore : the measurements
+                recorded    : bool      : True to show only the recorded measurements
+        """
+        self.store = store
+        self.recorded = recorded
+
+
+    def __len__(self):
+        """
+        Gets the number of measurements shown.
+        """
+        return self.store._recorded if self.recorded else len(self.store)
+
+
+    def __getitem__(self,position):
+        """
+        Gets the [index, load] pair of a measurement, or a list of them for a slice.
+        """
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        row = self.store.row(position,self.recorded)
+        index = position + 1 if self.recorded else int(row['index'])
+        return [index, float(row['mean'])]
+
+
+    def __iter__(self):
+        """
+        Iterates over the [index, load] pairs, reading the columns once.
+        """
+        means = self.store.column('mean',self.recorded)
+        if self.recorded:
+            indices = np.arange(1, len(means) + 1)
+        else:
+            indices = self.store.column('index')
+        for index, mean in zip(indices.tolist(), means.tolist()):
+            yield [index, mean]
+
+
+    def __repr__(self):
+        """
+        Shows the pairs like a list.
+        """
+        return repr(list(self))
+
+
+# HELPER FUNCTIONS ==========================================================
+
+def _grown(array,limit=None):
+    """
+    Gets a copy of array with twice the rows, but no more than limit.
+
+    Return: np.ndarray
+    """
+    rows = 2*len(array) if limit is None else max(len(array), min(2*len(array), limit))
+    grown = np.zeros(rows, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
@@ -0,0 +1,126 @@
+"""
+outputPipeline
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the OutputPipeline class which writes plots,
+logs, and CSVs in background threads so that the next sweep
+does not have to wait for the files of the last one.
+
+See ttrvna.py for how it is used.
+"""
+
+# IMPORTS ===================================================================
+import atexit
+import queue
+import threading
+import traceback
+
+
+# OutputPipeline ============================================================
+
+class OutputPipeline(object):
+    """
+    Runs output jobs (functions and their arguments) in worker threads.
+    The queue is bounded: when the workers fall behind, submit() blocks until
+    there is room again, so memory use stays bounded on long runs. Every job
+    still in the queue is finished before the program exits.
+
+    Attributes:
+            _queue      : Queue             : jobs waiting to be run, bounded by maxsize
+            _threads    : list of Thread    : worker threads
+            _errors     : list of Exception : exceptions raised by jobs since the last flush
+            _lock       : Lock              : guards _errors
+            _closed     : bool              : True once close() has been called
+    """
+
+    def __init__(self,workers=1,maxsize=8):
+        """
+        Constructor that starts the worker threads.
+
+        Parameters:
+                workers : int > 0 : number of worker threads
+                maxsize : int > 0 : number of jobs that can wait before submit blocks
+        """
+        assert type(workers) == int
+        assert workers > 0
+        assert type(maxsize) == int
+        assert maxsize > 0
+
+        self._queue = queue.Queue(maxsize)
+        self._errors = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._threads = []
+        for _ in range(workers):
+            thread = threading.Thread(target=self._work)
+            thread.daemon = True        # close() at exit finishes the queue before the threads are dropped
+            thread.start()
+            self._threads.append(thread)
+        atexit.register(self.close)
+
+
+    def submit(self,func,*args):
+        """
+        Queues func(*args) to be run by a worker. Blocks while the
+        queue is full.
+
+        Parameters:
+                func : function : job to run
+                args : any      : arguments passed to func
+        """
+        assert not self._closed
+        self._queue.put((func,args))
+
+
+    def flush(self):
+        """
+        Waits until every job submitted so far is done. If any of them
+        failed, the first exception is raised here.
+        """
+        self._queue.join()
+        with self._lock:
+            errors = self._errors
+            self._errors = []
+        if errors:
+            raise errors[0]
+
+
+    def close(self):
+        """
+        Finishes every queued job and stops the workers. Called
+        automatically when the program exits if it was not called before,
+        so a closed pipeline is not kept alive until then.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.join()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        atexit.unregister(self.close)
+        with self._lock:
+            for error in self._errors:
+                print('Output job failed: %r' % error)
+
+
+    def _work(self):
+        """
+        Worker loop: runs jobs until it is handed None.
+        """
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+            func, args = job
+            try:
+                func(*args)
+            except Exception as error:
+                traceback.print_exc()
+                with self._lock:
+                    self._errors.append(error)
+            finally:
+                self._queue.task_done()
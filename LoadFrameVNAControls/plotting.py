@@ -0,0 +1,131 @@
+"""
+plotting
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the ways a sweep can be rendered to a png:
+    renderSweepPlot     : builds a new figure for every sweep
+    ReusablePlot        : builds one figure and only updates the line data
+    renderDeferred      : renders many sweeps at once in a pool of processes
+
+All of them draw with the Agg backend on their own figures, so none of
+them touch pyplot's global state.
+
+See ttrvna.py for how they are used.
+"""
+
+# IMPORTS ===================================================================
+import threading
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+# FUNCTIONS =================================================================
+
+def _buildFigure():
+    """
+    Builds the figure every sweep is plotted on.
+
+    Return: (figure, axes) as tuple
+    """
+    fig = Figure(figsize=(20, 10))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111, facecolor='k')
+    ax.set_title('Amplitude vs Frequency')
+    ax.set_ylabel('Amplitude (dBm)')
+    ax.set_xlabel('Freq (Hz)')
+    return fig, ax
+
+
+def _setLimits(ax,freqDomain,values):
+    """
+    Fits the axes to the sweep with some room above and below the range.
+
+    Parameters:
+            ax          : Axes          : axes to scale
+            freqDomain  : np.ndarray    : x values
+            values      : np.ndarray    : y values
+    """
+    lower = np.min(values)
+    upper = np.max(values)
+    ax.set_xlim(freqDomain[0],freqDomain[-1])
+    ax.set_ylim(lower-(0.2*(upper-lower)),upper+(0.2*(upper-lower)))    # Scaled to fit range
+
+
+def renderSweepPlot(freqDomain,values,filename):
+    """
+    Plots values against freqDomain on a new figure and saves it as a png.
+
+    Parameters:
+            freqDomain  : np.ndarray    : x values
+            values      : np.ndarray    : y values
+            filename    : str           : where the png is saved
+    """
+    fig, ax = _buildFigure()
+    ax.plot(freqDomain, values, 'y')
+    _setLimits(ax,freqDomain,values)
+    fig.savefig(filename)
+
+
+def _renderJob(job):
+    """
+    Unpacks a (freqDomain, values, filename) job for the process pool.
+    """
+    renderSweepPlot(*job)
+
+
+def renderDeferred(jobs,processes=None):
+    """
+    Renders many sweeps at once, spread over a pool of processes so
+    each core of the PC draws its own share of the pngs.
+
+    Parameters:
+            jobs        : list of tuples    : (freqDomain, values, filename) for each png
+            processes   : int > 0           : number of processes, one per core if None
+    """
+    if not jobs:
+        return
+    with ProcessPoolExecutor(processes) as pool:
+        for _ in pool.map(_renderJob, jobs, chunksize=max(1, len(jobs)//32)):
+            pass                    # consume the results so errors in the workers are raised here
+
+
+# ReusablePlot ==============================================================
+
+class ReusablePlot(object):
+    """
+    One pre-built figure that every sweep is drawn on. Only the data of
+    the line and the axis limits change between sweeps, so the figure,
+    axes, labels, and ticks are not built again for every png.
+
+    Attributes:
+            _fig    : Figure    : the figure that is saved
+            _ax     : Axes      : axes of the figure
+            _line   : Line2D    : line the sweep is drawn with
+            _lock   : Lock      : lets only one writer thread draw at a time
+    """
+
+    def __init__(self):
+        """
+        Constructor that builds the figure.
+        """
+        self._fig, self._ax = _buildFigure()
+        self._line, = self._ax.plot([], [], 'y')
+        self._lock = threading.Lock()
+
+
+    def render(self,freqDomain,values,filename):
+        """
+        Draws values against freqDomain on the figure and saves it as a png.
+
+        Parameters:
+                freqDomain  : np.ndarray    : x values
+                values      : np.ndarray    : y values
+                filename    : str           : where the png is saved
+        """
+        with self._lock:
+            self._line.set_data(freqDomain, values)
+            _setLimits(self._ax,freqDomain,values)
+            self._fig.savefig(filename)
@@ -9,18 +9,36 @@ Python 3.6.0 64-bit (Anaconda 4.3.0)
 This program controls the reading and processing of data from a load
 cell through serial communication with an Arduino.
 
+In streaming mode (see LoadCell.startStreaming) the Arduino sends every
+HX711 reading on its own and a background thread keeps them with their
+arrival time in a ring buffer, so a measurement is an average over what
+was already read instead of a series of requests and long sleeps. The
+readings can be streamed as text or as binary frames with the raw HX711
+value (see loadCellProtocol.py), which are calibrated on this side.
+
+The readings of a measurement are combined by a robust estimator
+(median, trimmed or sigma-clipped mean, see robustStats.py and
+LoadCell.setEstimator) so one corrupted read or spike does not spoil
+a load step, and sampling can stop as soon as the estimate is precise
+enough.
+
 See LoadFrameController.py if you want to control
 the load cell in conjuction with a motor and VNA.
 """
 
 # IMPORTS ============================================================
 import serial
+import threading
 import time
 import numpy as np
 import datetime
 import csv
 import pyMotorControl
 import instrument as instr
+import ringBuffer as rb
+import loadCellProtocol as lcp
+import robustStats as rs
+import loadStore as ls
 
 # LOADCELL ==========================================================
 
@@ -30,10 +48,23 @@ class LoadCell(instr.Instrument):
     of data from a load cell through serial communication with an Arduino
 
     Attributes:
-            data        : list             : holds data measured if used as a domain
-            allData     : list             : holds all data measured
+            data        : MeasurementList  : [index, load] of the data measured if used as a domain
+            allData     : MeasurementList  : [index, load] of all data measured
+            store       : LoadStore        : every measurement with its time, spread, and samples, see loadStore.py
             _filename   : str              : filename for where csv data is logged
             _ser        : Serial           : sets communication port for Arduino
+            _ring       : RingBuffer       : readings streamed by the Arduino and their arrival times, None until streaming starts
+            _reader     : Thread           : parses the streamed readings into _ring, None if not streaming
+            _stopReader : Event            : set to stop the reader
+            _readerError: Exception        : what stopped the reader, None if nothing went wrong
+            rejected    : int              : streamed lines that were not a reading (e.g. the greeting)
+            framed      : bool             : True if the readings are streamed as binary frames
+            parser      : FrameParser      : decodes the frames, counts lost frames and skipped bytes
+            offset      : float            : raw HX711 value at 0 N, for frames
+            countsPerNewton : float        : raw HX711 counts per N, for frames
+            _clockOffset: float            : POSIX time of the board's time 0, estimated from the frames
+            estimator   : dict             : how readings are combined into a measurement, see setEstimator
+            lastEstimate: tuple            : (value, standard error, readings used) of the last measurement
     """
 
     def __init__(self,ser):
@@ -46,8 +77,17 @@ class LoadCell(instr.Instrument):
         """
         self.setSer(ser)
         self._setFilename()
-        self.data = []
-        self.allData = []
+        self.setStore(ls.LoadStore())
+        self._ring = None
+        self._reader = None
+        self._stopReader = threading.Event()
+        self._readerError = None
+        self.rejected = 0
+        self.framed = False
+        self.parser = None
+        self.setCalibration(0,1.0)
+        self.setEstimator('mean')
+        self.lastEstimate = None
 
 
     def setSer(self,ser):
@@ -70,7 +110,7 @@ class LoadCell(instr.Instrument):
         self._filename = 'load_' + self.getDateFormatted()
 
 
-    def takeMeasurement(self,samples=3,record=True):
+    def takeMeasurement(self,samples=3,record=True,window=None,since=None,timeout=10):
         """
         Averages # of samples read from the loadcell, then
         appends it to data table if record is True. It will always
@@ -79,35 +119,230 @@ class LoadCell(instr.Instrument):
         want to include in the domain for an experiment measurement since
         it would have no corresponding range.
 
+        When streaming, the average is taken over the readings already
+        received and it only waits if there are not enough of them yet;
+        window and since choose which readings count. Otherwise each
+        sample is requested from the Arduino in turn.
+
+        The samples are combined with the estimator set by setEstimator;
+        with a precision set, samples is the most that are taken and it
+        stops once the standard error is within the precision.
+
+        Return: the average as float
+
         Paramter:
-                samples : int > 0 : number of samples to average
-                record  : bool    : determines if measurement is recorded to self.data
+                samples : int > 0   : number of samples to average (the latest ones if streaming),
+                                      the most samples if a precision is set
+                record  : bool      : determines if measurement is recorded to self.data
+                window  : float > 0 : if streaming, average every reading of the last window seconds instead
+                since   : float     : if streaming, only readings that arrived after this POSIX time count
+                                      (e.g. time.time() after the motor moved)
+                timeout : float > 0 : if streaming, longest wait in seconds for the readings
         """
         assert type(samples) == int
         assert samples > 0
 
-        values = []
+        if self._reader is not None:
+            self.lastEstimate = self._streamedEstimate(samples,window,since,timeout)
+        else:
+            values = []
 
-        time.sleep(10)
-        self._ser.flush()
-        print(self._ser.read(17))
+            time.sleep(10)
+            self._ser.flush()
+            print(self._ser.read(17))
 
-        # Collect Data
-        for _ in range(samples):
-            self.doRead()
-            time.sleep(20)                      # long sleep needed to receive bytes
-            var = str(self.returnRead())        # Now to cut bytes into potential floats
-            pos1 = var.find("'")
-            pos2 = var.find('\\')
-            var = float(var[pos1+1:pos2])
-            values.append(var)
+            # Collect Data
+            for _ in range(samples):
+                self.doRead()
+                time.sleep(20)                      # long sleep needed to receive bytes
+                values.append(self._parseRead(self.returnRead()))
+                if self._precise(values):
+                    break
+            print(values)
+            self.lastEstimate = self._estimate(values)
 
         # Average Data
-        print(values)
-        avg = np.mean(values)
-        self.allData.append([len(self.allData)+1,avg])
-        if record:
-            self.data.append([len(self.data)+1,avg])
+        avg, error, used = self.lastEstimate
+        std = error*np.sqrt(used) if np.isfinite(error) else np.nan
+        self.store.append(avg,std,max(used,1),record)
+        return avg
+
+
+    def startStreaming(self,capacity=4096,framed=False):
+        """
+        Tells the Arduino to send every HX711 reading, as text ('C') or as
+        binary frames ('B'), and starts the thread that reads them into a
+        ring buffer with their arrival time (frames: the time of the
+        conversion on the board, moved onto the computer's clock). Single-byte commands to the same Arduino (motor steps, ...)
+        can still be sent while it streams. The Arduino resets when the
+        port is opened and misses what is sent while it boots, so the
+        command is sent again every second until the first reading comes.
+
+        Parameters:
+                capacity    : int > 0   : number of readings kept, the oldest are overwritten
+                framed      : bool      : True to stream binary frames, see loadCellProtocol.py
+        """
+        assert self._reader is None, "already streaming"
+        self._ring = rb.RingBuffer(capacity)
+        self._stopReader.clear()
+        self._readerError = None
+        self.framed = framed
+        self.parser = lcp.FrameParser() if framed else None
+        self._clockOffset = None
+        self._ser.write(self._streamCommand())
+        self._reader = threading.Thread(target=self._readStream, name='LoadCellReader', daemon=True)
+        self._reader.start()
+
+
+    def stopStreaming(self):
+        """
+        Tells the Arduino to stop streaming ('X'), stops the reader, and
+        drops what is left unread on the port. The readings stay in
+        readings() until streaming is started again.
+        """
+        if self._reader is None:
+            return
+        self._ser.write(b'X')
+        self._stopReader.set()
+        self._reader.join()
+        self._reader = None
+        self._ser.reset_input_buffer()
+
+
+    def readings(self):
+        """
+        Gets every streamed reading still in the ring buffer.
+
+        Return: (values, timestamps) as tuple of np.ndarray, oldest first, timestamps as POSIX time
+        """
+        assert self._ring is not None, "call startStreaming first"
+        return self._ring.snapshot()
+
+
+    def _estimate(self,values):
+        """
+        Combines samples with the estimator.
+
+        Return: (value, standard error, samples used) as tuple
+        """
+        return rs.estimate(values,self.estimator['method'],**self.estimator['options'])
+
+
+    def _precise(self,values):
+        """
+        Checks if enough samples were taken for the precision set.
+
+        Return: bool
+        """
+        precision = self.estimator['precision']
+        if precision is None or len(values) < self.estimator['minSamples']:
+            return False
+        return self._estimate(values)[1] <= precision
+
+
+    def _streamedEstimate(self,samples,window,since,timeout):
+        """
+        Combines the streamed readings of a measurement. With a precision
+        set, the latest minSamples readings are tried first and the number
+        doubles (waiting for new readings if needed) until the estimate
+        is precise enough or samples readings are used.
+
+        Return: (value, standard error, readings used) as tuple
+        """
+        if window is not None or self.estimator['precision'] is None:
+            return self._estimate(self._streamedValues(samples,window,since,timeout))
+        count = min(samples, self.estimator['minSamples'])
+        while True:
+            values = self._streamedValues(count,None,since,timeout)
+            if count == samples or self._precise(values):
+                return self._estimate(values)
+            count = min(samples, 2*count)
+
+
+    def _parseRead(self,line):
+        """
+        Gets the force in a line read from the Arduino.
+
+        Return: force as float, NaN if the line is not a number (the estimators skip it)
+        """
+        try:
+            return float(line)
+        except ValueError:
+            return float('nan')
+
+
+    def _streamedValues(self,samples,window,since,timeout):
+        """
+        Gets the streamed readings a measurement is averaged over, waiting
+        for new ones only if there are not enough.
+
+        Return: values as np.ndarray
+        """
+        ring = self._ring
+        assert window is not None or samples <= ring.capacity
+        deadline = time.time() + timeout
+        while True:
+            if self._readerError is not None:
+                raise self._readerError
+            values, timestamps = ring.snapshot()
+            start = since if since is not None else -np.inf
+            if window is not None:
+                start = max(start, time.time() - window)
+                values = values[timestamps > start]
+                missing = 1 if len(values) == 0 else 0
+            else:
+                values = values[timestamps > start][-samples:]
+                missing = samples - len(values)
+            if missing == 0:
+                return values
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutError('load cell streamed %d of the %d readings needed' % (len(values), len(values)+missing))
+            if not ring.waitFor(ring.written + missing, remaining) and time.time() < deadline:
+                if self._readerError is not None:
+                    raise self._readerError
+                raise RuntimeError('load cell stopped streaming')           # closed before the readings came
+
+
+    def _streamCommand(self):
+        """
+        Gets the command that starts streaming in the current mode.
+
+        Return: command as bytes
+        """
+        return b'B' if self.framed else b'C'
+
+
+    def _readStream(self):
+        """
+        Splits what the Arduino streams into lines (or frames) and pushes
+        each reading into the ring buffer, until stopStreaming is called.
+        """
+        pending = b''
+        requested = time.time()
+        try:
+            while not self._stopReader.is_set():
+                if self._ring.written == 0 and time.time() - requested > 1:
+                    self._ser.write(self._streamCommand())                  # lost while the Arduino was booting
+                    requested = time.time()
+                chunk = self._ser.read(max(1, self._ser.in_waiting))      # blocks up to the port timeout
+                if not chunk:
+                    continue
+                now = time.time()
+                if self.framed:
+                    self._pushFrames(chunk,now)
+                    continue
+                lines = (pending + chunk).split(b'\n')
+                pending = lines.pop()                                       # incomplete last line
+                for line in lines:
+                    try:
+                        self._ring.push(float(line), now)
+                    except ValueError:
+                        self.rejected += 1
+        except Exception as error:
+            self._readerError = error
+        finally:
+            self._ring.close()
 
 
 
@@ -150,13 +385,104 @@ class LoadCell(instr.Instrument):
         Returns: 14 bytes read from Arduino
         """
         return self._ser.read(14)
+
+
+    def setStore(self,store):
+        """
+        Setter for the store the measurements are kept in; data and
+        allData become views of it. Give it a spill file for long runs.
+
+        Example: setStore(LoadStore(spill='Logs/load_run.dat'))
+
+        Parameters:
+                store : LoadStore : where the measurements are kept
+        """
+        assert isinstance(store, ls.LoadStore)
+        self.store = store
+        self.data = ls.MeasurementList(store,recorded=True)
+        self.allData = ls.MeasurementList(store)
+
+
+    def setEstimator(self,method='mean',precision=None,minSamples=3,**options):
+        """
+        Setter for how the samples of a measurement are combined, see
+        robustStats.estimate. A median, trimmed mean, or sigma-clipped
+        mean ignores a corrupted read or spike that would shift the mean.
+
+        Example: setEstimator('clipped', precision=0.01, sigma=3)
+
+        Parameters:
+                method      : str           : 'mean', 'median', 'trimmed' or 'clipped'
+                precision   : float > 0     : stop sampling once the standard error is this small in N,
+                                              None to always take all samples
+                minSamples  : int > 1       : fewest samples the standard error is trusted with
+                options     : keywords      : proportion for 'trimmed', sigma and iterations for 'clipped'
+        """
+        assert method in rs.ESTIMATORS
+        assert precision is None or precision > 0
+        assert type(minSamples) == int and minSamples > 1
+        rs.estimate([0.0,1.0,2.0],method,**options)                        # reject unknown options now
+        self.estimator = {'method':method,'precision':precision,'minSamples':minSamples,'options':options}
+
+
+    def setCalibration(self,offset,countsPerNewton):
+        """
+        Setter for the calibration of the raw HX711 values streamed in
+        frames: force = (raw - offset)/countsPerNewton. Readings already
+        in the ring buffer keep the calibration they were read with.
+
+        Parameters:
+                offset          : float     : raw value at 0 N
+                countsPerNewton : float     : raw counts per N, from a known weight
+        """
+        assert countsPerNewton != 0
+        self.offset = offset
+        self.countsPerNewton = countsPerNewton
+
+
+    def tare(self,samples=10):
+        """
+        Makes the current load read 0 N by moving the offset by the
+        estimate of the next samples frames (see setEstimator).
+
+        Return: the new offset as float
+
+        Parameters:
+                samples : int > 0 : number of readings averaged
+        """
+        assert self.framed and self._reader is not None, "stream frames first, see startStreaming"
+        force = self._estimate(self._streamedValues(samples,None,time.time(),10))[0]
+        self.offset += force*self.countsPerNewton
+        return self.offset
     
     
+    def _pushFrames(self,chunk,now):
+        """
+        Decodes the frames in chunk and pushes their calibrated forces into
+        the ring buffer in one go. The board's clock is put onto the
+        computer's with the smallest delay seen between a conversion and
+        its arrival, so the timestamps are not shifted by how late the
+        port was read.
+
+        Parameters:
+                chunk   : bytes : bytes read from the port
+                now     : float : POSIX time they were read
+        """
+        raw, seconds = self.parser.feed(chunk)
+        if len(raw) == 0:
+            return
+        delay = now - seconds[-1]
+        if self._clockOffset is None or delay < self._clockOffset:
+            self._clockOffset = delay
+        self._ring.extend((raw - self.offset)/self.countsPerNewton, seconds + self._clockOffset)
+
+
     def _endSerial(self):
         """
-        Closes serial communication
+        Closes serial communication and spills what the store holds in memory
         """
         self._ser.close()
+        self.store.close()
     
 
 # EXECUTION =======================================================
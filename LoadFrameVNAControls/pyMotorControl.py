@@ -28,6 +28,7 @@ class Motor(object):
             stepSize : float > 0        : step size of the stepper motor
             baseStep : float > 0        : size of step in degrees at full step size
             ser      : Serial object    : establishes serial communications
+            direction: int              : +1 in the direction the motor turns after the Arduino starts, -1 after changeDirection
     """
 
     def __init__(self,ser,stepSize,baseStep=1.8):
@@ -42,6 +43,7 @@ class Motor(object):
         self.setSer(ser)
         self.setStepSize(stepSize)
         self.setBaseStep(baseStep)
+        self.direction = 1
 
 
     def setSer(self,ser):
@@ -91,6 +93,25 @@ class Motor(object):
         self._ser.write(b'S')
 
 
+    def doSteps(self,steps,stepTime=0.005):
+        """
+        Steps the motor steps times in as few writes as possible. The
+        Uno only buffers 64 received bytes, so the steps are sent 32 at
+        a time with the time the previous ones take in between.
+
+        Parameters:
+                steps       : int >= 0      : number of steps
+                stepTime    : float >= 0    : seconds the Arduino takes per step
+        """
+        assert type(steps) == int
+        assert steps >= 0
+        for sent in range(0,steps,32):
+            chunk = min(32,steps - sent)
+            if sent:
+                time.sleep(32*stepTime)
+            self._ser.write(b'S'*chunk)
+
+
     def halfTurnMotor(self):
         """
         Turns the stepper motor 180 degrees provided the motor step size is set to 1
@@ -155,6 +176,19 @@ class Motor(object):
         counterclockwise by default
         """
         self._ser.write(b'D')
+        self.direction = -self.direction
+
+
+    def setDirection(self,direction):
+        """
+        Turns the motor in direction from now on, changing it only if needed.
+
+        Parameters:
+                direction : int : +1 for the direction after the Arduino starts, -1 for the other
+        """
+        assert direction in [1,-1]
+        if direction != self.direction:
+            self.changeDirection()
 
     
     def _endSerial(self):
@@ -0,0 +1,199 @@
+"""
+ringBuffer
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the RingBuffer class, a fixed-size NumPy buffer that
+a reader thread fills with measurements (sweeps of the VNA, samples of
+the load cell) while the rest of the program takes them out. Nothing is
+allocated after the buffer is built, and when the consumer falls behind
+the oldest measurements are overwritten and counted as dropped instead
+of memory growing without bound.
+
+See ttrvna.py and pyLoadControl.py for how it is used.
+"""
+
+# IMPORTS ===================================================================
+import threading
+import time
+import numpy as np
+
+
+# RingBuffer ================================================================
+
+class RingBuffer(object):
+    """
+    Fixed-size, thread-safe ring buffer of equally shaped rows, each with a
+    timestamp. One thread pushes, another pops in order; the newest row
+    and the whole retained history can be read at any time as well.
+
+    Attributes:
+            capacity    : int > 0       : number of rows kept
+            data        : np.ndarray    : (capacity,) + shape storage, written in place
+            timestamps  : np.ndarray    : POSIX time of each row
+            written     : int           : rows pushed since the buffer was built
+            dropped     : int           : rows overwritten before they were popped
+            _read       : int           : rows popped or dropped so far
+            _closed     : bool          : True once close() has been called
+            _condition  : Condition     : wakes a waiting pop() when a row is pushed
+    """
+
+    def __init__(self,capacity,shape=(),dtype=np.float64):
+        """
+        Constructor that allocates the buffer.
+
+        Parameters:
+                capacity    : int > 0           : number of rows kept
+                shape       : tuple of int      : shape of each row, () for single values
+                dtype       : NumPy dtype       : type of the values
+        """
+        assert type(capacity) == int
+        assert capacity > 0
+        self.capacity = capacity
+        self.data = np.zeros((capacity,)+tuple(shape), dtype=dtype)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.written = 0
+        self.dropped = 0
+        self._read = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+
+    def push(self,values,timestamp=None):
+        """
+        Copies values into the next row, overwriting the oldest row if
+        the buffer is full.
+
+        Parameters:
+                values      : array-like    : row to store, must fit the shape of the buffer
+                timestamp   : float         : POSIX time of the row, now if None
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        with self._condition:
+            if self.written - self._read >= self.capacity:     # oldest unread row is about to be overwritten
+                self.dropped += 1
+                self._read += 1
+            index = self.written % self.capacity
+            self.data[index] = values
+            self.timestamps[index] = timestamp
+            self.written += 1
+            self._condition.notify_all()
+
+
+    def extend(self,rows,timestamps):
+        """
+        Copies several rows in at once, as if each was pushed in turn.
+
+        Parameters:
+                rows        : array-like        : rows to store, first axis is the row
+                timestamps  : array-like        : POSIX time of each row
+        """
+        rows = np.asarray(rows, dtype=self.data.dtype)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        assert len(rows) == len(timestamps)
+        with self._condition:
+            skipped = max(0, len(rows) - self.capacity)                 # only the last capacity rows can be kept,
+            rows = rows[skipped:]                                       # the others count as pushed and overwritten
+            timestamps = timestamps[skipped:]
+            self.written += skipped
+            count = len(rows)
+            overwritten = max(0, self.written - self._read + count - self.capacity)
+            self.dropped += overwritten
+            self._read += overwritten
+            index = (self.written + np.arange(count)) % self.capacity
+            self.data[index] = rows
+            self.timestamps[index] = timestamps
+            self.written += count
+            self._condition.notify_all()
+
+
+    def pop(self,timeout=None):
+        """
+        Takes the oldest row that was not popped yet, waiting for one
+        to be pushed if there is none.
+
+        Return: (values, timestamp, sequence) as tuple with a copy of the row and
+                the number of rows pushed before it, or None if timeout passed
+                or the buffer was closed and is empty
+
+        Parameters:
+                timeout : float > 0 : longest wait in seconds, forever if None
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.written > self._read or self._closed, timeout):
+                return None
+            if self.written == self._read:
+                return None                                             # closed and empty
+            sequence = self._read
+            self._read += 1
+            index = sequence % self.capacity
+            return self.data[index].copy(), self.timestamps[index], sequence
+
+
+    def latest(self):
+        """
+        Gets the newest row without popping anything.
+
+        Return: (values, timestamp, sequence) as tuple with a copy of the row, None if empty
+        """
+        with self._condition:
+            if self.written == 0:
+                return None
+            sequence = self.written - 1
+            index = sequence % self.capacity
+            return self.data[index].copy(), self.timestamps[index], sequence
+
+
+    def snapshot(self):
+        """
+        Gets every row still in the buffer, oldest first, without popping anything.
+
+        Return: (values, timestamps) as tuple of np.ndarray copies
+        """
+        with self._condition:
+            count = min(self.written, self.capacity)
+            order = np.arange(self.written - count, self.written) % self.capacity
+            return self.data[order], self.timestamps[order]
+
+
+    def waitFor(self,written,timeout=None):
+        """
+        Waits until at least written rows have been pushed since the buffer
+        was built, or it is closed.
+
+        Return: True if they were pushed, False if timeout passed or the buffer was closed first
+
+        Parameters:
+                written : int       : number of rows pushed to wait for
+                timeout : float > 0 : longest wait in seconds, forever if None
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.written >= written or self._closed, timeout)
+            return self.written >= written
+
+
+    def unread(self):
+        """
+        Gets the number of rows that were pushed but not popped or dropped yet.
+
+        Return: int
+        """
+        with self._condition:
+            return self.written - self._read
+
+
+    def close(self):
+        """
+        Wakes any waiting pop(); pops return what is left and then None.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+    def __len__(self):
+        """
+        Number of rows held, at most capacity
+        """
+        return min(self.written, self.capacity)
@@ -0,0 +1,181 @@
+"""
+robustStats
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the estimators the load cell readings of a load step
+can be averaged with. The plain mean is ruined by a single corrupted
+read or spike; the median, the trimmed mean, and the sigma-clipped mean
+are not. Each comes with its standard error, so sampling can stop as
+soon as the estimate is precise enough (see LoadCell.takeMeasurement).
+
+All functions work on NumPy arrays along an axis (the last by default),
+so many sets of readings can be estimated at once without a loop.
+
+Example:
+    value, error, used = estimate(readings, 'clipped', sigma=3)
+"""
+
+# IMPORTS ===================================================================
+import numpy as np
+
+
+# Estimators estimate() knows
+ESTIMATORS = ['mean','median','trimmed','clipped']
+
+# Standard deviation of a normal distribution is 1.4826 times its median absolute deviation
+MAD_TO_SIGMA = 1.4826
+
+# The median of normal samples is sqrt(pi/2) times as uncertain as their mean
+MEDIAN_EFFICIENCY = np.sqrt(np.pi/2)
+
+
+# FUNCTIONS =================================================================
+
+def estimate(values,method='mean',axis=-1,proportion=0.1,sigma=3.0,iterations=5):
+    """
+    Estimates the center of values and its standard error.
+
+    mean    : arithmetic mean, standard deviation/sqrt(n)
+    median  : median, error from the median absolute deviation, so outliers do not inflate it
+    trimmed : mean without the proportion lowest and highest values,
+              error from the winsorized standard deviation (Tukey-McLaughlin)
+    clipped : mean of the values within sigma standard deviations of the
+              median, repeated up to iterations times, error of the values kept
+
+    Return: (value, standardError, count) as tuple, count is how many values the
+            estimate used; np.ndarray if values has more than one dimension
+
+    Parameters:
+            values      : array-like    : readings, NaN is ignored
+            method      : str           : 'mean', 'median', 'trimmed' or 'clipped'
+            axis        : int           : axis the readings are along
+            proportion  : 0 <= float < 0.5 : fraction cut from each end for 'trimmed'
+            sigma       : float > 0     : clipping limit in standard deviations for 'clipped'
+            iterations  : int > 0       : most clipping passes for 'clipped'
+    """
+    assert method in ESTIMATORS
+    values = np.moveaxis(np.asarray(values, dtype=np.float64), axis, -1)
+    if method == 'mean':
+        count = np.sum(~np.isnan(values), axis=-1)
+        value = np.nanmean(values, axis=-1)
+        error = _nanstd(values)/np.sqrt(count)
+    elif method == 'median':
+        count = np.sum(~np.isnan(values), axis=-1)
+        value = np.nanmedian(values, axis=-1)
+        spread = MAD_TO_SIGMA*np.nanmedian(np.abs(values - value[...,None]), axis=-1)
+        error = MEDIAN_EFFICIENCY*spread/np.sqrt(count)
+    elif method == 'trimmed':
+        value, error, count = _trimmed(values, proportion)
+    else:
+        kept = np.where(sigmaClip(values, sigma, iterations), values, np.nan)
+        count = np.sum(~np.isnan(kept), axis=-1)
+        value = np.nanmean(kept, axis=-1)
+        error = _nanstd(kept)/np.sqrt(count)
+    error = np.where(count > 1, error, np.inf)                              # one reading says nothing about the spread
+    if np.ndim(value) == 0:
+        return float(value), float(error), int(count)
+    return value, error, count
+
+
+def median(values,axis=-1):
+    """
+    Gets the median of values, see estimate.
+
+    Return: float or np.ndarray
+    """
+    return estimate(values,'median',axis)[0]
+
+
+def trimmedMean(values,proportion=0.1,axis=-1):
+    """
+    Gets the mean of values without the proportion lowest and highest, see estimate.
+
+    Return: float or np.ndarray
+    """
+    return estimate(values,'trimmed',axis,proportion=proportion)[0]
+
+
+def sigmaClippedMean(values,sigma=3.0,iterations=5,axis=-1):
+    """
+    Gets the mean of the values within sigma standard deviations of the median, see estimate.
+
+    Return: float or np.ndarray
+    """
+    return estimate(values,'clipped',axis,sigma=sigma,iterations=iterations)[0]
+
+
+def standardError(values,method='mean',axis=-1,**options):
+    """
+    Gets the standard error of an estimate of values, see estimate.
+
+    Return: float or np.ndarray
+    """
+    return estimate(values,method,axis,**options)[1]
+
+
+def sigmaClip(values,sigma=3.0,iterations=5):
+    """
+    Finds the values within sigma standard deviations of the median
+    along the last axis. The standard deviation is taken from the
+    values kept so far, so each pass can remove outliers the previous
+    one hid; it stops early when a pass removes nothing.
+
+    Return: True for each value kept as np.ndarray of bool
+
+    Parameters:
+            values      : np.ndarray    : readings along the last axis, NaN is never kept
+            sigma       : float > 0     : clipping limit in standard deviations
+            iterations  : int > 0       : most passes
+    """
+    assert sigma > 0
+    assert type(iterations) == int and iterations > 0
+    values = np.asarray(values, dtype=np.float64)
+    kept = ~np.isnan(values)
+    for _ in range(iterations):
+        current = np.where(kept, values, np.nan)
+        center = np.nanmedian(current, axis=-1)[...,None]
+        spread = np.nanstd(current, axis=-1)[...,None]
+        within = kept & (np.abs(values - center) <= sigma*spread)
+        if np.array_equal(within, kept):
+            break
+        kept = within
+    return kept
+
+
+# HELPER FUNCTIONS ==========================================================
+
+def _trimmed(values,proportion):
+    """
+    Gets the trimmed mean along the last axis, its standard error, and
+    the number of values left after trimming.
+
+    Return: (value, error, count) as tuple
+    """
+    assert 0 <= proportion < 0.5
+    ordered = np.sort(values, axis=-1)                                      # NaN sorts to the end
+    count = np.sum(~np.isnan(ordered), axis=-1)
+    cut = np.floor(proportion*count).astype(int)
+    position = np.arange(ordered.shape[-1])
+    inside = (position >= cut[...,None]) & (position < (count - cut)[...,None])
+    value = np.nanmean(np.where(inside, ordered, np.nan), axis=-1)
+
+    low = np.take_along_axis(ordered, cut[...,None], axis=-1)               # winsorize: the cut values are
+    high = np.take_along_axis(ordered, np.maximum(count - cut - 1, 0)[...,None], axis=-1)     # set to the extremes kept
+    winsorized = np.where(np.isnan(ordered), np.nan, np.clip(ordered, low, high))
+    kept = count - 2*cut
+    error = _nanstd(winsorized)/((1 - 2*cut/np.maximum(count, 1))*np.sqrt(count))
+    return value, error, kept
+
+
+def _nanstd(values):
+    """
+    Gets the sample standard deviation (n - 1) along the last axis, ignoring NaN.
+
+    Return: float or np.ndarray, NaN with fewer than two values
+    """
+    count = np.sum(~np.isnan(values), axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nanmean(values, axis=-1)[...,None]
+        squares = np.nansum((values - mean)**2, axis=-1)
+        return np.sqrt(squares/(count - 1))
@@ -0,0 +1,173 @@
+"""
+segments
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the planner for segmented sweeps. Instead of spreading
+the points of a sweep evenly between start and stop, the span is cut into
+segments and each segment gets points according to how curved the
+previous sweep was there: many points where the trace bends (resonances,
+notches), few where it is flat. With the same number of points features
+are resolved better, and for the same resolution on the features the
+sweep needs fewer points and finishes sooner.
+
+Example:
+    sweep = vna.makeSweep()                                 # ordinary linear sweep
+    vna.setSegments(planSegments(sweep.freqDomain, sweep.real, budget=401))
+    vna.makeSweep()                                         # segmented sweep
+
+See ttrvna.py for how the segment table is sent to the VNA.
+"""
+
+# IMPORTS ===================================================================
+import numpy as np
+
+
+# SegmentTable ==============================================================
+
+class SegmentTable(object):
+    """
+    The segments of a sweep as (start, stop, points) rows. Segments do
+    not overlap and no frequency is swept twice.
+
+    Attributes:
+            rows : np.ndarray : (segments x 3) array of start (Hz), stop (Hz), and points
+    """
+
+    def __init__(self,rows):
+        """
+        Constructor that checks the segments.
+
+        Parameters:
+                rows : array-like : (start, stop, points) of each segment, in increasing frequency
+        """
+        rows = np.array(rows, dtype=np.float64).reshape(-1, 3)
+        assert len(rows) > 0
+        assert np.all(rows[:,2] >= 1)
+        assert np.all(rows[:,1] >= rows[:,0])
+        assert np.all(rows[1:,0] > rows[:-1,1]), "segments must be in order and must not overlap"
+        self.rows = rows
+
+
+    @property
+    def points(self):
+        """
+        Total number of points of the sweep
+        """
+        return int(self.rows[:,2].sum())
+
+
+    def frequencies(self):
+        """
+        Gets the frequency of every point of the segmented sweep, as the VNA
+        will sweep them.
+
+        Return: frequencies as np.ndarray
+        """
+        return np.concatenate([np.linspace(start, stop, int(points)) for start, stop, points in self.rows])
+
+
+    def command(self):
+        """
+        Gets the SCPI command that loads the table into channel 1. The
+        data block is <format 5>, <stop/start mode 0>, four flags for
+        the optional per segment IF bandwidth, power, delay, and time
+        (all 0, so the channel settings are used), the number of
+        segments, and then start, stop, and points of each segment.
+
+        Return: command as str
+        """
+        header = [5, 0, 0, 0, 0, 0, len(self.rows)]
+        values = ','.join('%.0f,%.0f,%d' % (start, stop, points) for start, stop, points in self.rows)
+        return 'sense1:segment:data %s,%s' % (','.join(str(value) for value in header), values)
+
+
+# FUNCTIONS =================================================================
+
+def curvature(freqDomain,values,smooth=5):
+    """
+    Gets how strongly a trace bends at each point: the magnitude of its
+    second difference, smoothed with a moving average over smooth points
+    so that noise does not pull points away from real features.
+
+    Return: curvature of each point as np.ndarray
+
+    Parameters:
+            freqDomain  : np.ndarray    : frequency of each point
+            values      : np.ndarray    : measured value of each point (e.g. dB magnitude)
+            smooth      : int > 0       : length of the moving average
+    """
+    values = np.asarray(values, dtype=np.float64)
+    bend = np.zeros(len(values))
+    bend[1:-1] = np.abs(values[:-2] - 2*values[1:-1] + values[2:])
+    if smooth > 1:
+        bend = np.convolve(bend, np.ones(smooth)/smooth, mode='same')
+    return bend
+
+
+def planSegments(freqDomain,values,budget=None,resolution=None,segments=16,floor=0.1,minPoints=2):
+    """
+    Plans a segmented sweep from a previous sweep. The span of the previous
+    sweep is cut into equally wide segments, each weighted by the curvature
+    of the trace inside it plus a floor, so flat regions still get points.
+
+    Give either:
+        budget      : the total number of points is fixed and shared out in
+                      proportion to the weights
+        resolution  : the most curved segment gets this point spacing (Hz), the
+                      others a spacing that grows as their weight shrinks, up
+                      to the spacing of the previous sweep
+
+    Return: SegmentTable
+
+    Parameters:
+            freqDomain  : np.ndarray    : frequency of each point of the previous sweep
+            values      : np.ndarray    : measured value of each point of the previous sweep
+            budget      : int > 0       : total number of points
+            resolution  : float > 0     : finest point spacing in Hz
+            segments    : int > 0       : number of segments
+            floor       : float >= 0    : weight every segment gets, as a fraction of the mean curvature
+            minPoints   : int > 1       : fewest points of a segment
+    """
+    assert (budget is None) != (resolution is None), "give either budget or resolution"
+    assert type(segments) == int and segments > 0
+    assert type(minPoints) == int and minPoints >= 2
+    freqDomain = np.asarray(freqDomain, dtype=np.float64)
+    edges = np.linspace(freqDomain[0], freqDomain[-1], segments+1)
+
+    bend = curvature(freqDomain,values)
+    segment = np.clip(np.searchsorted(edges, freqDomain, side='right') - 1, 0, segments-1)
+    weights = np.bincount(segment, weights=bend, minlength=segments)
+    weights = weights + floor*max(weights.mean(), np.finfo(float).tiny)
+
+    widths = np.diff(edges)
+    if budget is not None:
+        assert type(budget) == int and budget >= minPoints*segments
+        points = _shareOut(budget, weights, minPoints)
+    else:
+        assert resolution > 0
+        coarse = max(resolution, (freqDomain[-1] - freqDomain[0])/(len(freqDomain) - 1))
+        spacing = np.clip(resolution*weights.max()/weights, resolution, coarse)
+        points = np.maximum(minPoints, np.ceil(widths/spacing).astype(int))
+
+    rows = []
+    for i in range(segments):
+        last = i == segments - 1
+        step = widths[i]/(points[i] - 1 if last else points[i])           # the last segment ends on the stop frequency,
+        rows.append((edges[i], edges[i] + step*(points[i] - 1), points[i])) # the others stop one step before the next
+    return SegmentTable(rows)
+
+
+def _shareOut(budget,weights,minPoints):
+    """
+    Shares budget points out in proportion to weights, at least minPoints
+    each, with the rounding remainder going to the largest weights.
+
+    Return: points of each segment as np.ndarray of int
+    """
+    spare = budget - minPoints*len(weights)
+    exact = spare*weights/weights.sum()
+    points = np.floor(exact).astype(int)
+    remainder = spare - points.sum()
+    points[np.argsort(exact - points)[::-1][:remainder]] += 1
+    return points + minPoints
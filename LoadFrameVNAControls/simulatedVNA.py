@@ -0,0 +1,504 @@
+"""
+simulatedVNA
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the SimulatedTtr506a class, a stand-in for the VISA
+resource of the TTR506A that answers the SCPI Ttrvna sends with
+synthetic data, so the whole acquisition (configuration, triggering,
+completion, binary or ascii transfer, parsing, writing, storing) can be
+run and benchmarked without the VNA or even VISA installed.
+
+It simulates one resonance: a notch in S21/S12 and a peak in S11/S22,
+with noise, at a frequency that can drift from sweep to sweep like it
+does under load. A sweep takes sweepTime seconds, so the completion
+modes wait for it like they would for the real instrument, and a trace
+read before the sweep is complete is torn like on the instrument: the
+points already measured come from the new sweep, the rest from the last.
+
+Example:
+    register('SIM::TTR506A', points=1601, sweepTime=0.02)
+    vna = Ttrvna(start='50 MHz', stop='6 GHz', delay='0s', sParam='S21', trials=10,
+                 resource='SIM::TTR506A')
+    vna.run()
+
+See benchmarks.py (benchAcquisition) for the acquisition benchmark.
+"""
+
+# IMPORTS ===================================================================
+import time
+import numpy as np
+import instrument as instr
+
+
+# Answer to *idn?
+IDENTITY = 'Tektronix,TTR506A,SIMULATED,1.0'
+
+# S parameters the traces can be defined as
+_S_PARAMETERS = ['S11','S21','S12','S22']
+
+
+# FUNCTIONS =================================================================
+
+def register(resourceName='SIM::TTR506A',**settings):
+    """
+    Makes resourceName open a SimulatedTtr506a instead of a VISA resource,
+    see instrument.registerSimulator. The settings are passed to the
+    constructor when the session is opened.
+
+    Return: resourceName as str
+
+    Parameters:
+            resourceName    : str   : name instances are given as resource
+            settings        : dict  : keyword arguments of SimulatedTtr506a
+    """
+    instr.registerSimulator(resourceName, lambda: SimulatedTtr506a(**settings))
+    return resourceName
+
+
+# SimulatedTtr506a ==========================================================
+
+class SimulatedTtr506a(object):
+    """
+    Simulated VISA resource of the TTR506A. Compound messages are split
+    at ';' and each command is handled on its own, like the instrument
+    does. Commands it does not know are put in the error queue
+    (system:error?) instead of being silently ignored, so a command
+    Ttrvna starts sending shows up in the tests.
+
+    Attributes:
+            sweepTime   : float >= 0    : seconds a sweep takes
+            resonance   : float         : frequency of the resonance in Hz at the first sweep
+            width       : float > 0     : full width at half depth of the resonance in Hz
+            depth       : float > 0     : depth of the notch in S21 in dB
+            noise       : float >= 0    : standard deviation of the complex noise added to each point
+            drift       : float         : Hz the resonance moves each sweep
+            settings    : dict          : current instrument settings, see _defaults
+            errors      : list of str   : error queue, read with system:error?
+            messages    : int           : messages received
+            sweeps      : int           : sweeps started
+            timeout     : int           : VISA timeout in ms (kept only so it can be set)
+            _answers    : list of bytes : answers waiting to be read
+            _sweepEnd   : float         : perf_counter time the current sweep is done
+            _opcArmed   : bool          : *opc was sent and the OPC bit is set when the sweep is done
+            _esr        : int           : event status register
+            _started    : float         : perf_counter time continuous sweeping started
+            _seed       : int           : seed of the noise
+    """
+
+    def __init__(self,points=201,sweepTime=0.05,resonance=2.4e9,width=5e6,depth=30,noise=0.001,drift=0,seed=0):
+        """
+        Constructor that initializes attributes of SimulatedTtr506a instance.
+
+        Parameters:
+                points      : int > 1       : points of a sweep until sense1:sweep:points is sent
+                sweepTime   : float >= 0    : seconds a sweep takes
+                resonance   : float         : frequency of the resonance in Hz
+                width       : float > 0     : width of the resonance in Hz
+                depth       : float > 0     : depth of the notch in S21 in dB
+                noise       : float >= 0    : standard deviation of the complex noise of each point
+                drift       : float         : Hz the resonance moves each sweep
+                seed        : int           : seed of the noise
+        """
+        assert type(points) == int and points > 1
+        assert sweepTime >= 0
+        assert width > 0 and depth > 0 and noise >= 0
+        self.sweepTime = sweepTime
+        self.resonance = resonance
+        self.width = width
+        self.depth = depth
+        self.noise = noise
+        self.drift = drift
+        self.timeout = 2000
+        self.errors = []
+        self.messages = 0
+        self.sweeps = 0
+        self._seed = seed
+        self._points = points
+        self._answers = []
+        self.write('*rst')
+        self.messages = 0
+
+
+    # VISA RESOURCE =========================================================
+
+    def write(self,message):
+        """
+        Handles every command of a message. Answers to queries are kept
+        until they are read.
+
+        Parameters:
+                message : str : SCPI message, commands separated by ';'
+        """
+        self.messages += 1
+        for command in message.split(';'):
+            command = command.strip().lstrip(':')
+            if command:
+                self._handle(command)
+
+
+    def read_raw(self):
+        """
+        Reads the oldest answer.
+
+        Return: answer as bytes
+        """
+        if not self._answers:
+            raise IOError('Timeout: the simulated TTR506A has nothing to answer (error queue: %s)' % self.errors)
+        return self._answers.pop(0)
+
+
+    def read(self):
+        """
+        Reads the oldest answer as text, without the line feed.
+
+        Return: answer as str
+        """
+        return self.read_raw().decode('latin_1').rstrip('\n')
+
+
+    def query(self,message):
+        """
+        Writes message and reads the answer as text.
+
+        Return: answer as str
+        """
+        self.write(message)
+        return self.read()
+
+
+    def query_ascii_values(self,message,converter='f',separator=',',container=list,**kwargs):
+        """
+        Writes message and reads the ascii answer as numbers.
+
+        Return: values in container
+        """
+        self.write(message)
+        return container([float(value) for value in self.read().split(separator)])
+
+
+    def query_binary_values(self,message,datatype='f',is_big_endian=False,container=list,**kwargs):
+        """
+        Writes message and decodes the IEEE-488.2 definite-length block it
+        is answered with, like pyvisa does. As on the instrument, the block
+        holds what format:data and format:border say, whatever datatype is.
+
+        Return: values in container
+        """
+        self.write(message)
+        answer = self.read_raw()
+        if not answer.startswith(b'#'):
+            raise ValueError('answer is not a binary block: %r' % answer[:20])
+        digits = int(answer[1:2])
+        length = int(answer[2:2+digits])
+        dtype = np.dtype(datatype).newbyteorder('>' if is_big_endian else '<')
+        values = np.frombuffer(answer[2+digits:2+digits+length], dtype=dtype)
+        return values if container is np.array else container(values)
+
+
+    def wait_for_srq(self,timeout=None):
+        """
+        Waits for the service request the end of a sweep raises when
+        *ese 1, *sre 32 and *opc were sent.
+        """
+        assert self.settings['*sre'] & 32 and self.settings['*ese'] & 1 and self._opcArmed, \
+                "no service request will come: set *ese 1, *sre 32 and send *opc"
+        self._waitForSweep()
+        self._updateEsr()
+
+
+    def clear(self):
+        """
+        Device clear: drops answers that were not read.
+        """
+        del self._answers[:]
+
+
+    def close(self):
+        """
+        Nothing to close, kept so the session can close it.
+        """
+        pass
+
+
+    # SCPI ==================================================================
+
+    def _defaults(self):
+        """
+        Gets the settings after *rst.
+
+        Return: settings as dict
+        """
+        return {'start':300e3, 'stop':6e9, 'points':self._points, 'delay':0.0,
+                'type':'linear', 'segments':None, 'continuous':True,
+                'data':'ascii', 'border':'normal', 'count':1,
+                'define':{1:'S11'}, 'format':{1:'mlogarithmic'}, 'selected':1,
+                '*ese':0, '*sre':0}
+
+
+    def _handle(self,command):
+        """
+        Carries out one command.
+        """
+        lower = command.lower()
+        name, _, argument = lower.partition(' ')
+        argument = argument.strip()
+        settings = getattr(self, 'settings', None)
+
+        if name == '*rst':
+            self.settings = self._defaults()
+            self._sweepEnd = 0.0
+            self._opcArmed = False
+            self._esr = 0
+            self._started = time.perf_counter()
+        elif name == '*cls':
+            self._esr = 0
+            self._opcArmed = False
+            del self.errors[:]
+        elif name == '*idn?':
+            self._answer(IDENTITY)
+        elif name == '*opc':
+            self._opcArmed = True
+        elif name == '*opc?':
+            self._waitForSweep()
+            self._answer('1')
+        elif name == '*esr?':
+            self._updateEsr()
+            self._answer('%d' % self._esr)
+            self._esr = 0
+        elif name in ('*ese','*sre'):
+            settings[name] = int(argument)
+        elif name == 'abort':
+            self._sweepEnd = time.perf_counter()
+        elif name == 'display:enable':
+            pass
+        elif name == 'system:error?':
+            self._answer(self.errors.pop(0) if self.errors else '0,"No error"')
+        elif name == 'initiate:immediate' or name == 'initiate1:immediate':
+            self._startSweep()
+        elif name == 'initiate1:continuous':
+            settings['continuous'] = argument in ('on','1')
+            self._started = time.perf_counter()
+        elif name == 'sense1:frequency:start':
+            settings['start'] = float(argument)
+        elif name == 'sense1:frequency:stop':
+            settings['stop'] = float(argument)
+        elif name == 'sense1:sweep:points':
+            settings['points'] = int(argument)
+        elif name == 'sense1:sweep:delay':
+            settings['delay'] = float(argument)
+        elif name == 'sense1:sweep:type':
+            settings['type'] = argument
+        elif name == 'sense1:segment:data':
+            settings['segments'] = self._parseSegments(argument)
+        elif name == 'sense1:sweep:time?':
+            self._answer('%.6E' % (self.sweepTime + settings['delay']))
+        elif name == 'sense1:frequency:data?':
+            self._answerValues(self._frequencies())
+        elif name == 'format:data':
+            settings['data'] = {'real':'real', 'real,64':'real', 'real32':'real32', 'ascii':'ascii'}[argument]
+        elif name == 'format:border':
+            settings['border'] = argument
+        elif name == 'calculate1:parameter:count':
+            settings['count'] = int(argument)
+        elif name.startswith('calculate1:parameter') and name.endswith(':define'):
+            settings['define'][self._traceOf(name)] = argument.upper()
+        elif name.startswith('calculate1:parameter') and name.endswith(':select'):
+            settings['selected'] = self._traceOf(name)
+        elif name == 'calculate1:selected:format':
+            settings['format'][settings['selected']] = argument
+        elif name == 'calculate1:selected:data:fdata?':
+            self._answerValues(self._trace(settings['selected']))
+        elif name.startswith('calculate1:selected:correction') or name.startswith('calculate1:selected:smoothing'):
+            pass
+        else:
+            self.errors.append('-113,"Undefined header; %s"' % command)
+
+
+    def _traceOf(self,name):
+        """
+        Gets the trace number of a calculate1:parameter<n>:... command.
+
+        Return: trace as int
+        """
+        return int(name[len('calculate1:parameter'):].split(':')[0])
+
+
+    def _parseSegments(self,argument):
+        """
+        Gets the (start, stop, points) rows of a sense1:segment:data block
+        in the layout SegmentTable.command() sends.
+
+        Return: rows as np.ndarray
+        """
+        values = [float(value) for value in argument.split(',')]
+        count = int(values[6])
+        return np.array(values[7:7+3*count]).reshape(count, 3)
+
+
+    def _answer(self,text):
+        """
+        Queues a text answer.
+        """
+        self._answers.append((text + '\n').encode('latin_1'))
+
+
+    def _answerValues(self,values):
+        """
+        Queues an array the way format:data and format:border say: ascii
+        text or an IEEE-488.2 definite-length block.
+        """
+        settings = self.settings
+        if settings['data'] == 'ascii':
+            self._answer(','.join('%.11E' % value for value in values))
+            return
+        dtype = np.dtype('f8' if settings['data'] == 'real' else 'f4')
+        dtype = dtype.newbyteorder('<' if settings['border'] == 'swapped' else '>')
+        payload = np.asarray(values).astype(dtype).tobytes()
+        length = str(len(payload)).encode('latin_1')
+        self._answers.append(b'#' + str(len(length)).encode('latin_1') + length + payload + b'\n')
+
+
+    # SWEEPS ================================================================
+
+    def _startSweep(self):
+        """
+        Starts a sweep, which is done sweepTime (plus the sweep delay) from now.
+        """
+        self.sweeps += 1
+        self._sweepEnd = time.perf_counter() + self.sweepTime + self.settings['delay']
+
+
+    def _waitForSweep(self):
+        """
+        Waits until the current sweep is done.
+        """
+        remaining = self._sweepEnd - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+
+    def _updateEsr(self):
+        """
+        Sets the operation complete bit if *opc was sent and the sweep is done.
+        """
+        if self._opcArmed and time.perf_counter() >= self._sweepEnd:
+            self._esr |= 1
+            self._opcArmed = False
+
+
+    def _sweepState(self):
+        """
+        Gets the last sweep finished and how far the sweep after it has
+        got. The sweep in progress draws over the finished one point by
+        point, after the sweep delay. In continuous mode the VNA starts a
+        sweep every sweep time (plus delay) on its own.
+
+        Return: (sweep, fraction) as tuple, the number of the last sweep
+                finished and the fraction of the points of the next one measured
+        """
+        settings = self.settings
+        period = self.sweepTime + settings['delay']
+        now = time.perf_counter()
+        if settings['continuous']:
+            if period <= 0:
+                return self.sweeps, 0.0
+            elapsed = now - self._started
+            finished = int(elapsed/period)
+            return self.sweeps + finished, _measured(elapsed - finished*period - settings['delay'], self.sweepTime)
+        if now >= self._sweepEnd:
+            return self.sweeps, 0.0
+        return self.sweeps - 1, _measured(now - (self._sweepEnd - self.sweepTime), self.sweepTime)
+
+
+    def _frequencies(self):
+        """
+        Gets the frequency of each point of the current sweep settings.
+
+        Return: np.ndarray
+        """
+        settings = self.settings
+        if settings['type'] == 'segment' and settings['segments'] is not None:
+            return np.concatenate([np.linspace(start, stop, int(points)) for start, stop, points in settings['segments']])
+        return np.linspace(settings['start'], settings['stop'], settings['points'])
+
+
+    def _sParameter(self,param,freqDomain,sweep):
+        """
+        Gets the complex S parameter of the simulated resonance.
+
+        Return: np.ndarray of complex128
+        """
+        center = self.resonance + self.drift*sweep
+        dip = (1 - 10**(-self.depth/20))/(1 + 2j*(freqDomain - center)/self.width)
+        values = 1 - dip if param in ('S21','S12') else dip
+        if self.noise > 0:
+            noise = np.random.RandomState((self._seed + 7919*sweep + _S_PARAMETERS.index(param)) % 2**32)
+            values = values + self.noise*(noise.standard_normal(len(values)) + 1j*noise.standard_normal(len(values)))
+        return values
+
+
+    def _trace(self,trace):
+        """
+        Gets the formatted data of a trace, two numbers per point like
+        the instrument sends them.
+
+        Return: interleaved values as np.ndarray
+        """
+        settings = self.settings
+        freqDomain = self._frequencies()
+        param = settings['define'].get(trace, 'S11')
+        sweep, fraction = self._sweepState()
+        values = self._sParameter(param, freqDomain, sweep)
+        measured = int(fraction*len(values))
+        if measured:                                                        # read mid-sweep: torn
+            values[:measured] = self._sParameter(param, freqDomain, sweep + 1)[:measured]
+        first, second = _formatted(values, freqDomain, settings['format'].get(trace, 'mlogarithmic'))
+        interleaved = np.empty(2*len(values))
+        interleaved[0::2] = first
+        interleaved[1::2] = second
+        return interleaved
+
+
+# HELPER FUNCTIONS ==========================================================
+
+def _measured(elapsed,sweepTime):
+    """
+    Gets the fraction of the points a sweep has measured elapsed seconds
+    after it started (after its delay).
+
+    Return: float between 0 and 1
+    """
+    if sweepTime <= 0:
+        return 0.0
+    return min(max(elapsed/sweepTime, 0.0), 1.0)
+
+
+def _formatted(values,freqDomain,format):
+    """
+    Converts complex S parameters into the two components the VNA sends
+    in format; single component formats have zeros as the second.
+
+    Return: (first, second) as tuple of np.ndarray
+    """
+    magnitude = np.abs(values)
+    phase = np.angle(values, deg=True)
+    if format == 'mlogarithmic':
+        return 20*np.log10(magnitude), 0.0
+    if format == 'mlinear':
+        return magnitude, 0.0
+    if format == 'phase':
+        return phase, 0.0
+    if format == 'uphase':
+        return np.rad2deg(np.unwrap(np.angle(values))), 0.0
+    if format == 'pphase':
+        return np.mod(phase, 360), 0.0
+    if format == 'gdelay':
+        return -np.gradient(np.unwrap(np.angle(values)), 2*np.pi*freqDomain), 0.0
+    if format == 'swr':
+        return (1 + magnitude)/np.maximum(1 - magnitude, 1e-12), 0.0
+    if format == 'real':
+        return values.real, 0.0
+    if format == 'imaginary':
+        return values.imag, 0.0
+    return values.real, values.imag                                             # Smith chart and polar formats, as ENA-class analyzers send them
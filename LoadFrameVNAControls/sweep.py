@@ -0,0 +1,165 @@
+"""
+sweep
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the Sweep class which holds the data of
+a single sweep from the Tektronix TTR506A VNA.
+
+See ttrvna.py for how sweeps are taken.
+"""
+
+# IMPORTS ===================================================================
+import numpy as np
+import datetime
+
+
+# Formats for which the VNA sends two meaningful components per point
+TWO_COMPONENT_FORMATS = ["slinear","slogarithmic","scomplex",
+                            "smith","sadmittance","plinear",
+                            "plogarithmic","polar"]
+
+
+# Sweep =====================================================================
+
+class Sweep(object):
+    """
+    The Sweep class holds one sweep as the single interleaved float64 buffer
+    the VNA sends (first component, second component, first, second, ...).
+    The complex128 view over that buffer shares its memory, so nothing is
+    copied to get at the complex values. Magnitude and phase are computed
+    the first time they are asked for and then kept for the rest of the sweep.
+
+    For single component formats the VNA fills the second component with
+    zeros, so real is the measured value.
+
+    Attributes:
+        values      : np.ndarray of float64 : interleaved components as sent by the VNA
+        format      : str                   : format the data was taken in
+        sParam      : str                   : S parameter that was measured
+        trial       : int                   : trial number of the sweep
+        freqDomain  : np.ndarray of float64 : frequency of each point
+        timestamp   : datetime              : when the sweep was read from the VNA
+        _magnitude  : np.ndarray of float64 : cached magnitude, None until asked for
+        _phase      : np.ndarray of float64 : cached phase, None until asked for
+    """
+
+
+    def __init__(self,values,format,sParam=None,trial=None,freqDomain=None):
+        """
+        Constructor that initializes attributes of Sweep instance.
+
+        Parameters:
+                values      : array-like of floats  : interleaved components, even length
+                format      : str                   : format the data was taken in
+                sParam      : str                   : S parameter that was measured
+                trial       : int                   : trial number of the sweep
+                freqDomain  : array-like of floats  : frequency of each point
+        """
+        values = np.ascontiguousarray(values, dtype=np.float64)   # no copy if already float64 and contiguous
+        assert values.ndim == 1
+        assert len(values) % 2 == 0
+
+        self.values = values
+        self.format = format
+        self.sParam = sParam
+        self.trial = trial
+        self.freqDomain = freqDomain
+        self.timestamp = datetime.datetime.today()
+        self._magnitude = None
+        self._phase = None
+
+
+    @property
+    def points(self):
+        """
+        Number of frequency points in the sweep
+        """
+        return len(self.values) // 2
+
+
+    @property
+    def complex(self):
+        """
+        complex128 view over values, shares memory with values
+        """
+        return self.values.view(np.complex128)
+
+
+    @property
+    def real(self):
+        """
+        First component of each point, a view into values
+        """
+        return self.values[0::2]
+
+
+    @property
+    def imag(self):
+        """
+        Second component of each point, a view into values
+        """
+        return self.values[1::2]
+
+
+    @property
+    def magnitude(self):
+        """
+        Magnitude of each point treated as first + j*second component
+        """
+        if self._magnitude is None:
+            self._magnitude = np.abs(self.complex)
+        return self._magnitude
+
+
+    @property
+    def phase(self):
+        """
+        Phase in degrees of each point treated as first + j*second component
+        """
+        if self._phase is None:
+            self._phase = np.angle(self.complex, deg=True)
+        return self._phase
+
+
+    def isTwoComponents(self):
+        """
+        Determines if the sweep is one or two components based on format
+
+        Return: True if is two component
+        """
+        return self.format in TWO_COMPONENT_FORMATS
+
+
+    def writeLog(self,filename):
+        """
+        Appends the sweep to a text log, one point per line as
+        "index: frequency<tab>first component[<tab>second component]".
+
+        Parameters:
+                filename : str : log to write to
+        """
+        index = np.arange(self.points)
+        with open(filename, "a+") as f:
+            if self.isTwoComponents():                                                  # If two components, log each
+                table = np.column_stack((index,self.freqDomain,self.real,self.imag))    # pair on same line against frequency
+                np.savetxt(f, table, fmt='%d: %s\t%s\t%s')
+            else:                                                                       # Otherwise, log 1:1 domain:range
+                table = np.column_stack((index,self.freqDomain,self.real))
+                np.savetxt(f, table, fmt='%d: %s\t%s')
+
+
+    def writeCsv(self,filename):
+        """
+        Writes the sweep to a comma delimited csv file, one point per row
+        as frequency, first component[, second component].
+
+        Parameters:
+                filename : str : csv to write to
+        """
+        if self.isTwoComponents():                                                  # Same as writeLog()
+            table = np.column_stack((self.freqDomain,self.real,self.imag))
+        else:
+            table = np.column_stack((self.freqDomain,self.real))
+        with open(filename, 'w', newline='') as csvfile:
+            np.savetxt(csvfile, table, fmt='%s', delimiter=',', newline='\r\n')     # same line endings as csv.writer
@@ -0,0 +1,215 @@
+"""
+sweepStats
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the SweepAccumulator class which averages sweeps as
+they are taken instead of reloading the csv files afterwards. For each
+frequency it keeps the running mean, variance (Welford's algorithm),
+minimum, and maximum, so it holds a few arrays of one sweep no matter
+how many sweeps are added, and it can tell when the confidence interval
+of the mean is narrow enough to stop sweeping.
+
+Example:
+    accumulator = SweepAccumulator()
+    while not accumulator.converged(0.01):
+        accumulator.add(vna.makeSweep())
+    mean = accumulator.sweep()
+
+See ttrvna.py (makeSweepAveraged) for averaging straight from the VNA.
+"""
+
+# IMPORTS ===================================================================
+import numpy as np
+import sweep as sw
+import touchstone as ts
+
+
+# Two component formats that carry the complex S parameter (see touchstone.complexFromSweep)
+COMPLEX_FORMATS = ts.COMPLEX_FORMATS
+
+
+# SweepAccumulator ==========================================================
+
+class SweepAccumulator(object):
+    """
+    Running statistics of each frequency point over the sweeps added.
+
+    Sweeps in a format listed in COMPLEX_FORMATS are averaged as complex
+    S parameters (so noise in the phase averages out instead of being
+    folded into the magnitude), and their variance is that of the
+    complex value, E|x - mean|^2. The components of other two component
+    formats (slogarithmic in dB and degrees, plinear, smith, ...) do not
+    make a complex number, so each has statistics of its own: mean,
+    variance, minimum, and maximum then have a column per component.
+    Single component formats (mlogarithmic, phase, ...) are averaged as
+    the values the VNA sent. Minimum and maximum are of the magnitude for
+    complex data.
+
+    Attributes:
+            count       : int           : sweeps added
+            mean        : np.ndarray    : running mean of each point, complex for complex data, (points, 2) for other two component data
+            minimum     : np.ndarray    : smallest value (magnitude for complex data) of each point
+            maximum     : np.ndarray    : largest value (magnitude for complex data) of each point
+            format      : str           : format of the sweeps added
+            sParam      : str           : S parameter of the sweeps added
+            freqDomain  : np.ndarray    : frequency of each point
+            _m2         : np.ndarray    : sum of squared distances from the mean of each point
+    """
+
+    def __init__(self):
+        """
+        Constructor that starts with no sweeps.
+        """
+        self.reset()
+
+
+    def reset(self):
+        """
+        Forgets every sweep added.
+        """
+        self.count = 0
+        self.mean = None
+        self.minimum = None
+        self.maximum = None
+        self.format = None
+        self.sParam = None
+        self.freqDomain = None
+        self._m2 = None
+
+
+    def isComplex(self):
+        """
+        Determines if the sweeps are averaged as complex values
+
+        Return: True if complex
+        """
+        return self.format in COMPLEX_FORMATS
+
+
+    def add(self,sweep):
+        """
+        Adds a sweep to the statistics. Every sweep must have the format
+        and number of points of the first one.
+
+        Parameters:
+                sweep : Sweep : sweep to add
+        """
+        if self.count == 0:
+            self.format = sweep.format
+            self.sParam = sweep.sParam
+            self.freqDomain = sweep.freqDomain
+        assert sweep.format == self.format, "cannot average %s with %s sweeps" % (sweep.format, self.format)
+        values = _valuesOf(sweep)
+        size = np.abs(values) if self.isComplex() else values
+
+        if self.count == 0:
+            self.mean = values.copy()
+            self._m2 = np.zeros(values.shape)
+            self.minimum = size.copy()
+            self.maximum = size.copy()
+        else:
+            assert len(values) == len(self.mean), "sweep has %d points, not %d" % (len(values), len(self.mean))
+            delta = values - self.mean
+            self.mean += delta/(self.count + 1)
+            self._m2 += (np.conj(delta)*(values - self.mean)).real     # real part is exact for complex values too
+            np.minimum(self.minimum, size, out=self.minimum)
+            np.maximum(self.maximum, size, out=self.maximum)
+        self.count += 1
+
+
+    @property
+    def variance(self):
+        """
+        Sample variance of each point, None with fewer than two sweeps
+        """
+        if self.count < 2:
+            return None
+        return self._m2/(self.count - 1)
+
+
+    @property
+    def standardError(self):
+        """
+        Standard error of the mean of each point, None with fewer than two sweeps
+        """
+        if self.count < 2:
+            return None
+        return np.sqrt(self.variance/self.count)
+
+
+    def halfWidth(self,z=1.96):
+        """
+        Gets the half width of the confidence interval of the mean of each
+        point, z standard errors (1.96 for 95 %, 2.58 for 99 %).
+
+        Return: half widths as np.ndarray, None with fewer than two sweeps
+
+        Parameters:
+                z : float > 0 : number of standard errors
+        """
+        if self.count < 2:
+            return None
+        return z*self.standardError
+
+
+    def converged(self,tolerance,z=1.96,relative=False,minSweeps=3):
+        """
+        Determines if the confidence interval of every point is within
+        tolerance, so averaging more sweeps would not change the mean by
+        much. At least minSweeps sweeps are needed, since the variance of
+        the first few sweeps is itself too noisy to trust.
+
+        Return: True if converged
+
+        Parameters:
+                tolerance   : float > 0 : largest half width allowed, in the units of the values
+                z           : float > 0 : number of standard errors of the half width
+                relative    : bool      : if True, tolerance is a fraction of the magnitude of the mean
+                minSweeps   : int > 1   : fewest sweeps before it can converge
+        """
+        assert tolerance > 0
+        assert type(minSweeps) == int and minSweeps > 1
+        if self.count < minSweeps:
+            return False
+        limit = tolerance*np.abs(self.mean) if relative else tolerance
+        return bool(np.all(self.halfWidth(z) <= limit))
+
+
+    def sweep(self,trial=None):
+        """
+        Gets the mean as a Sweep in the format of the sweeps added, so it
+        can be written and stored like any other sweep.
+
+        Return: Sweep
+
+        Parameters:
+                trial : int : trial number of the sweep
+        """
+        assert self.count > 0, "no sweeps added"
+        values = np.empty(2*len(self.mean))
+        if self.isComplex():
+            first, second = ts.componentsFromComplex(self.mean,self.format)
+        elif self.mean.ndim == 2:
+            first, second = self.mean[:,0], self.mean[:,1]
+        else:
+            first, second = self.mean, 0.0
+        values[0::2] = first
+        values[1::2] = second
+        return sw.Sweep(values,self.format,self.sParam,trial,self.freqDomain)
+
+
+# HELPER FUNCTIONS ==========================================================
+
+def _valuesOf(sweep):
+    """
+    Gets the values of a sweep that are averaged.
+
+    Return: np.ndarray, complex128 for COMPLEX_FORMATS, a (points, 2) array of
+            the components for other two component formats
+    """
+    if sweep.format in COMPLEX_FORMATS:
+        return np.array(ts.complexFromSweep(sweep), dtype=np.complex128)
+    if sweep.isTwoComponents():
+        return np.column_stack((sweep.real, sweep.imag))
+    return sweep.real.copy()
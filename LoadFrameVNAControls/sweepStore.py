@@ -0,0 +1,388 @@
+"""
+sweepStore
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the SweepStore class which keeps every sweep of a
+run in one binary file instead of a png, txt, and csv per sweep, and
+the StoredRun class which reads it back for analysis.
+
+Two backends are supported:
+    hdf5    : one .h5 file with a chunked, appendable dataset per S parameter.
+              Needs h5py (pip install h5py), which comes with Anaconda.
+    raw     : a directory with a raw file per S parameter and per column
+              of it, and a meta.json, read back with np.memmap. Needs only NumPy.
+
+Layout of a run (hdf5 names, the raw backend names its files <sParam>.dat,
+<sParam>.trial.dat, ... and keeps the attributes in meta.json):
+    attributes      : format, start, stop, created, ...
+    frequency       : (stimulus x points) frequencies, a row is only added when the stimulus changes
+    <sParam>/data   : (trial x points) float64, or complex128 for two component formats
+    <sParam>/trial  : trial number of each row
+    <sParam>/timestamp : POSIX time each sweep was taken
+    <sParam>/freqIndex : row of frequency each sweep was taken with
+
+A store is never written over: creating one where a run already is
+fails (FileExistsError, or OSError from h5py), so every run needs its
+own name. See ttrvna.py for how a store is named and filled during a run.
+"""
+
+# IMPORTS ===================================================================
+import datetime
+import json
+import os
+import threading
+import numpy as np
+import sweep as sw
+
+try:
+    import h5py
+except ImportError:     # h5py is optional; without it only the raw backend is available
+    h5py = None
+
+
+# Columns stored next to the data of each S parameter, with their raw types
+COLUMNS = [('trial',np.int32), ('timestamp',np.float64), ('freqIndex',np.int32)]
+
+
+# SweepStore ================================================================
+
+class SweepStore(object):
+    """
+    Append-only store for the sweeps of one run. Every append is
+    written through to disk, so a crash loses at most the sweep being
+    appended.
+
+    Attributes:
+            filename    : str               : .h5 file (hdf5) or directory (raw) of the run
+            backend     : str               : 'hdf5' or 'raw'
+            format      : str               : format of the stored sweeps
+            _lastFreq   : np.ndarray        : last frequency row stored, to avoid storing it again
+            _freqRows   : int               : number of frequency rows stored
+            _meta       : dict              : contents of meta.json (raw), written when it changes, not per sweep
+            _lock       : Lock              : lets only one thread append at a time
+    """
+
+    def __init__(self,filename,format,backend=None,metadata=None,chunkRows=16):
+        """
+        Constructor that creates the store on disk. It fails if a run is
+        already stored at filename, rather than writing over it.
+
+        Parameters:
+                filename    : str           : where the run is stored, '.h5' is appended for hdf5 if missing
+                format      : str           : format of the sweeps that will be stored
+                backend     : str           : 'hdf5' or 'raw', hdf5 if h5py is installed when None
+                metadata    : dict          : extra attributes of the run (e.g. start, stop, sParam)
+                chunkRows   : int > 0       : sweeps per hdf5 chunk
+        """
+        if backend is None:
+            backend = 'hdf5' if h5py is not None else 'raw'
+        assert backend in ['hdf5','raw']
+        assert backend == 'raw' or h5py is not None, "h5py is needed for the hdf5 backend"
+        assert type(chunkRows) == int and chunkRows > 0
+
+        attributes = {'format':format, 'created':str(datetime.datetime.today())}
+        if metadata is not None:
+            attributes.update(metadata)
+
+        self.backend = backend
+        self.format = format
+        self._twoComponents = format in sw.TWO_COMPONENT_FORMATS
+        self._chunkRows = chunkRows
+        self._lastFreq = None
+        self._freqRows = 0
+        self._lock = threading.Lock()
+
+        if backend == 'hdf5':
+            if not filename.endswith('.h5'):
+                filename = filename + '.h5'
+            self._file = h5py.File(filename, 'w-')                      # fails if the file exists
+            for key in attributes:
+                self._file.attrs[key] = attributes[key]
+        else:
+            os.makedirs(filename, exist_ok=False)
+            self._meta = {'attributes':attributes, 'frequencyPoints':None, 'sParams':[]}
+        self.filename = filename
+        if backend == 'raw':
+            self._writeMeta()
+
+
+    def append(self,sweep):
+        """
+        Appends a sweep to the dataset of its S parameter.
+
+        Parameters:
+                sweep : Sweep : sweep to store, its format must match the store
+        """
+        assert sweep.format == self.format
+        assert sweep.freqDomain is not None
+        if self._twoComponents:
+            row = sweep.complex
+        else:
+            row = sweep.real
+
+        with self._lock:
+            freqIndex = self._storeFrequency(np.asarray(sweep.freqDomain, dtype=np.float64))
+            timestamp = sweep.timestamp.timestamp()
+            trial = sweep.trial if sweep.trial is not None else -1
+            if self.backend == 'hdf5':
+                self._appendHdf5(sweep.sParam, row, trial, timestamp, freqIndex)
+            else:
+                self._appendRaw(sweep.sParam, row, trial, timestamp, freqIndex)
+
+
+    def close(self):
+        """
+        Closes the store. Nothing can be appended afterwards.
+        """
+        with self._lock:
+            if self.backend == 'hdf5' and self._file:
+                self._file.close()
+            elif self.backend == 'raw':
+                self._writeMeta()
+
+
+    def _storeFrequency(self,freqDomain):
+        """
+        Stores the frequency row of a sweep unless it is the same as the
+        last one stored.
+
+        Return: index of the frequency row of the sweep
+        """
+        if self._lastFreq is not None and np.array_equal(freqDomain, self._lastFreq):
+            return self._freqRows - 1
+        if self.backend == 'hdf5':
+            frequency = self._growHdf5('frequency', (len(freqDomain),), np.float64)
+            frequency[-1, :len(freqDomain)] = freqDomain
+        else:
+            self._checkRawPoints(len(freqDomain))
+            with open(os.path.join(self.filename, 'frequency.dat'), 'ab') as f:
+                freqDomain.tofile(f)
+        self._lastFreq = freqDomain
+        self._freqRows += 1
+        return self._freqRows - 1
+
+
+    def _growHdf5(self,name,rowShape,dtype):
+        """
+        Adds a row to a chunked hdf5 dataset, creating the dataset first if
+        needed. Rows longer than the dataset widen it; missing values are NaN
+        (-1 for integers).
+
+        Return: the resized dataset
+        """
+        if name not in self._file:
+            if np.issubdtype(dtype, np.integer):
+                fill = -1
+            elif np.issubdtype(dtype, np.complexfloating):
+                fill = complex(np.nan, np.nan)
+            else:
+                fill = np.nan
+            return self._file.create_dataset(name, shape=(1,)+rowShape, maxshape=(None,)*(1+len(rowShape)),
+                                                dtype=dtype, chunks=(self._chunkRows,)+rowShape, fillvalue=fill)
+        dataset = self._file[name]
+        shape = list(dataset.shape)
+        shape[0] += 1
+        if rowShape and rowShape[0] > shape[1]:
+            shape[1] = rowShape[0]
+        dataset.resize(tuple(shape))
+        return dataset
+
+
+    def _appendHdf5(self,sParam,row,trial,timestamp,freqIndex):
+        """
+        Appends a row and its trial, timestamp, and frequency index to the
+        hdf5 group of sParam, then flushes the file.
+        """
+        dtype = np.complex128 if self._twoComponents else np.float64
+        data = self._growHdf5(sParam+'/data', (len(row),), dtype)
+        data[-1, :len(row)] = row
+        self._growHdf5(sParam+'/trial', (), np.int32)[-1] = trial
+        self._growHdf5(sParam+'/timestamp', (), np.float64)[-1] = timestamp
+        self._growHdf5(sParam+'/freqIndex', (), np.int32)[-1] = freqIndex
+        self._file.flush()
+
+
+    def _checkRawPoints(self,points):
+        """
+        The raw backend stores fixed width rows; every sweep of the run
+        must have the same number of points.
+        """
+        if self._meta['frequencyPoints'] is None:
+            self._meta['frequencyPoints'] = points
+            self._writeMeta()
+        assert self._meta['frequencyPoints'] == points, "the raw backend needs the same number of points for every sweep"
+
+
+    def _appendRaw(self,sParam,row,trial,timestamp,freqIndex):
+        """
+        Appends a row to the raw file of sParam and its trial, timestamp,
+        and frequency index to the column files of sParam. Each is a
+        single append, so a long run costs the same per sweep as a short one.
+        """
+        self._checkRawPoints(len(row))
+        if sParam not in self._meta['sParams']:
+            self._meta['sParams'].append(sParam)
+            self._writeMeta()
+        with open(os.path.join(self.filename, sParam+'.dat'), 'ab') as f:
+            np.ascontiguousarray(row).tofile(f)
+        for (name, dtype), value in zip(COLUMNS, (trial, timestamp, freqIndex)):
+            with open(os.path.join(self.filename, sParam+'.'+name+'.dat'), 'ab') as f:
+                np.array(value, dtype=dtype).tofile(f)
+
+
+    def _writeMeta(self):
+        """
+        Writes meta.json of the raw backend, replacing the old one in one step.
+        """
+        path = os.path.join(self.filename, 'meta.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self._meta, f)
+        os.replace(path + '.tmp', path)
+
+
+# StoredRun =================================================================
+
+class StoredRun(object):
+    """
+    Reads a run written by SweepStore. The data of the raw backend is
+    memory-mapped and hdf5 datasets are read lazily, so slicing a few
+    sweeps or frequencies out of a long run only reads that part from disk.
+
+    Attributes:
+            filename    : str   : .h5 file or raw directory of the run
+            backend     : str   : 'hdf5' or 'raw'
+            attributes  : dict  : metadata of the run
+            format      : str   : format of the stored sweeps
+            sParams     : list  : S parameters stored in the run
+    """
+
+    def __init__(self,filename):
+        """
+        Constructor that opens a stored run for reading.
+
+        Parameters:
+                filename : str : .h5 file or raw directory of the run
+        """
+        self.filename = filename
+        if os.path.isdir(filename):
+            self.backend = 'raw'
+            with open(os.path.join(filename, 'meta.json')) as f:
+                self._meta = json.load(f)
+            self.attributes = self._meta['attributes']
+            self.sParams = list(self._meta['sParams'])
+        else:
+            assert h5py is not None, "h5py is needed to read hdf5 runs"
+            self.backend = 'hdf5'
+            self._file = h5py.File(filename, 'r')
+            self.attributes = dict(self._file.attrs)
+            self.sParams = [name for name in self._file if name != 'frequency']
+        self.format = str(self.attributes['format'])
+        self._twoComponents = self.format in sw.TWO_COMPONENT_FORMATS
+
+
+    def data(self,sParam):
+        """
+        Gets the (trial x points) data of sParam without reading it into memory.
+
+        Return: np.memmap (raw) or h5py Dataset (hdf5)
+        """
+        if self.backend == 'hdf5':
+            return self._file[sParam+'/data']
+        dtype = np.complex128 if self._twoComponents else np.float64
+        return np.memmap(os.path.join(self.filename, sParam+'.dat'), dtype=dtype, mode='r',
+                            shape=(self._rawRows(sParam), self._meta['frequencyPoints']))
+
+
+    def frequency(self):
+        """
+        Gets the (stimulus x points) frequency rows without reading them into memory.
+
+        Return: np.memmap (raw) or h5py Dataset (hdf5)
+        """
+        if self.backend == 'hdf5':
+            return self._file['frequency']
+        return np.memmap(os.path.join(self.filename, 'frequency.dat'), dtype=np.float64, mode='r').reshape(
+                            -1, self._meta['frequencyPoints'])
+
+
+    def column(self,sParam,name):
+        """
+        Gets the trial, timestamp, or freqIndex of every sweep of sParam.
+
+        Return: np.ndarray
+        """
+        dtypes = dict(COLUMNS)
+        assert name in dtypes
+        if self.backend == 'hdf5':
+            return self._file[sParam+'/'+name][:]
+        values = np.fromfile(os.path.join(self.filename, sParam+'.'+name+'.dat'), dtype=dtypes[name])
+        return values[:self._rawRows(sParam)]
+
+
+    def sweeps(self,sParam):
+        """
+        Reads the sweeps of sParam back one at a time.
+
+        Return: generator of Sweep
+        """
+        data = self.data(sParam)
+        frequency = self.frequency()
+        trials = self.column(sParam,'trial')
+        timestamps = self.column(sParam,'timestamp')
+        freqIndex = self.column(sParam,'freqIndex')
+        for i in range(len(trials)):
+            row = np.asarray(data[i])
+            freqDomain = np.asarray(frequency[freqIndex[i]])
+            points = np.count_nonzero(~np.isnan(freqDomain))     # hdf5 rows are NaN padded to the widest sweep
+            if self._twoComponents:
+                values = np.ascontiguousarray(row[:points]).view(np.float64)
+            else:
+                values = np.column_stack((row[:points], np.zeros(points))).ravel()
+            sweep = sw.Sweep(values,self.format,sParam,int(trials[i]),freqDomain[:points])
+            sweep.timestamp = datetime.datetime.fromtimestamp(timestamps[i])
+            yield sweep
+
+
+    def export(self,directory,kind='csv'):
+        """
+        Writes every stored sweep as its own csv or txt file, named after
+        the run, S parameter, and trial, like the files that used to be
+        written during a run.
+
+        Parameters:
+                directory   : str : where the files are written (e.g. 'CSVs/')
+                kind        : str : 'csv' or 'txt'
+        """
+        assert kind in ['csv','txt']
+        run = os.path.splitext(os.path.basename(os.path.normpath(self.filename)))[0]
+        for sParam in self.sParams:
+            for sweep in self.sweeps(sParam):
+                filename = os.path.join(directory, '%s_%s_%d.%s' % (run, sParam, sweep.trial, kind))
+                if kind == 'csv':
+                    sweep.writeCsv(filename)
+                else:
+                    sweep.writeLog(filename)
+
+
+    def close(self):
+        """
+        Closes the stored run.
+        """
+        if self.backend == 'hdf5':
+            self._file.close()
+
+
+    def _rawRows(self,sParam):
+        """
+        Gets the number of sweeps of sParam in a raw run: the rows every
+        file of it has, so a sweep cut short by a crash is left out.
+
+        Return: int
+        """
+        rows = os.path.getsize(os.path.join(self.filename, sParam+'.dat'))
+        rows //= (16 if self._twoComponents else 8)*self._meta['frequencyPoints']
+        for name, dtype in COLUMNS:
+            size = os.path.getsize(os.path.join(self.filename, sParam+'.'+name+'.dat'))
+            rows = min(rows, size//np.dtype(dtype).itemsize)
+        return rows
@@ -0,0 +1,245 @@
+"""
+timeDomain
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the TimeDomain class which turns sweeps into their
+time domain (band pass impulse) response and gates it: the sweep is
+windowed, zero-padded to a length NumPy's FFT is fast at, and inverse
+transformed; a gate then keeps only the reflections between two times
+and the result is transformed back to a sweep.
+
+The windows, FFT lengths, and gate arrays only depend on the number of
+points (and the gate), so they are made once and kept, and transforming
+every sweep of a long run costs two FFTs and a few multiplications.
+
+Example:
+    timeDomain = TimeDomain(window='kaiser', beta=6)
+    times, response = timeDomain.transform(sweep)
+    gated = timeDomain.gate(sweep, 1e-9, 3e-9)
+
+The sweep must be a linear sweep taken in a format that carries the
+complex S parameter (see touchstone.py).
+"""
+
+# IMPORTS ===================================================================
+import numpy as np
+import sweep as sw
+import touchstone as ts
+
+
+# Windows that can be put on the sweep before it is transformed
+WINDOWS = ['kaiser','hann','hamming','blackman','rect']
+
+
+# FUNCTIONS =================================================================
+
+def fastLength(n):
+    """
+    Gets the smallest length >= n whose only prime factors are 2, 3, and
+    5, which NumPy's FFT handles much faster than lengths with large
+    prime factors.
+
+    Return: length as int
+
+    Parameters:
+            n : int > 0 : shortest length wanted
+    """
+    assert n > 0
+    best = 1
+    while best < n:
+        best *= 2
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            length = power35
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+# TimeDomain ================================================================
+
+class TimeDomain(object):
+    """
+    Time domain transform and gating of sweeps with cached windows.
+
+    Attributes:
+            window      : str           : window put on the sweep before it is transformed, see WINDOWS
+            beta        : float >= 0    : shape of the kaiser window, larger gives lower sidelobes and wider peaks
+            pad         : int > 0       : the sweep is zero-padded to at least pad times its points
+            edge        : float         : fraction of the gate on each side that tapers off
+            _windows    : dict          : window of each number of points
+            _lengths    : dict          : FFT length of each number of points
+            _gates      : dict          : (gate, normalization) of each (points, first bin, last bin)
+    """
+
+    def __init__(self,window='kaiser',beta=6,pad=4,edge=0.1):
+        """
+        Constructor that initializes attributes of TimeDomain instance.
+
+        Parameters:
+                window  : str           : 'kaiser', 'hann', 'hamming', 'blackman' or 'rect'
+                beta    : float >= 0    : shape of the kaiser window
+                pad     : int > 0       : zero-pad to at least pad times the points of the sweep
+                edge    : 0 <= float <= 0.5 : fraction of the gate on each side that tapers off
+        """
+        assert window in WINDOWS
+        assert beta >= 0
+        assert type(pad) == int and pad > 0
+        assert 0 <= edge <= 0.5
+        self.window = window
+        self.beta = beta
+        self.pad = pad
+        self.edge = edge
+        self._windows = {}
+        self._lengths = {}
+        self._gates = {}
+
+
+    def windowFor(self,points):
+        """
+        Gets the window of a sweep with points points, made the first time.
+
+        Return: window as read-only np.ndarray
+        """
+        window = self._windows.get(points)
+        if window is None:
+            if self.window == 'kaiser':
+                window = np.kaiser(points, self.beta)
+            elif self.window == 'rect':
+                window = np.ones(points)
+            else:
+                window = getattr(np, self.window)(points)
+            window.setflags(write=False)
+            self._windows[points] = window
+        return window
+
+
+    def fftLength(self,points):
+        """
+        Gets the zero-padded FFT length of a sweep with points points.
+
+        Return: length as int
+        """
+        length = self._lengths.get(points)
+        if length is None:
+            length = fastLength(self.pad*points)
+            self._lengths[points] = length
+        return length
+
+
+    def transform(self,sweep):
+        """
+        Gets the time domain response of a sweep. It is scaled so that a
+        sweep of constant 1 gives a peak of 1 at time 0.
+
+        Return: (times, response) as tuple of np.ndarray, times in seconds
+
+        Parameters:
+                sweep : Sweep : linear sweep in a complex format
+        """
+        values = ts.complexFromSweep(sweep)
+        window = self.windowFor(len(values))
+        length = self.fftLength(len(values))
+        response = np.fft.ifft(values*window, length)
+        response *= length/window.sum()
+        return self.times(sweep), response
+
+
+    def times(self,sweep):
+        """
+        Gets the time of each bin of the response of a sweep.
+
+        Return: times in seconds as np.ndarray
+        """
+        length = self.fftLength(sweep.points)
+        return np.arange(length)/(length*_frequencyStep(sweep.freqDomain))
+
+
+    def gate(self,sweep,start,stop):
+        """
+        Keeps only the part of the response of a sweep between start and
+        stop and transforms it back to a sweep. The result is divided by
+        what the window and gate do to a flat response, so the window
+        does not roll off the ends of the gated sweep.
+
+        Return: gated Sweep in the format of sweep
+
+        Parameters:
+                sweep   : Sweep : linear sweep in a complex format
+                start   : float : start of the gate in seconds
+                stop    : float : stop of the gate in seconds, > start
+        """
+        assert stop > start
+        values = ts.complexFromSweep(sweep)
+        points = len(values)
+        length = self.fftLength(points)
+        binTime = 1/(length*_frequencyStep(sweep.freqDomain))
+        first = int(np.floor(start/binTime))
+        last = int(np.ceil(stop/binTime))
+        assert 0 <= first and last < length, "gate outside of the %g s the response covers" % (length*binTime)
+
+        gate, normalization = self._gateFor(points,first,last)
+        response = np.fft.ifft(values*self.windowFor(points), length)
+        gated = np.fft.fft(response*gate)[:points]/normalization
+        first, second = ts.componentsFromComplex(gated,sweep.format)
+        interleaved = np.empty(2*points)
+        interleaved[0::2] = first
+        interleaved[1::2] = second
+        gatedSweep = sw.Sweep(interleaved,sweep.format,sweep.sParam,sweep.trial,sweep.freqDomain)
+        gatedSweep.timestamp = sweep.timestamp
+        return gatedSweep
+
+
+    def _gateFor(self,points,first,last):
+        """
+        Gets the gate over bins first to last and what the window and the
+        gate do to a flat response, made the first time they are needed.
+        The normalization is taken with the gate moved to time 0, where
+        the response of a flat sweep is, so it only depends on the gate
+        width and not on where the gate is.
+
+        Return: (gate, normalization) as tuple of np.ndarray
+        """
+        key = (points,first,last)
+        cached = self._gates.get(key)
+        if cached is None:
+            length = self.fftLength(points)
+            width = last - first + 1
+            taper = int(self.edge*width)
+            shape = np.ones(width)
+            if taper > 0:
+                ramp = np.hanning(2*taper + 2)[1:taper+1]                       # rises from above 0 to below 1
+                shape[:taper] = ramp
+                shape[-taper:] = ramp[::-1]
+            gate = np.zeros(length)
+            gate[first:last+1] = shape
+            centered = np.roll(gate, -((first + last)//2))
+            flat = np.fft.ifft(self.windowFor(points), length)
+            normalization = np.fft.fft(flat*centered)[:points]
+            gate.setflags(write=False)
+            normalization.setflags(write=False)
+            cached = (gate, normalization)
+            self._gates[key] = cached
+        return cached
+
+
+# HELPER FUNCTIONS ==========================================================
+
+def _frequencyStep(freqDomain):
+    """
+    Gets the spacing of a linear sweep.
+
+    Return: step in Hz as float
+    """
+    freqDomain = np.asarray(freqDomain, dtype=np.float64)
+    assert len(freqDomain) > 1
+    step = (freqDomain[-1] - freqDomain[0])/(len(freqDomain) - 1)
+    assert step > 0 and np.allclose(np.diff(freqDomain), step, rtol=1e-6, atol=0), \
+            "the time domain needs a linear sweep (equally spaced points)"
+    return step
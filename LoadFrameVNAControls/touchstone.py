@@ -0,0 +1,195 @@
+"""
+touchstone
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the functions that write sweeps as Touchstone
+(.s1p/.s2p) files, which RF tools such as scikit-rf, ADS, and
+VectorVU-PC can open, and the TouchstoneSeries class which writes one
+file per load step with an index csv next to them.
+
+Touchstone needs the complex S parameter, so the sweeps must be taken
+in scomplex or polar, whose two components are the real and imaginary
+parts. The other Smith chart and polar formats (slinear, slogarithmic,
+plinear, plogarithmic, smith, sadmittance) are refused: their names
+describe the marker readout, but on ENA-class analyzers the formatted
+data of every Smith chart and polar format is real and imaginary, and the
+layout the TTR506A sends for them has not been checked against the
+instrument, so they cannot be converted with confidence.
+
+See ttrvna.py and LoadFrameController.py for how it is used.
+"""
+
+# IMPORTS ===================================================================
+import csv
+import os
+import threading
+import numpy as np
+
+
+# Order of the S parameters on each line of a 2-port file (Touchstone 1.1)
+S2P_ORDER = ('S11','S21','S12','S22')
+
+# Formats complexFromSweep can turn into the complex S parameter (real and imaginary)
+COMPLEX_FORMATS = ['scomplex','polar']
+
+
+# FUNCTIONS =================================================================
+
+def complexFromSweep(sweep):
+    """
+    Converts the two components of a sweep into the complex S parameter.
+
+    Return: np.ndarray of complex128
+
+    Parameters:
+            sweep : Sweep : sweep taken in one of the formats listed at the top of this file
+    """
+    if sweep.format not in COMPLEX_FORMATS:
+        raise ValueError("format '%s' is not known to carry the complex S parameter, use one of %s"
+                            % (sweep.format, COMPLEX_FORMATS))
+    return sweep.complex                                                        # real + j*imag
+
+
+def componentsFromComplex(values,format):
+    """
+    Converts complex S parameters into the two components the VNA sends
+    in format, the inverse of complexFromSweep.
+
+    Return: (first, second) as tuple of np.ndarray
+
+    Parameters:
+            values  : np.ndarray of complex    : S parameter of each point
+            format  : str                       : one of the formats listed at the top of this file
+    """
+    if format not in COMPLEX_FORMATS:
+        raise ValueError("format '%s' is not known to carry the complex S parameter, use one of %s"
+                            % (format, COMPLEX_FORMATS))
+    return values.real, values.imag
+
+
+def _columns(values,form):
+    """
+    Splits complex values into the two columns of a Touchstone form.
+
+    Return: (first, second) as tuple of np.ndarray
+    """
+    if form == 'RI':
+        return values.real, values.imag
+    return np.abs(values), np.angle(values, deg=True)                           # MA
+
+
+def writeTouchstone(filename,sweeps,form='RI',reference=50,comments=None):
+    """
+    Writes one sweep as a Touchstone file. One S parameter makes a
+    .s1p file and all four make a .s2p file; the extension is added to
+    filename. The table is built with NumPy and written in one savetxt
+    call, so there is no Python loop over the points.
+
+    Return: name of the file written as str
+
+    Parameters:
+            filename    : str                   : file to write, without extension
+            sweeps      : Sweep or dict         : a Sweep, or a dict of Sweep keyed by S parameter as returned by makeSweepMulti
+            form        : str                   : 'RI' (real/imaginary) or 'MA' (linear magnitude/angle)
+            reference   : float > 0             : reference impedance in ohms
+            comments    : list of str           : extra lines written as ! comments in the header
+    """
+    assert form in ['RI','MA']
+    if not isinstance(sweeps, dict):
+        sweeps = {sweeps.sParam: sweeps}
+    if len(sweeps) == 1:
+        order = list(sweeps)
+        extension = '.s1p'
+    else:
+        assert sorted(sweeps) == sorted(S2P_ORDER), "a .s2p file needs S11, S21, S12 and S22"
+        order = S2P_ORDER
+        extension = '.s2p'
+
+    first = sweeps[order[0]]
+    columns = [np.asarray(first.freqDomain, dtype=np.float64)]
+    for param in order:
+        assert sweeps[param].points == first.points
+        columns.extend(_columns(complexFromSweep(sweeps[param]),form))
+    table = np.column_stack(columns)
+
+    header = ['Written by touchstone.py',
+                'Measured: %s' % ' '.join(order),
+                'Trial %s taken %s' % (first.trial, first.timestamp)]
+    if comments is not None:
+        header.extend(comments)
+    filename = filename + extension
+    with open(filename, 'w') as f:
+        f.write(''.join('! %s\n' % line for line in header))
+        f.write('# HZ S %s R %s\n' % (form, reference))
+        np.savetxt(f, table, fmt='%.12g', delimiter=' ')
+    return filename
+
+
+# TouchstoneSeries ==========================================================
+
+class TouchstoneSeries(object):
+    """
+    Writes one Touchstone file per load step into a directory and keeps
+    an index csv next to them with one row per file (step, file, trial,
+    timestamp, and any extra columns such as the force of the step), so
+    the files can be matched to the load cell data afterwards.
+
+    Attributes:
+            directory   : str           : where the files are written
+            prefix      : str           : start of every filename, usually the date of the run
+            form        : str           : 'RI' or 'MA'
+            reference   : float > 0     : reference impedance in ohms
+            columns     : list of str   : extra columns of the index
+            step        : int           : number of the next load step
+            _index      : str           : filename of the index csv
+            _lock       : Lock          : lets only one writer thread add a step at a time
+    """
+
+    def __init__(self,directory,prefix,form='RI',reference=50,columns=()):
+        """
+        Constructor that creates the index csv with its header row.
+
+        Parameters:
+                directory   : str           : where the files are written (e.g. 'Touchstone/')
+                prefix      : str           : start of every filename
+                form        : str           : 'RI' or 'MA'
+                reference   : float > 0     : reference impedance in ohms
+                columns     : list of str   : names of extra values passed to write (e.g. ['force'])
+        """
+        assert form in ['RI','MA']
+        self.directory = directory
+        self.prefix = prefix
+        self.form = form
+        self.reference = reference
+        self.columns = list(columns)
+        self.step = 1
+        self._lock = threading.Lock()
+        self._index = os.path.join(directory, prefix + '_index.csv')
+        with open(self._index, 'w', newline='') as csvfile:
+            csv.writer(csvfile).writerow(['step','file','trial','timestamp'] + self.columns)
+
+
+    def write(self,sweeps,**values):
+        """
+        Writes the sweeps of one load step and adds them to the index.
+
+        Return: name of the file written as str
+
+        Parameters:
+                sweeps  : Sweep or dict : sweep(s) of the step, see writeTouchstone
+                values  : float         : value of each extra column for this step (e.g. force=12.5)
+        """
+        assert sorted(values) == sorted(self.columns)
+        with self._lock:
+            step = self.step
+            self.step += 1
+        first = sweeps if not isinstance(sweeps, dict) else next(iter(sweeps.values()))
+        filename = os.path.join(self.directory, '%s_%04d' % (self.prefix, step))
+        filename = writeTouchstone(filename,sweeps,self.form,self.reference,
+                                    ['Load step %d' % step] + ['%s = %s' % (name, values[name]) for name in self.columns])
+        with self._lock:
+            with open(self._index, 'a', newline='') as csvfile:
+                csv.writer(csvfile).writerow([step, os.path.basename(filename), first.trial, first.timestamp]
+                                                + [values[name] for name in self.columns])
+        return filename
@@ -0,0 +1,208 @@
+"""
+tracking
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+This file contains the ResonanceTracker class which follows a resonance
+(peak or notch) as it moves with strain. One sweep over the full span
+finds the feature; every later sweep only covers a narrow span centered
+on where the feature was last fitted, so each trial takes a fraction of
+the time and data of a full sweep with a finer frequency resolution. If
+the feature gets close to the edge of the window, the span is widened
+and the sweep repeated until the feature is inside again.
+
+Example:
+    vna = Ttrvna(start='50 MHz', stop='6 GHz', delay='0s', sParam='S21', trials=1, points=2001)
+    tracker = ResonanceTracker(vna, kind='notch', span='20 MHz', points=201)
+    tracker.run(100)
+
+See ttrvna.py for the VNA itself.
+"""
+
+# IMPORTS ===================================================================
+import numpy as np
+import touchstone as ts
+
+
+# FUNCTIONS =================================================================
+
+def featureValues(sweep):
+    """
+    Gets the values of a sweep a feature is searched in: the measured
+    value of single component formats, and the linear magnitude of the
+    S parameter of the two component formats touchstone.complexFromSweep
+    can convert.
+
+    Return: np.ndarray
+
+    Parameters:
+            sweep : Sweep : sweep in a single component format or one of touchstone.COMPLEX_FORMATS
+    """
+    if sweep.isTwoComponents():
+        return np.abs(ts.complexFromSweep(sweep))
+    return sweep.real
+
+
+def findFeature(freqDomain,values,kind='notch'):
+    """
+    Finds the lowest (notch) or highest (peak) point of a sweep and fits
+    a parabola through it and its two neighbours, which places the
+    feature between the frequency points.
+
+    Return: (frequency, value, index) of the feature as tuple, index is the nearest point
+
+    Parameters:
+            freqDomain  : np.ndarray    : frequency of each point
+            values      : np.ndarray    : measured value of each point
+            kind        : str           : 'notch' or 'peak'
+    """
+    assert kind in ['notch','peak']
+    values = np.asarray(values, dtype=np.float64)
+    index = int(np.argmin(values) if kind == 'notch' else np.argmax(values))
+    if index == 0 or index == len(values) - 1:
+        return freqDomain[index], values[index], index                     # no neighbour on one side to fit with
+
+    before, at, after = values[index-1:index+2]
+    curvature = before - 2*at + after
+    if curvature == 0:
+        return freqDomain[index], at, index
+    offset = 0.5*(before - after)/curvature                                 # in points, between -0.5 and 0.5
+    step = (freqDomain[index+1] - freqDomain[index-1])/2
+    return freqDomain[index] + offset*step, at - 0.25*(before - after)*offset, index
+
+
+# ResonanceTracker ==========================================================
+
+class ResonanceTracker(object):
+    """
+    Follows a resonance with narrow span sweeps of a Ttrvna. The start and
+    stop of the Ttrvna when the tracker is made are the full span the
+    feature is searched in; the tracker changes them for every sweep and
+    restore() puts them back. Sweeps are taken with vna.makeSweep(), so
+    they are written and stored like any other sweep.
+
+    Attributes:
+            vna         : Ttrvna        : VNA the sweeps are taken with
+            kind        : str           : 'notch' or 'peak'
+            span        : float > 0     : span of the narrow sweeps in Hz
+            points      : int > 1       : points of the narrow sweeps, None to keep those of the full sweep
+            edge        : float         : fraction of the window on each side the feature must stay out of
+            widen       : float > 1     : factor the span grows by when the feature leaves the window
+            center      : float         : last fitted frequency of the feature in Hz, None before the first sweep
+            fits        : list of lists : [trial, frequency, value, span, sweeps taken] of each tracked trial
+            _fullStart  : str as SI unit: start of the full span
+            _fullStop   : str as SI unit: stop of the full span
+            _fullPoints : int > 1       : points of the full span sweep
+    """
+
+    def __init__(self,vna,kind='notch',span='20 MHz',points=None,edge=0.1,widen=4):
+        """
+        Constructor that initializes attributes of ResonanceTracker instance.
+
+        Parameters:
+                vna     : Ttrvna            : VNA set up with the full span and sweep settings
+                kind    : str               : 'notch' (minimum) or 'peak' (maximum)
+                span    : str as SI unit    : span of the narrow sweeps
+                points  : int > 1           : points of the narrow sweeps, None to keep those of the full sweep
+                edge    : 0 <= float < 0.5  : fraction of the window on each side the feature must stay out of
+                widen   : float > 1         : factor the span grows by when the feature leaves the window
+        """
+        assert kind in ['notch','peak']
+        assert 0 <= edge < 0.5
+        assert widen > 1
+        assert points is None or (type(points) == int and points > 1)
+        if vna.isTwoComponents() and vna.format not in ts.COMPLEX_FORMATS:
+            raise ValueError("cannot find a feature in format '%s', use one of %s or a single component format"
+                                % (vna.format, ts.COMPLEX_FORMATS))
+        self.vna = vna
+        self.kind = kind
+        self.span = vna.unitConverter(span)
+        self.points = points
+        self.edge = edge
+        self.widen = widen
+        self.center = None
+        self.fits = []
+        self._fullStart = vna.startFreqSweep
+        self._fullStop = vna.stopFreqSweep
+        self._fullPoints = vna.points
+        assert self.span < vna.unitConverter(self._fullStop) - vna.unitConverter(self._fullStart)
+
+
+    def track(self):
+        """
+        Takes the sweep(s) of one trial: the full span the first time,
+        otherwise the narrow span around the last fit, widened until the
+        feature is inside the window.
+
+        Return: (sweep, frequency, value) as tuple, the last Sweep taken and the fitted feature
+        """
+        fullStart = self.vna.unitConverter(self._fullStart)
+        fullStop = self.vna.unitConverter(self._fullStop)
+        span = self.span
+        center = self.center
+        sweeps = 0
+        while True:
+            if center is None or span >= fullStop - fullStart:
+                start, stop = fullStart, fullStop
+                self._setWindow(self._fullStart, self._fullStop, self._fullPoints)
+            else:
+                start = min(max(center - span/2, fullStart), fullStop - span)      # keep the window inside the full span
+                stop = start + span
+                self._setWindow('%.0f' % start, '%.0f' % stop, self.points)
+            sweep = self.vna.makeSweep()
+            sweeps += 1
+            values = featureValues(sweep)
+            frequency, value, index = findFeature(sweep.freqDomain,values,self.kind)
+            margin = int(self.edge*sweep.points)
+            leftOut = start > fullStart and index < margin                        # at the edge of the window but
+            rightOut = stop < fullStop and index > sweep.points - 1 - margin        # not at the edge of the full span
+            if not (leftOut or rightOut):
+                break
+            center = frequency
+            span *= self.widen
+        self.center = frequency
+        self.fits.append([sweep.trial, float(frequency), float(value), float(stop - start), sweeps])
+        return sweep, frequency, value
+
+
+    def run(self,trials):
+        """
+        Tracks the feature for a number of trials and then puts the full
+        span back on the VNA.
+
+        Return: fitted frequency of each trial as np.ndarray
+
+        Parameters:
+                trials : int > 0 : number of trials
+        """
+        assert type(trials) == int
+        assert trials > 0
+        try:
+            for _ in range(trials):
+                self.track()
+        finally:
+            self.restore()
+        return np.array([fit[1] for fit in self.fits[-trials:]])
+
+
+    def restore(self):
+        """
+        Puts the full span and points back on the VNA.
+        """
+        self._setWindow(self._fullStart, self._fullStop, self._fullPoints)
+
+
+    def reset(self):
+        """
+        Forgets the last fit, so the next trial searches the full span again.
+        """
+        self.center = None
+
+
+    def _setWindow(self,start,stop,points):
+        """
+        Sets the span and points of the next sweep.
+        """
+        self.vna.setStartSweep(start)
+        self.vna.setStopSweep(stop)
+        self.vna.setPoints(points)
@@ -16,13 +16,19 @@ the VNA in conjunction with a load frame.
 """
 
 # IMPORTS ===================================================================
-import visa
 import numpy as np
-import matplotlib.pyplot as plt
 import datetime
+import threading
 import time
-import csv
 import instrument as instr
+import sweep as sw
+import outputPipeline as op
+import sweepStore as ss
+import touchstone as ts
+import ringBuffer as rb
+import sweepStats as st
+import timeDomain as td
+import plotting
 
 
 # Ttrvna ===============================================================
@@ -33,11 +39,14 @@ class Ttrvna(instr.Instrument):
     TTR506A VNA where the user may set up an automated design of experiment.
 
     Attributes:
-        _rm                 : ResourceManager   : instance of visa's Resource Manager class
-        _instr              : Resource          : instrument, TTR506A VNA in this case
+        _rm                 : ResourceManager   : visa's Resource Manager, shared by every instrument (see instrument.py), None if simulated
+        _instr              : BatchedSession    : instrument, TTR506A VNA in this case, shared with every instance using the same resource
+        resource            : str               : VISA resource name of the VNA
         startFreqSweep      : str as SI unit    : determines start frequency for frequency sweep
         stopFreqSweep       : str as SI unit    : determines stop frequency for frequency sweep
         sweepDelay          : str as SI unit    : determines delay between each sweep
+        points              : int > 1           : number of frequency points of each sweep, None to leave the VNA setting
+        segments            : SegmentTable      : segments of a segmented sweep, None for a linear sweep from start to stop
         sParam              : str               : determines which S Parameter is measured
         trials              : int > 0           : determines the number of trials/sweeps
         format              : str               : determines format for the data to be outputted into
@@ -46,11 +55,33 @@ class Ttrvna(instr.Instrument):
         _trial              : int               : current trial number
         channels            : list of str       : list of channels
         parameters          : list of str       : list of parameters/traces
-        _magnitudes         : list of floats    : magnitudes gotten if range was complex
+        _magnitudes         : np.ndarray        : magnitudes gotten if range was complex
+        _sweep              : Sweep             : latest sweep, holds the interleaved data and its complex view
+        transfer            : str               : how trace data is sent by the VNA ('real64', 'real32' or 'ascii')
+        _stimulus           : tuple             : (settings fingerprint, frequencies) of the last stimulus read from the VNA
+        completion          : str               : how the end of a sweep is detected ('opc', 'esr' or 'srq')
+        completionTimeout   : float > 0         : seconds to wait for a sweep to complete
+        _timings            : list of lists     : [trial, seconds waited for the sweep to complete], measured
+        _nominalSleeps      : float             : seconds the fixed sleeps used before would have taken, not measured
+        _output             : OutputPipeline    : writes png, txt, and csv in the background, None to write them inline
+        plotMode            : str               : how pngs are rendered ('new', 'reuse', 'deferred' or 'none')
+        _plot               : ReusablePlot      : figure shared by every sweep if plotMode is 'reuse'
+        _deferredPlots      : list of tuples    : (freqDomain, values, filename) of pngs waiting to be rendered if plotMode is 'deferred'
+        storeBackend        : str               : backend of the run store ('hdf5' or 'raw'), None to not keep one
+        _store              : SweepStore        : store every sweep of the run is appended to, opened by the first sweep
+        outputs             : tuple of str      : per sweep files that are written ('png', 'txt', 'csv' and/or 'snp')
+        touchstoneForm      : str               : form of the Touchstone files ('RI' or 'MA')
+        _ring               : RingBuffer        : sweeps read in continuous mode, waiting for a consumer
+        _reader             : Thread            : reads sweeps in continuous mode, None when not running
+        averaging           : dict              : sweeps averaged into each trial by run() and when to stop early, see setAveraging
+        accumulator         : SweepAccumulator  : statistics of the sweeps of the last averaged trial
+        timeDomain          : TimeDomain        : time domain transform and gating, keeps its windows between sweeps
     """
 
 
-    def __init__(self,start=None,stop=None,delay=None,sParam=None,trials=None,format='mlogarithmic'):
+    def __init__(self,start=None,stop=None,delay=None,sParam=None,trials=None,format='mlogarithmic',transfer='real64',
+                            completion='opc',timeout='60s',writers=0,queueSize=8,plotMode='new',
+                            store=None,outputs=('png','txt','csv'),touchstoneForm='RI',resource='GPIB8::1::INSTR',points=None):
         """
         Constructor that initializes attributes of Ttrvna instance.
         By default the data format is 'mlogarithmic'.
@@ -62,9 +93,22 @@ class Ttrvna(instr.Instrument):
                 sParam      : str               : determines which S Parameter is measured
                 trials      : int > 0           : determines the number of trials/sweeps
                 format      : str               : determines format for the data to be outputted into
+                transfer    : str               : 'real64' or 'real32' for binary block transfer, 'ascii' as a fallback
+                completion  : str               : 'opc', 'esr' or 'srq', see setCompletion
+                timeout     : str as SI unit    : longest time to wait for a sweep to complete
+                writers     : int >= 0          : threads writing png/txt/csv in the background, 0 (default) to write them inline
+                                                      so a disk error fails the sweep that caused it
+                queueSize   : int > 0           : number of outputs that may wait for a writer before makeSweep blocks
+                plotMode    : str               : 'new', 'reuse', 'deferred' or 'none', see setPlotMode
+                store       : str               : 'hdf5' or 'raw' to keep every sweep in one run file, see setStore
+                outputs     : tuple of str      : per sweep files to write, see setOutputs
+                touchstoneForm : str            : 'RI' or 'MA', see setTouchstoneForm
+                resource    : str               : VISA resource name of the VNA
+                points      : int > 1           : number of frequency points of each sweep, None to leave the VNA setting
         """
-        self._rm = visa.ResourceManager()
-        self._instr = self._rm.open_resource('GPIB8::1::INSTR')
+        self._rm = None if instr.isSimulated(resource) else instr.getResourceManager()
+        self._instr = instr.openSession(resource)     # same session as any other instance on this resource
+        self.resource = resource
 
         if start is not None:
             self.setStartSweep(start)
@@ -77,10 +121,29 @@ class Ttrvna(instr.Instrument):
         if trials is not None:
             self.setTrials(trials)
         self.setFormat(format)
+        self.setTransfer(transfer)
+        self.setCompletion(completion)
+        self.setCompletionTimeout(timeout)
+        self.setPoints(points)
+        self.setSegments(None)
         
         self._measuredRange = None
         self._freqDomain = None
+        self._sweep = None
         self._trial = 1
+        self._stimulus = None
+        self._timings = []
+        self._nominalSleeps = 0.0
+        self._ring = None
+        self._reader = None
+        self.setWriters(writers,queueSize)
+        self.setPlotMode(plotMode)
+        self.setStore(store)
+        self.setOutputs(outputs)
+        self.setTouchstoneForm(touchstoneForm)
+        self.setAveraging(1)
+        self.accumulator = st.SweepAccumulator()
+        self.timeDomain = td.TimeDomain()
     
 
     def setStartSweep(self,start):
@@ -110,6 +173,27 @@ class Ttrvna(instr.Instrument):
         self.sweepDelay = delay
     
 
+    def setPoints(self,points):
+        """
+        Setter for the number of frequency points of each sweep.
+        None leaves the number set on the VNA.
+        Example: points = 201
+        """
+        assert points is None or (type(points) == int and points > 1)
+        self.points = points
+
+
+    def setSegments(self,segments):
+        """
+        Setter for a segmented sweep. With a SegmentTable (see segments.py)
+        the VNA sweeps its segments instead of start to stop, and the points
+        setting is not used. None goes back to a linear sweep.
+        Example: segments = planSegments(sweep.freqDomain, sweep.real, budget=401)
+        """
+        assert segments is None or hasattr(segments, 'command')
+        self.segments = segments
+
+
     def setsParam(self,param):
         """
         Setter for the S parameter you would like to measure
@@ -151,28 +235,200 @@ class Ttrvna(instr.Instrument):
         self.format = format
 
 
+    def setTransfer(self,transfer):
+        """
+        Setter for how the VNA sends trace data back to the computer:
+
+        Transfer must be one of the following as a string:
+        real64  : IEEE-488.2 definite-length block of 64-bit floats
+        real32  : IEEE-488.2 definite-length block of 32-bit floats
+        ascii   : comma separated text, slowest but works with any set up
+
+        Example: transfer = 'real64'
+        """
+        assert type(transfer) == str
+        assert transfer in ['real64','real32','ascii']
+        self.transfer = transfer
+
+
+    def setCompletion(self,completion):
+        """
+        Setter for how the computer finds out that a sweep is complete:
+
+        Completion must be one of the following as a string:
+        opc     : blocks on *opc? which the VNA answers as soon as the sweep is done
+        esr     : sends *opc and polls the Standard Event Status Register with *esr?
+        srq     : sends *opc and waits for the VNA to assert a service request (SRQ)
+
+        Example: completion = 'opc'
+        """
+        assert type(completion) == str
+        assert completion in ['opc','esr','srq']
+        self.completion = completion
+
+
+    def setCompletionTimeout(self,timeout):
+        """
+        Setter for the longest time to wait for a sweep to complete.
+        Example: timeout = '60s'
+        """
+        self.isSIUnit(timeout)
+        assert self.unitConverter(timeout) > 0
+        self.completionTimeout = self.unitConverter(timeout)
+
+
+    def setWriters(self,writers,queueSize=8):
+        """
+        Setter for the background writers of the plots, logs, and CSVs.
+        With writers > 0, makeSweep hands each sweep to a bounded queue and
+        returns while worker threads write the files. makeSweep only waits
+        when queueSize outputs are already waiting; an error writing a file
+        is only raised by the next flushOutput (or printed at exit). With writers 0
+        the files are written by makeSweep itself. The writers set before
+        finish what they were given and are stopped.
+
+        Example: writers = 1
+        """
+        assert type(writers) == int
+        assert writers >= 0
+        if getattr(self, '_output', None) is not None:
+            self._output.close()
+        if writers == 0:
+            self._output = None
+        else:
+            self._output = op.OutputPipeline(writers,queueSize)
+
+
+    def setPlotMode(self,plotMode):
+        """
+        Setter for how the png of each sweep is rendered:
+
+        PlotMode must be one of the following as a string:
+        new         : a new figure is built and saved for every sweep
+        reuse       : one figure is built once, only its line data is updated for every sweep
+        deferred    : no png while sweeping; all of them are rendered by renderDeferredPlots()
+                      in a pool of processes, which run() does at the end
+        none        : no pngs
+
+        Example: plotMode = 'reuse'
+        """
+        assert type(plotMode) == str
+        assert plotMode in ['new','reuse','deferred','none']
+        self.plotMode = plotMode
+        self._plot = plotting.ReusablePlot() if plotMode == 'reuse' else None
+        self._deferredPlots = []
+
+
+    def setStore(self,store):
+        """
+        Setter for the run store. With a backend set, every sweep is also
+        appended to one file in Runs/ named after the time of the first
+        sweep, see sweepStore.py. The per sweep files can then be turned
+        off with setOutputs and exported from the store afterwards.
+
+        Store must be None, 'hdf5' (needs h5py) or 'raw' (NumPy only).
+
+        Example: store = 'hdf5'
+        """
+        assert store in [None,'hdf5','raw']
+        assert store != 'hdf5' or ss.h5py is not None, "h5py is needed for the hdf5 store"
+        self.closeStore()
+        self.storeBackend = store
+
+
+    def setOutputs(self,outputs):
+        """
+        Setter for the files written for every sweep: any of 'png',
+        'txt', 'csv', and 'snp'. An empty tuple writes no per sweep files,
+        which makes sense when a store is kept.
+
+        'snp' writes a Touchstone .s1p file to Touchstone/, which needs
+        a format that carries the complex S parameter (see touchstone.py).
+
+        Example: outputs = ('png','snp')
+        """
+        for output in outputs:
+            assert output in ['png','txt','csv','snp']
+        self.outputs = tuple(outputs)
+
+
+    def setTouchstoneForm(self,form):
+        """
+        Setter for how the Touchstone files store each S parameter:
+        RI  : real and imaginary part
+        MA  : linear magnitude and angle in degrees
+
+        Example: form = 'MA'
+        """
+        assert form in ['RI','MA']
+        self.touchstoneForm = form
+
+
+    def setAveraging(self,sweeps,tolerance=None,z=1.96,relative=False,minSweeps=3):
+        """
+        Setter for averaging in run(). With sweeps > 1 every trial is the
+        mean of up to sweeps sweeps (see makeSweepAveraged), and with a
+        tolerance the trial ends as soon as the confidence interval of
+        every point is within it (see SweepAccumulator.converged).
+
+        Example: sweeps = 50, tolerance = 0.05 (dB in mlogarithmic)
+        """
+        assert type(sweeps) == int
+        assert sweeps > 0
+        assert tolerance is None or tolerance > 0
+        self.averaging = {'sweeps':sweeps, 'tolerance':tolerance, 'z':z,
+                            'relative':relative, 'minSweeps':minSweeps}
+
+
+    def closeStore(self):
+        """
+        Closes the run store, if one is open. The next sweep opens a new one.
+        """
+        if getattr(self, '_store', None) is not None:
+            self._store.close()
+        self._store = None
+
+
+    def renderDeferredPlots(self,processes=None):
+        """
+        Renders the pngs of every sweep taken in 'deferred' plot mode
+        since the last call, using one process per core by default.
+
+        Parameters:
+                processes : int > 0 : number of processes rendering pngs
+        """
+        self.flushOutput()
+        jobs = self._deferredPlots
+        self._deferredPlots = []
+        plotting.renderDeferred(jobs,processes)
+
+
+    def flushOutput(self):
+        """
+        Waits until every plot, log, and CSV of the sweeps taken so far has
+        been written.
+        """
+        if self._output is not None:
+            self._output.flush()
+
+
     def setMeasuredRange(self):
         """
         Takes a measurement according to inputted parameter after
-        initializing data acquisition. After the data is appropriately
-        modified into a list, it is set as the value for the 
+        initializing data acquisition. The sweep is kept in _sweep and
+        the data appropriately picked out of it is set as the value for the 
         _measuredRange attribute.
         """
 
         self._initDataAcquisition()
 
-        self._instr.write('calculate1:parameter1:define {}'.format(self.sParam))
-        time.sleep(1)       # delay sometimes needed to ensure commands are used in sequence
-        self._instr.write('calculate1:selected:format %s' % self.format)
-
-        measurement = self._instr.query('calculate1:selected:data:fdata?')
+        self._sweep = sw.Sweep(self._readTrace(),self.format,self.sParam,self._trial)
 
-        if self.isTwoComponents():                                         # If two components, create list of containing both components
-            self._measuredRange = self._listify(measurement)
+        if self.isTwoComponents():                                         # If two components, keep the interleaved buffer
+            self._measuredRange = self._sweep.values
             self._getMagnitudes()
-        else:                                                               # Otherwise, get rid of zero components that the TTR VNA
-            measurement = self._listify(measurement)                        # uses to fill the second/imaginary component of
-            self._measuredRange = self._removeSecondComponent(measurement)  # the measurement
+        else:                                                               # Otherwise, only keep the first component since the TTR VNA
+            self._measuredRange = self._sweep.real                          # fills the second/imaginary component with zeros
 
 
     def setFreqDomain(self):
@@ -181,13 +437,9 @@ class Ttrvna(instr.Instrument):
         and stop of the frequency sweep. Uses this as the value
         for self._freqDomain
         """
-        start = self.unitConverter(self.startFreqSweep)
-        stop = self.unitConverter(self.stopFreqSweep)
-        if self.isTwoComponents():                                                     # If two components, set the domain for half the range
-            freqDomain = np.linspace(start,stop, num=((len(self._measuredRange))/2))    # because of 1:2 Domain:Range correspondence
-        else:
-            freqDomain = np.linspace(start,stop, num=len(self._measuredRange))          # Otherwise, set domain to be same length as
-        self._freqDomain = freqDomain                                                   # the _measuredRange
+        freqDomain = self._getFreqDomain(self._sweep.points)
+        self._sweep.freqDomain = freqDomain
+        self._freqDomain = freqDomain
 
 
     def makeSweep(self):
@@ -197,19 +449,54 @@ class Ttrvna(instr.Instrument):
         between each sweep. Logs data in three ways, text file, plot as 
         png, and csv.
 
-        The Conditionals with the trials is used because it usually takes
-        the VNA a trial to adjust to it the commanded settings.
-        So the first trial is not recorded until I find a better way to do this.
+        The measured parameter and format are configured before the sweep is
+        started, so every trial, including the first, is recorded.
+
+        Return: the Sweep that was taken
+        """
+
+        with self._instr.lock:          # no other instance may use the VNA between configuring and reading
+            self._configInst()
+            self.setMeasuredRange()
+            self.setFreqDomain()
+        self._writeSweep(self._sweep)
+        self._trial += 1
+        return self._sweep
+
+
+    def makeSweepAveraged(self,sweeps,tolerance=None,z=1.96,relative=False,minSweeps=3):
         """
+        Takes up to sweeps sweeps and writes and stores only their mean,
+        as one trial. The sweeps are added to self.accumulator as they
+        are read, so only the running statistics are kept, and with a
+        tolerance it stops as soon as the confidence interval of every
+        point is within it. Complex formats are averaged as complex values.
 
-        self._configInst()
-        self.setMeasuredRange()
-        self.setFreqDomain()
-        if self._trial > 1:          # Ensures that the first trial is not recorded
-            self._createPlot()   # png
-            self._logger()       # txt
-            self._csvWriter()    # csv
+        Return: the mean as a Sweep, the statistics are in self.accumulator
+
+        Parameters:
+                sweeps      : int > 0   : most sweeps to average
+                tolerance   : float > 0 : half width of the confidence interval to stop at, None to always take sweeps
+                z           : float > 0 : standard errors in the half width (1.96 for 95 %)
+                relative    : bool      : if True, tolerance is a fraction of the magnitude of the mean
+                minSweeps   : int > 1   : fewest sweeps before stopping early
+        """
+        assert type(sweeps) == int
+        assert sweeps > 0
+        self.accumulator.reset()
+        for _ in range(sweeps):
+            with self._instr.lock:
+                self._configInst()
+                self.setMeasuredRange()
+                self.setFreqDomain()
+            self.accumulator.add(self._sweep)
+            if tolerance is not None and self.accumulator.converged(tolerance,z,relative,minSweeps):
+                break
+        mean = self.accumulator.sweep(self._trial)
+        self._sweep = mean
+        self._writeSweep(mean)
         self._trial += 1
+        return mean
 
     
     def makeSweepUnprocessed(self):
@@ -217,16 +504,148 @@ class Ttrvna(instr.Instrument):
         Same as makeSweep, but it does not process the data. It merely returns the data
         as a list.
         """
-        self._configInst()
-        self.setMeasuredRange()
-        self.setFreqDomain()
+        with self._instr.lock:
+            self._configInst()
+            self.setMeasuredRange()
+            self.setFreqDomain()
         if self.isTwoComponents():
-            self._getMagnitudes()
-            self._measuredRange = self._magnitudes
+            self._measuredRange = self._magnitudes                          # computed once by setMeasuredRange
         self._trial += 1
         return [self._freqDomain,self._measuredRange]
 
 
+    def makeSweepMulti(self,sParams=('S11','S21','S12','S22')):
+        """
+        Measures up to four S parameters with a single sweep. Each parameter
+        gets its own trace on channel 1, the channel is swept once, and then
+        every trace is read back. All traces use the format set for this instance.
+        Each sweep is stored and written like the sweeps of makeSweep (see
+        setOutputs), with its S parameter in the filenames, and the sweep
+        of the first parameter becomes the current sweep.
+
+        Return: dict of Sweep keyed by S parameter (e.g. result['S21'].magnitude)
+
+        Parameters:
+                sParams : list/tuple of str : S parameters to measure, at most 4 and no repeats
+        """
+        assert 1 <= len(sParams) <= 4
+        assert len(set(sParams)) == len(sParams)
+        for param in sParams:
+            assert param in ['S11','S12','S21','S22']
+
+        freqDomain = None
+        sweeps = {}
+        with self._instr.lock:
+            self._configInst(sParams)
+            self._initDataAcquisition()
+            for trace, param in enumerate(sParams, 1):       # read every trace of the one sweep
+                self.selectTrace(trace)
+                sweep = sw.Sweep(self._readTrace(),self.format,param,self._trial)
+                if freqDomain is None:
+                    freqDomain = self._getFreqDomain(sweep.points)
+                sweep.freqDomain = freqDomain
+                sweeps[param] = sweep
+        for param in sParams:
+            self._writeSweep(sweeps[param])
+        self._sweep = sweeps[sParams[0]]
+        self._freqDomain = freqDomain
+        self._trial += 1
+        return sweeps
+
+
+    def startContinuous(self,capacity=64,callback=None):
+        """
+        Starts continuous acquisition: a reader thread makes the VNA sweep
+        back to back, triggering each sweep as soon as the last one was
+        read and waiting for it to complete (see setCompletion), and copies
+        every sweep into a ring buffer of capacity sweeps. Take the sweeps
+        out with continuousSweeps(), or pass a callback that is called with
+        every Sweep from the reader thread. Nothing is written to disk
+        unless the consumer does it.
+
+        The VNA is not put in continuous trigger: a read can then land in
+        the middle of a sweep and return the start of the new sweep with
+        the end of the old one. Reading only completed single sweeps means
+        every sweep in the buffer is whole and none is read twice.
+
+        If the consumer falls behind, the oldest sweeps in the buffer are
+        overwritten and counted as dropped; see continuousCounters().
+
+        Parameters:
+                capacity    : int > 0   : number of sweeps the ring buffer holds
+                callback    : function  : called with each Sweep as it is read, None for none
+        """
+        assert self._reader is None, "continuous acquisition is already running"
+        with self._instr.lock:
+            self._configInst()                                                  # single sweeps, each one triggered
+            values = self._readTrace()
+            self._continuousFreq = self._getFreqDomain(len(values)//2)
+        self._ring = rb.RingBuffer(capacity,values.shape)
+        self._continuousTrial = self._trial
+        self._readerError = None
+        self._stopReader = threading.Event()
+        self._reader = threading.Thread(target=self._readContinuous,args=(callback,))
+        self._reader.daemon = True
+        self._reader.start()
+
+
+    def stopContinuous(self):
+        """
+        Stops continuous acquisition after the sweep being read.
+        Sweeps still in the ring buffer can be taken out with
+        continuousSweeps() afterwards. If the reader thread failed, its
+        exception is raised here.
+
+        Return: counters as dict, see continuousCounters
+        """
+        assert self._reader is not None, "continuous acquisition is not running"
+        self._stopReader.set()
+        self._reader.join()
+        self._reader = None
+        self._trial += self._ring.written
+        if self._readerError is not None:
+            raise self._readerError
+        return self.continuousCounters()
+
+
+    def continuousSweeps(self,timeout=None):
+        """
+        Iterates over the sweeps read in continuous mode, oldest first,
+        waiting for the next one while acquisition is running. Ends
+        when acquisition was stopped and the buffer is empty, or when no
+        sweep came within timeout.
+
+        Example:
+            vna.startContinuous()
+            for sweep in vna.continuousSweeps(timeout=5):
+                ...
+
+        Return: generator of Sweep
+
+        Parameters:
+                timeout : float > 0 : longest wait for a sweep in seconds, forever if None
+        """
+        assert self._ring is not None, "call startContinuous first"
+        while True:
+            item = self._ring.pop(timeout)
+            if item is None:
+                if self._readerError is not None:
+                    raise self._readerError
+                return
+            yield self._continuousSweep(*item)
+
+
+    def continuousCounters(self):
+        """
+        Gets the counters of the last continuous acquisition:
+        sweeps      : sweeps read into the ring buffer
+        dropped     : sweeps overwritten in the buffer before the consumer took them
+
+        Return: counters as dict
+        """
+        return {'sweeps':self._ring.written, 'dropped':self._ring.dropped}
+
+
     def run(self):
         """
         Function that you should call to run an experiment after the
@@ -234,9 +653,37 @@ class Ttrvna(instr.Instrument):
         Makes a sweep for each trial.
         """
         for _ in range(self.trials):
-            self.makeSweep()
-            time.sleep(self.unitConverter(self.sweepDelay))
+            if self.averaging['sweeps'] > 1:
+                self.makeSweepAveraged(**self.averaging)
+            else:
+                self.makeSweep()                                            # the delay between sweeps is done by the VNA
+            self._nominalSleeps += self.unitConverter(self.sweepDelay)     # (sense1:sweep:delay), no need to sleep here too
+        self.flushOutput()
+        self.renderDeferredPlots()
+        self.closeStore()
         print("Done!")
+
+
+    def timingReport(self):
+        """
+        Prints how long the computer waited for each sweep to complete
+        (measured), then, apart from it, how long the fixed sleeps that
+        were used before would have taken (1 s after defining the parameter
+        of each sweep and the sweep delay again after each sweep in run()).
+        That sum is nominal, not measured; benchmarks.benchCompletion
+        measures both ways against the simulated VNA. Last come the
+        commands and bus trips of each kind of operation.
+
+        Return: (seconds waited, nominal seconds of the old sleeps) as tuple
+        """
+        print('trial\twaited (s)')
+        for trial, waited in self._timings:
+            print('%d\t%.3f' % (trial, waited))
+        totalWaited = sum(timing[1] for timing in self._timings)
+        print('Total waited: %.3f s over %d sweeps (measured)' % (totalWaited, len(self._timings)))
+        print('Fixed sleeps no longer needed: %.3f s (nominal, not measured)' % self._nominalSleeps)
+        self._instr.report()
+        return totalWaited, self._nominalSleeps
     
      
 
@@ -244,128 +691,430 @@ class Ttrvna(instr.Instrument):
 
     def _initDataAcquisition(self):
         """
-        Initializes data acquizition for the instrument.
+        Initializes data acquizition for the instrument and returns as
+        soon as the VNA reports the sweep is complete.
+        """
+        start = time.perf_counter()
+        with self._instr.operation('acquire'):
+            self._triggerSweep()
+        self._timings.append([self._trial, time.perf_counter() - start])
+        self._nominalSleeps += 1.0                                          # 1 s sleep before the format was set
+
+
+    def _triggerSweep(self):
+        """
+        Starts a single sweep and returns once the VNA reports it is
+        complete, the way completion says.
+        """
+        if self.completion == 'opc':
+            self._instr.write('initiate:immediate')
+            self._queryOpc()
+        else:
+            self._instr.write('*cls')                   # clear old events so only this sweep sets the OPC bit
+            self._instr.write('initiate:immediate')
+            self._instr.write('*opc')                   # sets OPC bit of the event status register when the sweep is done
+            if self.completion == 'esr':
+                self._pollEsr()
+            else:
+                self._waitForSrq()
+
+
+    def _queryOpc(self):
+        """
+        Blocks on *opc? which the VNA only answers once all pending
+        operations are complete. The VISA timeout is raised to 
+        completionTimeout while waiting.
+        """
+        timeout = self._instr.timeout
+        self._instr.timeout = self.completionTimeout*1000     # VISA timeout is in ms
+        try:
+            self._instr.query('*opc?')
+        finally:
+            self._instr.timeout = timeout
+
+
+    def _pollEsr(self,interval=0.005):
+        """
+        Polls the Standard Event Status Register until the operation
+        complete bit (bit 0) is set. Reading *esr? also clears it.
+
+        Parameters:
+                interval : float > 0 : seconds between polls
+        """
+        deadline = time.perf_counter() + self.completionTimeout
+        while not int(self._instr.query('*esr?')) & 1:
+            if time.perf_counter() > deadline:
+                raise TimeoutError('sweep did not complete within %s s' % self.completionTimeout)
+            time.sleep(interval)
+
+
+    def _waitForSrq(self):
+        """
+        Waits for the VNA to request service. The event status bit of
+        the status byte is enabled for SRQ and the operation complete bit
+        for the event status bit, so the SRQ is asserted when the sweep is done.
+        """
+        self._applySetting('*ese','*ese 1')      # operation complete -> event status bit (ESB)
+        self._applySetting('*sre','*sre 32')     # ESB -> service request
+        self._instr.wait_for_srq(self.completionTimeout*1000)
+        self._instr.query('*esr?')               # clears the event status register and with it the SRQ
+
+
+    def _getFreqDomain(self,points):
+        """
+        Gets the frequency of each point of a sweep as reported by the VNA,
+        so log and segmented sweeps get their real stimulus. The array is
+        only queried again when a setting of the sweep changed since it was
+        last read, and is shared (read-only) by every sweep taken with
+        the same settings.
+
+        Return: frequencies as np.ndarray
+
+        Parameters:
+                points : int > 0 : number of points in the sweep
+        """
+        fingerprint = self._stimulusFingerprint()
+        if self._stimulus is None or self._stimulus[0] != fingerprint:
+            freqDomain = self._queryValues('sense1:frequency:data?',precise=True)
+            freqDomain.setflags(write=False)                                # shared by sweeps, so no sweep may change it
+            self._stimulus = (fingerprint, freqDomain)
+        freqDomain = self._stimulus[1]
+        assert len(freqDomain) == points, "VNA reported %d frequencies for %d points" % (len(freqDomain), points)
+        return freqDomain
+
+
+    def _stimulusFingerprint(self):
+        """
+        Gets the channel 1 settings the stimulus depends on, as last sent
+        to the VNA (see _applySetting). The sweep delay does not change the
+        frequencies, so it is left out.
+
+        Return: settings as a sorted tuple of (setting, command) pairs
+        """
+        return tuple(sorted((setting, command) for setting, command in self._instr.state.items()
+                                if setting.startswith('sense1:') and setting != 'sense1:sweep:delay'))
+
+
+    def _readTrace(self):
+        """
+        Reads the formatted data of the active trace.
+
+        Return: measured values as np.ndarray
         """
-        self._instr.write('initiate:immediate')
-        self._instr.query('*opc?')
+        return self._queryValues('calculate1:selected:data:fdata?')
 
 
-    def _configInst(self):
+    def _queryValues(self,query,precise=False):
+        """
+        Sends a query that the VNA answers with an array of numbers and reads
+        the answer. In the binary modes the VNA answers with an IEEE-488.2
+        definite-length block (#<n><length><bytes>) that is decoded straight
+        into a NumPy array, so no text is formatted on the instrument or
+        parsed on the computer. In ascii mode the raw bytes are handed to
+        _parseFdata without being decoded.
+
+        Return: values as np.ndarray of float64
+
+        Parameters:
+                query   : str   : SCPI query (e.g. 'sense1:frequency:data?')
+                precise : bool  : True to read real64 even if transfer is 'real32' (frequencies need more than 7 digits)
+        """
+        with self._instr.operation('transfer'):
+            if self.transfer == 'ascii':
+                self._applySetting('format:data','format:data ascii')
+                self._instr.write(query)
+                return self._parseFdata(self._instr.read_raw())
+
+            self._applySetting('format:border','format:border swapped')     # little-endian, native byte order of the PC
+            if self.transfer == 'real64' or precise:
+                self._applySetting('format:data','format:data real')
+                datatype = 'd'
+            else:
+                self._applySetting('format:data','format:data real32')
+                datatype = 'f'
+            values = self._instr.query_binary_values(query, datatype=datatype,
+                                                        is_big_endian=False, container=np.array)
+            return values.astype(np.float64, copy=False)
+
+
+    def _configInst(self,sParams=None):
         """
         Configures the instrument to the constants specified
-        by the user.
+        by the user. Only the settings that changed since they were
+        last sent are written to the instrument, so calling this before
+        every sweep costs nothing once the instrument is set up. The
+        instrument is not reset; call resetInst() for that.
+
+        Parameters:
+                sParams : list of str : S parameter of each trace, [sParam] if None
         """
-        assert self.startFreqSweep < self.stopFreqSweep
+        assert self.unitConverter(self.startFreqSweep) < self.unitConverter(self.stopFreqSweep)
+
+        with self._instr.operation('configure'):           # settings are sent together with the next query
+            self._configSession()
+            self._applySetting('display:enable','display:enable 1')
+            self._applySetting('initiate1:continuous','initiate1:continuous off')     # sweep only when initiated
+            self._applySetting('sense1:frequency:start','sense1:frequency:start {}'.format(self.unitConverter(self.startFreqSweep)))
+            self._applySetting('sense1:frequency:stop','sense1:frequency:stop {}'.format(self.unitConverter(self.stopFreqSweep)))
+            self._applySetting('sense1:sweep:delay','sense1:sweep:delay {}'.format(self.unitConverter(self.sweepDelay)))
+            if self.segments is not None:
+                self._applySetting('sense1:segment:data',self.segments.command())
+                self._applySetting('sense1:sweep:type','sense1:sweep:type segment')
+            else:
+                self._applySetting('sense1:sweep:type','sense1:sweep:type linear')
+                if self.points is not None:
+                    self._applySetting('sense1:sweep:points','sense1:sweep:points %d' % self.points)
+            self._configTraces(sParams)
+
+
+    def _configTraces(self,sParams=None):
+        """
+        Gives channel 1 one trace per S parameter, each with the format set
+        for this instance, and leaves trace 1 as the active trace. Like the
+        rest of the configuration only the settings that changed are sent.
 
+        Parameters:
+                sParams : list of str : S parameter of each trace, [sParam] if None
+        """
+        if sParams is None:
+            sParams = [self.sParam]
+        self._applySetting('calculate1:parameter:count','calculate1:parameter:count %d' % len(sParams))
+        redefined = False
+        for trace, param in enumerate(sParams, 1):
+            redefined = self.defineParameterOfTrace(trace,param) or redefined
+        if redefined:
+            self._queryOpc()    # wait for the traces to be redefined before they are formatted
+
+        command = 'calculate1:selected:format %s' % self.format
+        for trace in range(1, len(sParams)+1):
+            if self._instr.state.get('calculate1:parameter%s:format' % trace) != command:   # format applies to the active trace
+                self.selectTrace(trace)
+                self._applySetting('calculate1:parameter%s:format' % trace,command)
+        self.selectTrace(1)
+
+
+    def _configSession(self):
+        """
+        Sets up the communication with the instrument the first time
+        the session is used, by this or any other instance.
+        """
+        if self._instr.identity is not None:
+            return
         self._instr.timeout = 10000
         self._instr.encoding = 'latin_1'
         self._instr.write_termination = None
         self._instr.read_termination = '\n'
-        if self.trials is None or self._trial == 1:
-            print(self._instr.query('*idn?'))
+        print(self._instr.identify())
+
+
+    def _applySetting(self,setting,command):
+        """
+        Writes command to the instrument unless it is the same command that was
+        last sent for setting. 
+
+        Return: True if the command was written
+
+        Parameters:
+                setting : str : name of the instrument setting (e.g. 'sense1:frequency:start')
+                command : str : full SCPI command that puts setting in the wanted state
+        """
+        if self._instr.state.get(setting) == command:
+            return False
+        self._instr.write(command)
+        self._instr.state[setting] = command
+        return True
+
+
+    def resetInst(self):
+        """
+        Turns the instrument settings back to factory default and clears
+        its status. This is not done by the sweeps; call it explicitly
+        if the instrument may have been left in an unknown state (e.g. it was
+        used from the front panel). Every setting is sent again on the next sweep.
+        """
+        self._configSession()
         self._instr.write('*rst')   # turns instrument settings to factory default
         self._instr.write('*cls')   # Clears these analyzer status data structures: 
                                     # Event Queue, Status Byte Register (except the MAV bit), Standard Event Status Register (SESR)
 
         self._instr.write('abort')  # Aborts the current measurement and changes the trigger sequence to idle state for all channel
+        self._instr.flush()         # reset now rather than with the next query
+        self._instr.state.clear()
 
-        self._instr.write('display:enable 1')
-        self._instr.write('sense1:frequency:start {}'.format(self.unitConverter(self.startFreqSweep)))
-        self._instr.write('sense1:frequency:stop {}'.format(self.unitConverter(self.stopFreqSweep)))
-        self._instr.write('sense1:sweep:delay {}'.format(self.unitConverter(self.sweepDelay)))
 
+    def _readContinuous(self,callback):
+        """
+        Reader thread of continuous mode: triggers a sweep, waits until
+        the VNA reports it complete, reads it, and pushes it into the ring
+        buffer, until stopContinuous is called. Only completed sweeps are
+        read, so none is torn or read twice.
 
-    def _createPlot(self):
+        Parameters:
+                callback : function : called with each new Sweep, None for none
         """
-        Creates plot with from xAxis and yAxis and then saves
-        the plot in Graphs/ with a file name corresponding to 
-        the date and time.
+        try:
+            while not self._stopReader.is_set():
+                with self._instr.lock:
+                    with self._instr.operation('continuous'):
+                        self._triggerSweep()
+                        timestamp = time.time()
+                        values = self._readTrace()
+                self._ring.push(values,timestamp)
+                if callback is not None:
+                    callback(self._continuousSweep(values, timestamp, self._ring.written - 1))
+        except Exception as error:
+            self._readerError = error
+        finally:
+            self._ring.close()
+
+
+    def _continuousSweep(self,values,timestamp,sequence):
         """
-        fig = plt.figure(1, figsize=(20, 10))
-        ax = fig.add_subplot(111, facecolor='k')
-        if self.isTwoComponents():
-            ax.plot(self._freqDomain,self._magnitudes,'y')                                          
-            lower = min(self._magnitudes)
-            upper = max(self._magnitudes)
-        else:                                                                                      
-            ax.plot(self._freqDomain, self._measuredRange, 'y')                                     # Otherwise, just plot _freqDomain
-            lower = min(self._measuredRange)                                                        # against _measuredRange
-            upper = max(self._measuredRange)
-                                                                                                    
-        ax.set_title('Amplitude vs Frequency')
-        ax.set_ylabel('Amplitude (dBm)')
-        ax.set_xlabel('Freq (Hz)')
-        ax.set_xlim(self._freqDomain[0],self._freqDomain[-1])
-        ax.set_ylim(lower-(0.2*(upper-lower)),upper+(0.2*(upper-lower)))    # Scaled to fit range
+        Makes a Sweep of a row of the continuous ring buffer.
+
+        Return: Sweep
+        """
+        sweep = sw.Sweep(values,self.format,self.sParam,self._continuousTrial+sequence,self._continuousFreq)
+        sweep.timestamp = datetime.datetime.fromtimestamp(timestamp)
+        return sweep
+
+
+    def _writeSweep(self,sweep):
+        """
+        Stores the sweep and writes the per sweep files chosen with
+        setOutputs, in the background if there are writers.
+
+        Parameters:
+                sweep : Sweep : sweep to write
+        """
+        self._storeSweep(sweep)
+        for output, writer in (('png', self._createPlot),
+                                ('txt', self._logger),
+                                ('csv', self._csvWriter),
+                                ('snp', self._touchstoneWriter)):
+            if output not in self.outputs:
+                continue
+            if self._output is None:
+                writer(sweep)
+            else:
+                self._output.submit(writer,sweep)           # each sweep has its own Sweep, so it is safe to write later
 
-        # Save Plot
-        filenameG = self.getDateFormatted() + ".png"
-        filenameG = "Graphs/" + filenameG   
-        plt.savefig(filenameG)                   # Plot saved in directory named Graphs located in same directory as pyTekVNA
-        plt.clf()
 
+    def _storeSweep(self,sweep):
+        """
+        Appends the sweep to the run store, opening the store in Runs/
+        with the settings of the run as metadata on the first sweep.
+        The store is named to the microsecond, so runs started within
+        the same second do not collide (a store is never written over).
+        The append is done inline; it is a single write of the raw data.
 
+        Parameters:
+                sweep : Sweep : sweep to store
+        """
+        if self.storeBackend is None:
+            return
+        if self._store is None:
+            metadata = {'start':self.startFreqSweep, 'stop':self.stopFreqSweep,
+                        'sweepDelay':self.sweepDelay, 'transfer':self.transfer}
+            filename = "Runs/" + self.getDateFormatted(sweep.timestamp,True)    # Run saved in directory named Runs located in same directory as this file
+            self._store = ss.SweepStore(filename,self.format,self.storeBackend,metadata)
+        self._store.append(sweep)
 
 
-    def _logger(self):
+    def _sweepName(self,sweep):
         """
-        Takes xAxis and yAxis to make a plot. It then saves
-        the plot with a filename corresponding to its 
-        timestamp.
+        Gets the name the files of a sweep are given: the time it was
+        taken to the microsecond, its trial number, and its S parameter
+        (e.g. 2019-07-22_13-05-09-000125_trial3_S21), so sweeps taken within
+        the same second, or in the same sweep (makeSweepMulti), do not
+        write over each other's files.
+
+        Return: name as str
+
+        Parameters:
+                sweep : Sweep : sweep the files are written for
         """
+        return self.getDateFormatted(sweep.timestamp,True) + '_trial' + str(sweep.trial) + '_' + str(sweep.sParam)
 
-        # Create filename for log
-        filenameF = self.getDateFormatted() + ".txt"
-        filenameF = "Logs/" + filenameF     
-        f = open(filenameF, "a+")           # Log saved in directory named logs located in same directory as this file
-    
-        # Fill log with contents
-        if self.isTwoComponents():
-            for i in range(len(self._freqDomain)):
-                line = str(i) + ": " + str(self._freqDomain[i])+ "\t" + \
-                            str(self._measuredRange[2*i]) + "\t" + str(self._measuredRange[(2*i)+1])    # If two components, log each
-                f.write(line)                                                                           # pair on same line against
-                f.write('\n')                                                                           # frequency
-        else:    
-            for i in range(len(self._freqDomain)):                                                      # Otherwise, log 1:1 domain:range
-                line = str(i) + ": " + str(self._freqDomain[i]) + "\t" + str(self._measuredRange[i])
-                f.write(line)
-                f.write('\n')
-
-
-    def _csvWriter(self):
-        """
-        Writes dataX and dataY to a csv file by making data into table first 
-        Titled based on the date.
+
+    def _createPlot(self,sweep):
+        """
+        Creates plot of the sweep and then saves the plot in Graphs/ 
+        with a file name corresponding to the date and time the sweep
+        was taken and its trial. How it is rendered depends on plotMode.
+
+        Parameters:
+                sweep : Sweep : sweep to plot
+        """
+        if self.plotMode == 'none':
+            return
+        if self.isTwoComponents(sweep.format):
+            values = sweep.magnitude                                                # If two components, plot magnitudes
+        else:                                                                      
+            values = sweep.real                                                     # Otherwise, just plot the measured range
+
+        filenameG = self._sweepName(sweep) + ".png"
+        filenameG = "Graphs/" + filenameG                                           # Plot saved in directory named Graphs located in same directory as pyTekVNA
+        if self.plotMode == 'new':
+            plotting.renderSweepPlot(sweep.freqDomain,values,filenameG)
+        elif self.plotMode == 'reuse':
+            self._plot.render(sweep.freqDomain,values,filenameG)
+        else:
+            self._deferredPlots.append((sweep.freqDomain,values,filenameG))
+
+
+    def _logger(self,sweep):
+        """
+        Takes the frequency domain and range of the sweep to make a log.
+        It then saves the log with a filename corresponding to the 
+        timestamp and trial of the sweep.
+
+        Parameters:
+                sweep : Sweep : sweep to log
+        """
+        filenameF = self._sweepName(sweep) + ".txt"
+        filenameF = "Logs/" + filenameF     # Log saved in directory named logs located in same directory as this file
+        sweep.writeLog(filenameF)
+
+
+    def _csvWriter(self,sweep):
+        """
+        Writes the frequency domain and range of the sweep to a csv file.
+        Titled based on the date and trial the sweep was taken.
         The CSV is comma delimited.
+
+        Parameters:
+                sweep : Sweep : sweep to write
+        """
+        filename = 'CSVs/' + self._sweepName(sweep) + '.csv'
+        sweep.writeCsv(filename)
+
+
+    def _touchstoneWriter(self,sweep):
         """
-        # Make data into table
-        table = []
-        if self.isTwoComponents():                                                                         # Same as _logger()
-            for i in range(len(self._freqDomain)):                                                          # If two components, log each
-                table.append([self._freqDomain[i],self._measuredRange[2*i],self._measuredRange[(2*i)+1]])   # pair on same line against
-        else:                                                                                               # frequency
-            for i in range(len(self._freqDomain)):
-                table.append([self._freqDomain[i],self._measuredRange[i]])                                  # Otherwise, log 1:1 domain:range
-
-        # Write to CSV
-        filename = 'CSVs/' + self.getDateFormatted() + '.csv'
-        with open(filename, 'w', newline='') as csvfile:
-                dataWriter = csv.writer(csvfile, delimiter=',', quoting=csv.QUOTE_MINIMAL)
-                for i in range(len(table)):
-                        dataWriter.writerow(table[i])
+        Writes the sweep to a Touchstone .s1p file in Touchstone/,
+        titled based on the date and trial the sweep was taken and its S parameter.
+
+        Parameters:
+                sweep : Sweep : sweep to write
+        """
+        filename = 'Touchstone/' + self._sweepName(sweep)
+        ts.writeTouchstone(filename,sweep,self.touchstoneForm)
     
 
-    def isTwoComponents(self):
+    def isTwoComponents(self,format=None):
         """
         Determines if the measured output is one or
         two components based on format
 
         Return: True if is two component
+
+        Parameters:
+                format : str : format to check, the format of this instance if None
         """
-        if self.format in ["slinear","slogarithmic","scomplex",
-                            "smith","sadmittance","plinear",
-                            "plogarithmic","polar"]:
+        if format is None:
+            format = self.format
+        if format in sw.TWO_COMPONENT_FORMATS:
             return True
         else:
             return False
@@ -373,92 +1122,60 @@ class Ttrvna(instr.Instrument):
     
     def _inverseFFT(self):
         """
-        Calculates the inverse fourier transform of the measured range.
+        Calculates the time domain response of the latest sweep with
+        self.timeDomain (windowed and zero-padded, see timeDomain.py).
 
         Precondition: self.isTwoComponents() == True
 
-        Return: invFFT as list of complex values
+        Return: (times, response) as tuple of np.ndarray, times in seconds
         """
         assert self.isTwoComponents() == True
-        return(np.fft.ifft(self._measuredRange))
+        return self.timeDomain.transform(self._sweep)
 
 
     @staticmethod
-    def _listify(initial):
+    def _parseFdata(payload):
         """
-        Takes a string separated by commas, and breaks each component
-        separated by commas into its own element in a list. Then, it 
-        returns the list as float elements.
+        Parses the comma separated data the VNA sends in ascii mode into
+        a float64 array in a single pass over the payload. Works directly on
+        the bytes read from the instrument so nothing has to be decoded first,
+        and stays linear in the payload length even for millions of characters.
 
-        Return: listified version of initial
+        Return: parsed values as np.ndarray of float64
 
-        Precondition: initial is a string with commas and numbers between commas
+        Precondition: payload is a str or bytes with numbers separated by commas
 
-        Parameters:
-                initial : str : this is what is listified
-        """
-        assert type(initial) == str
-        assert ',' in initial
-
-        listified = []
-
-        while ',' in initial:
-                pos = initial.find(',')
-                listified.append(initial[0:pos])
-                initial = initial[pos+1:]
-                if ',' not in initial:
-                        listified.append(initial)
-        final = []
-        for item in listified:  
-                final.append(float(item))
-        return final
-    
-
-    @staticmethod
-    def _removeSecondComponent(values):
-        """
-        Removes the second component in a list of complex values assuming
-        that every other value starting from index one ought to be removed.
-
-        Return: list with second component / imaginary values removed
+        Raises: ValueError if the payload is not at least two numbers separated by commas
+                (a truncated read or a payload that is not fdata)
 
         Parameters:
-                values : list : the complex values are removed from this list
+                payload : str or bytes : this is what is parsed
         """
-        assert type(values) == list
-        newList = []
-        for i in range(len(values)):
-            if (i%2) == 0:
-                newList.append(values[i])
-        return newList
-
+        assert type(payload) == str or type(payload) == bytes
+        fields = payload.split(',' if type(payload) == str else b',')
+        if len(fields) < 2:
+            raise ValueError("malformed fdata payload: no comma separated values")
+        try:
+            return np.array(fields, dtype=np.float64)
+        except ValueError:
+            raise ValueError("malformed fdata payload: %r" % payload[:80])
+    
 
     def _getMagnitudes(self):
         """
         Gets magnitude of measured range if measured range is complex and stores
-        it in self._magnitudes as a list
+        it in self._magnitudes. The magnitude is computed once per sweep from the
+        complex view of the sweep.
         """
         assert self.isTwoComponents()
-        self._magnitudes = []
-        realPart = []
-        complexPartTemp = []
-        complexPart = []
-        for i in range(len(self._measuredRange)):
-            if (i%2) == 1:
-                complexPartTemp.append(self._measuredRange[i])
-            else:
-                realPart.append(self._measuredRange[i])
-        for i in range(len(complexPartTemp)):
-            complexPart.append(complex(str(complexPartTemp[i])+'j'))
-        for i in range(len(realPart)):
-            self._magnitudes.append(abs(realPart[i]+complexPart[i]))
+        self._magnitudes = self._sweep.magnitude
 
         
     # Extra Functions =======================================
     """
     These functions are not implemented into the core code but may be useful to users.
-    Note: if you plan to use multiple traces, you may have to alter the previous code since
-    it was designed with signle trace (active trace only) usage in mind.
+    Note: makeSweep uses trace 1 only; use makeSweepMulti to measure several
+    parameters with one sweep.
     """
      
     # Functions for controlling parameter/trace selection
@@ -466,6 +1183,8 @@ class Ttrvna(instr.Instrument):
         """
         Sets the measurement parameter for specified trace
 
+        Return: True if the parameter of the trace was changed
+
         Parameters:
                 trace       : int 1-16               : selected trace
                 parameter   : str ('S11','S21',etc.) : parameter to set to measure for trace
@@ -473,7 +1192,7 @@ class Ttrvna(instr.Instrument):
         assert type(trace) == int; assert trace >= 1 and trace <= 16
         assert type(parameter) == str; assert parameter in ['S11','S21','S22','S12']
         
-        self._instr.write('calculate1:parameter%s:define {}'.format(self.sParam) % trace)
+        return self._applySetting('calculate1:parameter%s:define' % trace,'calculate1:parameter%s:define %s' % (trace,parameter))
 
     
     def selectTrace(self,trace):
@@ -483,7 +1202,7 @@ class Ttrvna(instr.Instrument):
                 trace       : int 1-16               : selected trace
         """
         assert type(trace) == int; assert trace >= 1 and trace <= 16
-        self._instr.write('calculate1:parameter%s:select' % trace)
+        self._applySetting('calculate1:selected','calculate1:parameter%s:select' % trace)
 
     
     # Functions for configuring presets of active trace
@@ -523,7 +1242,7 @@ class Ttrvna(instr.Instrument):
             smoothingOn = 1
         if smoothingOn == False:
             smoothingOn = 0
-        self._instr.write('calculate1:selected:format %s' % smoothingOn)
+        self._instr.write('calculate1:selected:smoothing:state %s' % smoothingOn)
     
 
 
@@ -534,3 +1253,4 @@ class Ttrvna(instr.Instrument):
 if __name__ == "__main__":
     test = Ttrvna(start='50 MHz', stop='6 GHz', delay='8s', sParam='S21',trials=3,format='smith')
     test.run()
+    test.timingReport()
@@ -0,0 +1,19 @@
+"""
+conftest
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Lets the tests in this directory import the modules of LoadFrameVNAControls
+(e.g. import sweepStore) when pytest is run from anywhere. The tests run
+against the simulators (simulatedVNA.py, arduinoSimulator.py), so no
+instrument is needed.
+
+Example:
+    python -m pytest -q LoadFrameVNAControls/unit_testing
+"""
+
+# IMPORTS ===================================================================
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,68 @@
+"""
+test_arduinoSimulator
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of arduinoSimulator.py through pyserial: it boots when the port is
+opened and answers the commands of the firmware.
+"""
+
+# IMPORTS ===================================================================
+import time
+import unittest
+import arduinoSimulator as ard
+
+
+# TESTS =====================================================================
+
+@unittest.skipIf(ard.pty is None, "pseudo-terminals are not available on this system")
+class TestArduinoSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.arduino = ard.ArduinoSimulator(stiffness=50, stepRate=1000, hx711Rate=80, noise=0, speed=10, bootTime=0.5)
+        self.arduino.start()
+        self.ser = self.arduino.connect()
+        self.assertEqual(self.ser.readline(), ard.GREETING)
+
+    def tearDown(self):
+        self.ser.close()
+        self.arduino.stop()
+
+    def read(self):
+        self.ser.write(b'R')
+        line = self.ser.readline()
+        self.assertEqual(len(line), 14)
+        return float(line)
+
+    def waitFor(self,condition):
+        deadline = time.time() + 2
+        while not condition() and time.time() < deadline:
+            time.sleep(0.005)
+        self.assertTrue(condition())
+
+    def test_stepsMoveTheForce(self):
+        self.assertEqual(self.read(), 0)
+        self.ser.write(b'SSSS')
+        self.waitFor(lambda: self.arduino.position == 4)
+        self.assertAlmostEqual(self.read(), 50*4*0.01)
+        self.ser.write(b'DS')
+        self.waitFor(lambda: self.arduino.position == 3)
+        self.ser.write(b'DH')
+        self.waitFor(lambda: self.arduino.position == 103)
+        self.assertAlmostEqual(self.read(), 50*103*0.01)
+
+    def test_polarityAndUnknownCommands(self):
+        self.ser.write(b'Pz?')
+        self.waitFor(lambda: self.arduino.commands.get('?') == 1)
+        self.assertEqual(self.arduino.polarity, -1)
+        self.assertEqual(self.ser.in_waiting, 0)                            # unknown commands get no answer
+
+    def test_openingResets(self):
+        self.ser.write(b'SD')
+        self.waitFor(lambda: self.arduino.direction == -1)
+        self.ser.close()
+        self.ser = self.arduino.connect()
+        self.ser.write(b'S')                                                # lost while the board boots
+        self.assertEqual(self.ser.readline(), ard.GREETING)
+        self.assertEqual(self.arduino.resets, 2)
+        self.assertEqual((self.arduino.position, self.arduino.direction), (1, 1))
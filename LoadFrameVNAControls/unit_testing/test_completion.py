@@ -0,0 +1,46 @@
+"""
+test_completion
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of how Ttrvna waits for a sweep to complete (setCompletion) and of
+its timing report, against simulatedVNA.py.
+"""
+
+# IMPORTS ===================================================================
+import time
+import unittest
+import simulatedVNA
+import ttrvna
+
+
+# TESTS =====================================================================
+
+class TestCompletion(unittest.TestCase):
+
+    def makeVna(self,completion,sweepTime=0.05):
+        resource = simulatedVNA.register('SIM::COMPLETION_%s_%g' % (completion, sweepTime), points=51, sweepTime=sweepTime)
+        return ttrvna.Ttrvna(start='1 GHz', stop='2 GHz', delay='0s', sParam='S21', trials=2, completion=completion,
+                                writers=0, plotMode='none', outputs=(), resource=resource)
+
+    def test_waitsForTheSweep(self):
+        for completion in ['opc','esr','srq']:
+            vna = self.makeVna(completion)
+            vna.makeSweep()
+            start = time.perf_counter()
+            vna.makeSweep()
+            elapsed = time.perf_counter() - start
+            self.assertGreaterEqual(elapsed, 0.05, completion)
+            self.assertLess(elapsed, 0.5, completion)                       # no fixed sleep
+            self.assertEqual(vna._instr._resource.errors, [], completion)
+
+    def test_reportKeepsNominalApart(self):
+        vna = self.makeVna('opc',0.02)
+        vna.setSweepDelay('0.25s')
+        vna.run()
+        waited, nominal = vna.timingReport()
+        self.assertEqual(len(vna._timings), 2)
+        self.assertTrue(all(len(timing) == 2 for timing in vna._timings))
+        self.assertGreaterEqual(waited, 2*0.27)                             # measured: sweep time and delay
+        self.assertLess(waited, 1.5)
+        self.assertAlmostEqual(nominal, 2*(1.0 + 0.25))                     # nominal: the old sleeps
@@ -0,0 +1,60 @@
+"""
+test_configCache
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of the settings Ttrvna caches (_applySetting): against
+simulatedVNA.py, only the settings that changed are sent before a sweep.
+"""
+
+# IMPORTS ===================================================================
+import unittest
+import simulatedVNA
+import ttrvna
+
+
+# TESTS =====================================================================
+
+class TestConfigCache(unittest.TestCase):
+
+    def setUp(self):
+        resource = simulatedVNA.register('SIM::CONFIGCACHE', points=21, sweepTime=0)
+        self.vna = ttrvna.Ttrvna(start='1 GHz', stop='2 GHz', delay='0s', sParam='S21', trials=1, writers=0,
+                                    plotMode='none', outputs=(), resource=resource)
+        self.vna.resetInst()
+        self.simulator = self.vna._instr._resource
+        self.commands = []
+        handle = self.simulator._handle
+
+        def record(command):
+            self.commands.append(command)
+            handle(command)
+        self.simulator._handle = record
+
+    def settingsSent(self):
+        """
+        Gets the commands sent since the last call that are not queries or sweeps.
+        """
+        commands = [command for command in self.commands if not command.endswith('?')
+                        and not command.startswith(('initiate:immediate','*'))]
+        del self.commands[:]
+        return commands
+
+    def test_onlyChangesAreSent(self):
+        self.vna.makeSweep()
+        self.assertIn('sense1:frequency:start 1000000000.0', self.settingsSent())
+        self.vna.makeSweep()
+        self.assertEqual(self.settingsSent(), [])
+        self.vna.setStartSweep('1.5 GHz')
+        self.vna.makeSweep()
+        self.assertEqual(self.settingsSent(), ['sense1:frequency:start 1500000000.0'])
+        self.assertEqual(self.simulator.settings['start'], 1.5e9)
+        self.assertEqual(self.simulator.errors, [])
+
+    def test_resetSendsEverythingAgain(self):
+        self.vna.makeSweep()
+        first = self.settingsSent()
+        self.vna.resetInst()
+        del self.commands[:]
+        self.vna.makeSweep()
+        self.assertEqual(self.settingsSent(), first)
@@ -0,0 +1,73 @@
+"""
+test_continuous
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of continuous acquisition (Ttrvna.startContinuous) against
+simulatedVNA.py, whose traces are torn when read mid-sweep.
+"""
+
+# IMPORTS ===================================================================
+import time
+import unittest
+import numpy as np
+import simulatedVNA
+import ttrvna
+
+
+def exactTrace(simulator,sweep,freqDomain):
+    """
+    Gets the S21 trace the simulator draws for a whole sweep, in mlogarithmic.
+
+    Return: np.ndarray
+    """
+    return simulatedVNA._formatted(simulator._sParameter('S21', freqDomain, sweep), freqDomain, 'mlogarithmic')[0]
+
+
+def sweepOf(simulator,values,freqDomain,sweeps):
+    """
+    Finds which whole sweep values are.
+
+    Return: sweep number, None if values are not a whole sweep (torn)
+    """
+    for sweep in range(sweeps + 2):
+        if np.allclose(values, exactTrace(simulator, sweep, freqDomain), rtol=0, atol=1e-9):
+            return sweep
+    return None
+
+
+# TESTS =====================================================================
+
+class TestSimulatedTornReads(unittest.TestCase):
+
+    def test_readMidSweepIsTorn(self):
+        simulator = simulatedVNA.SimulatedTtr506a(points=101, sweepTime=0.2, drift=2e6, noise=0)
+        simulator.write('initiate1:continuous off;calculate1:parameter1:define S21')
+        simulator.write('initiate:immediate')
+        time.sleep(0.1)
+        values = np.array(simulator.query_ascii_values('calculate1:selected:data:fdata?'))[0::2]
+        freqDomain = simulator._frequencies()
+        self.assertIsNone(sweepOf(simulator, values, freqDomain, simulator.sweeps))
+        simulator.query('*opc?')
+        values = np.array(simulator.query_ascii_values('calculate1:selected:data:fdata?'))[0::2]
+        self.assertEqual(sweepOf(simulator, values, freqDomain, simulator.sweeps), simulator.sweeps)
+
+
+class TestContinuous(unittest.TestCase):
+
+    def test_onlyWholeSweeps(self):
+        resource = simulatedVNA.register('SIM::CONTINUOUS', points=101, sweepTime=0.01, drift=2e6, noise=0)
+        vna = ttrvna.Ttrvna(start='2.3 GHz', stop='2.5 GHz', delay='0s', sParam='S21', trials=1, writers=0,
+                            plotMode='none', outputs=(), resource=resource)
+        vna.startContinuous(capacity=64)
+        time.sleep(0.3)
+        counters = vna.stopContinuous()
+        sweeps = list(vna.continuousSweeps(timeout=1))
+        self.assertGreater(len(sweeps), 5)
+        self.assertEqual(counters['sweeps'], len(sweeps))
+
+        simulator = vna._instr._resource
+        numbers = [sweepOf(simulator, sweep.real, sweep.freqDomain, simulator.sweeps) for sweep in sweeps]
+        self.assertNotIn(None, numbers)                                     # no torn sweep
+        self.assertEqual(len(set(numbers)), len(numbers))                   # none read twice
+        self.assertEqual(numbers, sorted(numbers))
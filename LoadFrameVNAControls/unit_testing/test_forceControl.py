@@ -0,0 +1,142 @@
+"""
+test_forceControl
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of forceControl.py: the ForceController reaches force steps on
+arduinoSimulator.py, up and down, and learns the stiffness of the
+specimen on the way.
+"""
+
+# IMPORTS ===================================================================
+import csv
+import os
+import tempfile
+import time
+import unittest
+import arduinoSimulator as ard
+import forceControl as fc
+import LoadFrameController as lfc
+import pyLoadControl as lc
+import pyMotorControl as mc
+import simulatedVNA
+
+
+# How many times faster than real time the simulated Arduino runs
+SPEED = 20.0
+
+
+# HELPER FUNCTIONS ==========================================================
+
+class LinearSpecimen(object):
+    """
+    Motor and load cell of a specimen without noise or backlash whose
+    force is stiffness N per step moved.
+    """
+
+    def __init__(self,stiffness):
+        self.stiffness = stiffness
+        self.position = 0
+        self.direction = 1
+        self.lastEstimate = None
+        self._reader = None
+
+    def setDirection(self,direction):
+        self.direction = direction
+
+    def doSteps(self,steps,stepTime):
+        self.position += self.direction*steps
+
+    def takeMeasurement(self,samples,record):
+        force = self.stiffness*self.position
+        self.lastEstimate = (force, 0.001, samples)
+        return force
+
+
+# TESTS =====================================================================
+
+class TestStiffnessLearning(unittest.TestCase):
+
+    def setUp(self):
+        self.specimen = LinearSpecimen(0.3)
+        self.control = fc.ForceController(self.specimen, self.specimen, stiffness=3.0, tolerance=0.5,
+                                            maxMoves=1, stepTime=0, settleTime=0)
+
+    def test_firstMoveCanLowerTheStiffness(self):
+        self.control.tune(20)                                               # same direction as the motor started in
+        self.assertLess(self.control.stiffness, 3.0)
+
+    def test_reversalSinceTheLastAttemptOnlyRaises(self):
+        self.specimen.position = 100
+        self.control.tune(10)                                               # moves down
+        self.control.stiffness = 3.0
+        self.control.tune(35)                                               # first move back up takes up backlash
+        self.assertEqual(self.control.stiffness, 3.0)
+        self.control.tune(45)                                               # second move up
+        self.assertLess(self.control.stiffness, 3.0)
+
+
+@unittest.skipIf(ard.pty is None, "pseudo-terminals are not available on this system")
+class TestForceController(unittest.TestCase):
+
+    def setUp(self):
+        self.arduino = ard.ArduinoSimulator(stiffness=30, hx711Rate=80, noise=0.05, speed=SPEED, bootTime=0.2)
+        self.ser = self.arduino.connect(timeout=0.5)
+        self.assertEqual(self.ser.readline(), ard.GREETING)
+        self.ser.timeout = 0.1
+        self.loadcell = lc.LoadCell(self.ser)
+        self.motor = mc.Motor(self.ser, 1)
+        self.loadcell.startStreaming()
+        self.control = fc.ForceController(self.motor, self.loadcell, stiffness=0.5, tolerance=0.5, samples=5,
+                                            stepTime=1/self.arduino.stepRate/SPEED, settleTime=0.2/SPEED, timeout=30)
+
+    def tearDown(self):
+        self.loadcell.stopStreaming()
+        self.ser.close()
+        self.arduino.stop()
+
+    def test_upAndDown(self):
+        for target in [20, 35, 10]:
+            attempt = self.control.tune(target)
+            self.assertTrue(attempt['converged'], target)
+            self.assertAlmostEqual(attempt['force'], target, delta=0.5)
+            self.assertAlmostEqual(self.arduino.force(), target, delta=0.6)
+            self.assertLess(attempt['moves'], 15, target)                   # multi-step moves, not one step at a time
+            self.assertEqual(self.motor.direction, 1)
+        time.sleep(0.05)
+        self.assertEqual(self.arduino.direction, self.motor.direction)      # the Arduino agrees with the tracked direction
+        self.assertAlmostEqual(self.control.stiffness, 30*0.01, delta=0.1)  # N per step of the simulated specimen
+        self.assertEqual(len(self.control.attempts), 3)
+
+    def test_saveAttempts(self):
+        self.control.tune(5)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'force_control.csv')
+            self.control.saveAttempts(filename)
+            with open(filename) as csvfile:
+                rows = list(csv.reader(csvfile))
+        self.assertEqual(rows[0], fc.ATTEMPT_COLUMNS)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][0], '5')
+
+
+@unittest.skipIf(ard.pty is None, "pseudo-terminals are not available on this system")
+class TestControllerForceControl(unittest.TestCase):
+
+    def setUp(self):
+        self.arduino = ard.ArduinoSimulator(speed=SPEED, bootTime=0.2)
+        resource = simulatedVNA.register('SIM::FORCECONTROL', points=11, sweepTime=0)
+        self.controller = lfc.Controller(self.arduino.start(), start='2 GHz', stop='3 GHz', delay='0s', sParam='S21',
+                                            trials=1, loadAvg=3, resource=resource)
+
+    def tearDown(self):
+        self.controller._ser.close()
+        self.arduino.stop()
+
+    def test_samplesFollowLoadAvg(self):
+        self.assertEqual(self.controller.forceControl.samples, 3)
+        self.controller.setLoadAvg(7)
+        self.assertEqual(self.controller.forceControl.samples, 7)
+        self.controller.setForceControl(samples=2)
+        self.controller.setLoadAvg(4)
+        self.assertEqual(self.controller.forceControl.samples, 2)
@@ -0,0 +1,146 @@
+"""
+test_instrument
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of instrument.py: BatchedSession batching and the settings it
+caches, and the session pool, against simulatedVNA.py.
+"""
+
+# IMPORTS ===================================================================
+import importlib.util
+import os
+import threading
+import time
+import unittest
+import instrument as instr
+import simulatedVNA
+
+
+# HELPER FUNCTIONS ==========================================================
+
+class RecordingResource(object):
+    """
+    Resource that records what reaches it, in order.
+    """
+
+    def __init__(self):
+        self.sent = []
+
+    def write(self,message):
+        self.sent.append(('write', message))
+
+    def write_raw(self,message):
+        self.sent.append(('write_raw', message))
+
+
+def loadPowerSupplyTtrvna():
+    """
+    Imports PowSupVNAControls/ttrvna.py, which has the name of the ttrvna of this folder.
+
+    Return: module
+    """
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        'PowSupVNAControls', 'ttrvna.py')
+    spec = importlib.util.spec_from_file_location('powSupTtrvna', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# TESTS =====================================================================
+
+class TestBatchedSession(unittest.TestCase):
+
+    def setUp(self):
+        self.simulator = simulatedVNA.SimulatedTtr506a(sweepTime=0)
+        self.session = instr.BatchedSession(self.simulator, maxLength=64)
+
+    def test_writesGoWithTheNextQuery(self):
+        self.session.write('sense1:frequency:start 1e9')
+        self.session.write('sense1:frequency:stop 2e9')
+        self.assertEqual(self.simulator.messages, 0)
+        self.assertEqual(self.session.query('*idn?'), simulatedVNA.IDENTITY)
+        self.assertEqual(self.simulator.messages, 1)
+        self.assertEqual(self.simulator.settings['start'], 1e9)
+        self.assertEqual(self.simulator.settings['stop'], 2e9)
+        self.assertEqual(self.simulator.errors, [])
+
+    def test_joinCommands(self):
+        self.assertEqual(instr.BatchedSession.joinCommands(['a 1', 'b 2', '*opc', ':c 3']), 'a 1;:b 2;*opc;:c 3')
+
+    def test_longMessagesAreSplit(self):
+        for point in range(10):
+            self.session.write('sense1:sweep:points %d' % (101 + point))
+        self.session.flush()
+        self.assertGreater(self.simulator.messages, 1)
+        self.assertEqual(self.simulator.settings['points'], 110)
+        self.assertEqual(self.session.operations['other'], [10, self.simulator.messages])
+
+    def test_passthroughSendsQueuedWritesFirst(self):
+        resource = RecordingResource()
+        session = instr.BatchedSession(resource)
+        session.write('display:enable 1')
+        session.write('sense1:sweep:points 201')
+        session.write_raw(b'*trg\n')
+        self.assertEqual(resource.sent, [('write', 'display:enable 1;:sense1:sweep:points 201'),
+                                            ('write_raw', b'*trg\n')])
+
+    def test_operationsPerThread(self):
+        session = instr.BatchedSession(RecordingResource())
+        inside = threading.Event()
+        done = threading.Event()
+
+        def other():
+            with session.operation('transfer'):
+                inside.set()
+                done.wait(5)
+                session.write('a 1')
+                session.flush()
+
+        thread = threading.Thread(target=other)
+        thread.start()
+        inside.wait(5)
+        with session.operation('configure'):
+            done.set()
+            thread.join()
+            session.write('b 2')
+            session.flush()
+        self.assertEqual(session.operations, {'transfer':[1,1], 'configure':[1,1]})
+
+    def test_resetForgetsSettings(self):
+        self.session.state['sense1:frequency:start'] = 'sense1:frequency:start 1e9'
+        self.session.write('*RST')
+        self.assertEqual(self.session.state, {})
+
+
+class TestPool(unittest.TestCase):
+
+    def test_oneSessionPerResource(self):
+        resource = simulatedVNA.register('SIM::POOL')
+        self.assertTrue(instr.isSimulated(resource))
+        self.assertIs(instr.openSession(resource), instr.openSession(resource))
+
+    def test_powerSupplyFolderSharesThePool(self):
+        self.assertIs(loadPowerSupplyTtrvna().instr, instr)                                  # one module, so one pool
+
+    def test_powerSupplyVnaWaitsForTheRedefinedTrace(self):
+        module = loadPowerSupplyTtrvna()
+        resource = simulatedVNA.register('SIM::POWSUP', points=11, sweepTime=0)
+        vna = module.Ttrvna(start='1 GHz', stop='2 GHz', delay='0s', sParam='S21', trials=1, resource=resource)
+        simulator = instr.openSession(resource)._resource
+        start = time.time()
+        vna.makeSweepUnprocessed()
+        self.assertLess(time.time() - start, 0.5)                           # no fixed sleep after the define
+        self.assertEqual(simulator.errors, [])
+
+
+class TestElectrometer(unittest.TestCase):
+
+    def test_noDefaultResource(self):
+        try:
+            import Electrometer
+        except ImportError as error:
+            self.skipTest(str(error))
+        with self.assertRaises(AssertionError):
+            Electrometer.Electrometer()
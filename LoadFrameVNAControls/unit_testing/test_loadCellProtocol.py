@@ -0,0 +1,92 @@
+"""
+test_loadCellProtocol
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of loadCellProtocol.py: frames decode to what was encoded however
+the stream is cut, and lost frames and skipped bytes are counted exactly.
+"""
+
+# IMPORTS ===================================================================
+import unittest
+import numpy as np
+import loadCellProtocol as lcp
+
+
+def makeStream(count,first=0):
+    """
+    Makes count frames with known values.
+
+    Return: (frames, raw, micros) as tuple
+    """
+    sequence = np.arange(first, first + count)
+    raw = (sequence*7919) % 2**24 - 2**23
+    micros = sequence*12500
+    return lcp.encodeFrames(sequence, raw, micros), raw, micros
+
+
+def feedAll(parser,data,chunk):
+    """
+    Feeds data in chunks and joins what was decoded.
+
+    Return: (raw, seconds) as tuple of np.ndarray
+    """
+    results = [parser.feed(data[start:start+chunk]) for start in range(0, len(data), chunk)]
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+
+# TESTS =====================================================================
+
+class TestFrameParser(unittest.TestCase):
+
+    def test_anyChunkSize(self):
+        frames, raw, micros = makeStream(1000)
+        for chunk in [1, 7, 10, 256, 4096, len(frames)]:
+            parser = lcp.FrameParser()
+            decoded, seconds = feedAll(parser, frames, chunk)
+            np.testing.assert_array_equal(decoded, raw)
+            np.testing.assert_allclose(seconds, micros/1e6)
+            self.assertEqual((parser.frames, parser.lost, parser.discarded), (1000, 0, 0))
+
+    def test_syncBytesInsideFrames(self):
+        raw = np.full(50, 0xA5A5A5 - 2**24)
+        frames = lcp.encodeFrames(np.full(50, 0xA5), raw, np.full(50, 0xA5A5A5A5) + np.arange(50))
+        parser = lcp.FrameParser()
+        decoded, _ = feedAll(parser, b'\x01\x02' + frames, 33)
+        np.testing.assert_array_equal(decoded, raw)
+        self.assertEqual(parser.discarded, 2)
+
+    def test_lostFrames(self):
+        frames, raw, _ = makeStream(600)
+        kept = b''.join(frames[10*i:10*i+10] for i in range(600) if i % 100 != 50)
+        parser = lcp.FrameParser()
+        decoded, _ = feedAll(parser, kept, 64)
+        self.assertEqual(parser.frames, 594)
+        self.assertEqual(parser.lost, 6)
+        self.assertEqual(parser.discarded, 0)
+
+    def test_corruptedFrame(self):
+        frames, raw, _ = makeStream(20)
+        corrupted = bytearray(frames)
+        corrupted[10*5 + 3] ^= 0xFF                                         # breaks the checksum of frame 5
+        parser = lcp.FrameParser()
+        decoded, _ = feedAll(parser, bytes(corrupted), 256)
+        np.testing.assert_array_equal(decoded, np.delete(raw, 5))
+        self.assertEqual(parser.discarded, 10)
+        self.assertEqual(parser.lost, 1)
+
+    def test_everyDroppedByteCounted(self):
+        frames, raw, _ = makeStream(6)
+        garbage = bytes(range(1, 16))                                       # 15 bytes, no sync byte
+        parser = lcp.FrameParser()
+        first, _ = parser.feed(frames[:30] + garbage)                       # more than a frame of garbage after the last frame
+        second, _ = parser.feed(frames[30:])
+        np.testing.assert_array_equal(np.concatenate((first, second)), raw)
+        self.assertEqual(parser.discarded, 15)
+
+    def test_microsWrap(self):
+        micros = np.array([2**32 - 20, 2**32 - 10, 0, 10])
+        frames = lcp.encodeFrames(np.arange(4), np.zeros(4, dtype=int), micros)
+        parser = lcp.FrameParser()
+        _, seconds = feedAll(parser, frames, 10)
+        np.testing.assert_allclose(seconds*1e6, 2**32 - 20 + np.array([0, 10, 20, 30]))
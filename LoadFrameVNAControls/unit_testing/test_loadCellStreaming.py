@@ -0,0 +1,129 @@
+"""
+test_loadCellStreaming
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of LoadCell.startStreaming against arduinoSimulator.py: the
+readings stream into the ring buffer, as text or as binary frames, and
+measurements are taken from the latest of them. Polled readings are
+still read the way the original firmware sends them.
+"""
+
+# IMPORTS ===================================================================
+import time
+import unittest
+import numpy as np
+import arduinoSimulator as ard
+import pyLoadControl as lc
+
+
+# TESTS =====================================================================
+
+@unittest.skipIf(ard.pty is None, "pseudo-terminals are not available on this system")
+class TestPolled(unittest.TestCase):
+
+    def setUp(self):
+        self.arduino = ard.ArduinoSimulator(stiffness=50, noise=0, speed=5, bootTime=0.04)
+        self.ser = self.arduino.connect(timeout=1)
+        self.loadcell = lc.LoadCell(self.ser)
+
+    def tearDown(self):
+        self.ser.close()
+        self.arduino.stop()
+
+    def test_greetingAndReadings(self):
+        self.assertEqual(self.ser.read(17), ard.GREETING)                  # what takeMeasurement prints
+        self.ser.write(b'S'*40)
+        for _ in range(3):
+            self.loadcell.doRead()
+            line = self.loadcell.returnRead()
+            self.assertEqual(len(line), 14)
+            self.assertTrue(line.endswith(b'\r\n'))
+            self.assertAlmostEqual(self.loadcell._parseRead(line), self.arduino.force(), places=3)
+        self.assertEqual(self.arduino.position, 40)
+
+
+@unittest.skipIf(ard.pty is None, "pseudo-terminals are not available on this system")
+class TestStreaming(unittest.TestCase):
+
+    framed = False
+    hx711Rate = 80
+    speed = 5                                                               # 400 readings per second
+
+    def setUp(self):
+        self.arduino = ard.ArduinoSimulator(stiffness=50, stepRate=1000, hx711Rate=self.hx711Rate, noise=0,
+                                                speed=self.speed, bootTime=0.2/self.speed)
+        self.ser = self.arduino.connect(timeout=0.5)
+        self.assertEqual(self.ser.readline(), ard.GREETING)                 # booted, so the stream command is not lost
+        self.ser.timeout = 0.1                                              # so stopStreaming does not wait long for the reader
+        self.loadcell = lc.LoadCell(self.ser)
+        self.loadcell.setCalibration(self.arduino.rawOffset, self.arduino.countsPerNewton)
+        self.loadcell.startStreaming(capacity=256, framed=self.framed)
+
+    def tearDown(self):
+        self.loadcell.stopStreaming()
+        self.ser.close()
+        self.arduino.stop()
+
+    def moveTo(self,position):
+        self.ser.write(b'S'*(position - self.arduino.position))
+        deadline = time.time() + 2
+        while self.arduino.position != position and time.time() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(self.arduino.position, position)
+
+    def test_latestReadings(self):
+        self.assertEqual(self.loadcell.takeMeasurement(5, False, timeout=2), 0)
+        self.moveTo(10)
+        start = time.time()
+        force = self.loadcell.takeMeasurement(3, False, since=time.time(), timeout=2)
+        self.assertAlmostEqual(force, 50*10*0.01)
+        self.assertLess(time.time() - start, 0.5)                           # 3 readings at 400 per second
+        self.assertEqual(self.loadcell.lastEstimate[2], 3)
+
+    def test_window(self):
+        self.loadcell.takeMeasurement(1, False, timeout=2)
+        time.sleep(0.3)
+        self.loadcell.takeMeasurement(1, False, window=0.1)
+        used = self.loadcell.lastEstimate[2]
+        self.assertGreater(used, 10)                                        # about 40 readings in 0.1 s
+        self.assertLess(used, 80)
+
+    def test_recorded(self):
+        self.loadcell.takeMeasurement(2, True, timeout=2)
+        self.loadcell.takeMeasurement(2, False)
+        self.assertEqual(len(self.loadcell.data), 1)
+        self.assertEqual(len(self.loadcell.allData), 2)
+
+    def test_timeout(self):
+        with self.assertRaises(TimeoutError):
+            self.loadcell.takeMeasurement(1, False, since=time.time() + 60, timeout=0.1)
+
+    def test_stop(self):
+        self.loadcell.takeMeasurement(1, False, timeout=2)
+        self.loadcell.stopStreaming()
+        time.sleep(0.05)
+        self.assertIsNone(self.arduino.streaming)
+        values, timestamps = self.loadcell.readings()
+        self.assertGreater(len(values), 0)
+        self.assertTrue(np.all(np.diff(timestamps) >= 0))
+
+
+@unittest.skipIf(ard.pty is None, "pseudo-terminals are not available on this system")
+class TestFramedStreaming(TestStreaming):
+
+    framed = True
+    hx711Rate = 400
+    speed = 1                                                               # the board's clock runs in real time
+
+    def test_nothingLost(self):
+        self.loadcell.takeMeasurement(50, False, timeout=2)
+        self.assertEqual(self.arduino.streaming, 'framed')
+        self.assertGreaterEqual(self.loadcell.parser.frames, 50)
+        self.assertEqual((self.loadcell.parser.lost, self.loadcell.parser.discarded), (0, 0))
+
+    def test_tare(self):
+        self.moveTo(10)
+        self.loadcell.tare(5)
+        self.assertAlmostEqual(self.loadcell.offset, self.arduino.rawOffset + 5*self.arduino.countsPerNewton)
+        self.assertAlmostEqual(self.loadcell.takeMeasurement(3, False, since=time.time(), timeout=2), 0)
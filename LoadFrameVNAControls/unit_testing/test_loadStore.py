@@ -0,0 +1,132 @@
+"""
+test_loadStore
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of loadStore.py: the store reads the same in memory and spilled to
+disk, and spilling keeps its memory bounded. The measurements of a
+LoadCell streaming from arduinoSimulator.py are kept in it.
+"""
+
+# IMPORTS ===================================================================
+import csv
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import numpy as np
+import arduinoSimulator as ard
+import loadStore as ls
+import pyLoadControl as lc
+
+
+def fill(store,count):
+    """
+    Appends count measurements, every third one not recorded.
+
+    Return: recorded flag of each as np.ndarray
+    """
+    recorded = np.arange(count) % 3 != 2
+    for i in range(count):
+        store.append(float(i), std=0.1, samples=3, recorded=bool(recorded[i]), timestamp=1000.0 + i)
+    return recorded
+
+
+# TESTS =====================================================================
+
+class TestLoadStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.spill = os.path.join(self.directory, 'load.dat')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def check(self,store,count,recorded):
+        self.assertEqual(len(store), count)
+        np.testing.assert_array_equal(store.column('mean'), np.arange(count))
+        np.testing.assert_array_equal(store.column('mean', recorded=True), np.flatnonzero(recorded))
+        self.assertEqual(store.row(-1)['mean'], count - 1)
+        self.assertEqual(store.row(0, recorded=True)['mean'], 0)
+        self.assertEqual(store.row(-1, recorded=True)['mean'], np.flatnonzero(recorded)[-1])
+        data = ls.MeasurementList(store, recorded=True)
+        self.assertEqual(len(data), recorded.sum())
+        self.assertEqual(data[5], [6, float(np.flatnonzero(recorded)[5])])
+        self.assertEqual(list(data)[-1], [int(recorded.sum()), float(np.flatnonzero(recorded)[-1])])
+        self.assertEqual(store.latest(), count - 1)
+        self.assertEqual(store.latest(recorded=True), np.flatnonzero(recorded)[-1])
+
+    def test_inMemory(self):
+        store = ls.LoadStore(capacity=4)
+        recorded = fill(store, 1000)
+        self.check(store, 1000, recorded)
+
+    def test_spilled(self):
+        store = ls.LoadStore(capacity=4, spill=self.spill, memoryRows=64)
+        recorded = fill(store, 1000)
+        self.assertGreater(store.spilled, 0)
+        self.check(store, 1000, recorded)
+
+    def test_spillingBoundsMemory(self):
+        store = ls.LoadStore(capacity=4, spill=self.spill, memoryRows=64)
+        fill(store, 5000)
+        self.assertLessEqual(len(store._rows), 64)
+        self.assertLessEqual(len(store._recordedRows), 64)
+
+    def test_reload(self):
+        store = ls.LoadStore(spill=self.spill, memoryRows=100)
+        recorded = fill(store, 250)
+        store.close()
+        rows = ls.load(self.spill)
+        self.assertEqual(len(rows), 250)
+        np.testing.assert_array_equal(rows['index'], np.arange(1, 251))
+        np.testing.assert_array_equal(rows['recorded'], recorded)
+        np.testing.assert_array_equal(rows['timestamp'], 1000.0 + np.arange(250))
+        positions = np.fromfile(self.spill + '.recorded', dtype=np.int64)
+        np.testing.assert_array_equal(positions, np.flatnonzero(recorded))
+
+    def test_outOfRange(self):
+        store = ls.LoadStore()
+        with self.assertRaises(IndexError):
+            store.row(0)
+        self.assertIsNone(store.latest())
+
+
+@unittest.skipIf(ard.pty is None, "pseudo-terminals are not available on this system")
+class TestLoadCellStore(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.mkdtemp()
+        os.chdir(self.directory)
+        for directory in ['CSVs','Logs']:
+            os.mkdir(directory)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory)
+
+    def test_measurementsSpilledAndSaved(self):
+        with ard.ArduinoSimulator(stiffness=50, stepRate=1000, hx711Rate=80, noise=0, speed=5, bootTime=0.04) as arduino:
+            ser = arduino.connect(timeout=0.5)
+            ser.readline()
+            ser.timeout = 0.1
+            loadcell = lc.LoadCell(ser)
+            loadcell.setStore(ls.LoadStore(spill=os.path.join('Logs','load_run.dat'), memoryRows=2))
+            loadcell.startStreaming()
+            for step in range(5):
+                if step:
+                    ser.write(b'S'*10)
+                    while arduino.position < 10*step:
+                        time.sleep(0.005)
+                loadcell.takeMeasurement(2, step % 2 == 0, since=time.time(), timeout=2)
+            loadcell.stopStreaming()
+            ser.close()
+        self.assertGreater(loadcell.store.spilled, 0)
+        self.assertEqual(len(loadcell.allData), 5)
+        self.assertEqual(list(loadcell.data), [[1, 0.0], [2, 10.0], [3, 20.0]])
+        loadcell.saveData()
+        with open(os.path.join('CSVs', loadcell._filename + '.csv')) as csvfile:
+            self.assertEqual(list(csv.reader(csvfile)), [['1','0.0'], ['2','10.0'], ['3','20.0']])
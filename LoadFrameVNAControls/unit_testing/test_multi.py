@@ -0,0 +1,36 @@
+"""
+test_multi
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of Ttrvna.makeSweepMulti against simulatedVNA.py: every S parameter
+is read from the same sweep.
+"""
+
+# IMPORTS ===================================================================
+import unittest
+import numpy as np
+import simulatedVNA
+import ttrvna
+
+
+# TESTS =====================================================================
+
+class TestMakeSweepMulti(unittest.TestCase):
+
+    def test_oneSweepForAllParameters(self):
+        resource = simulatedVNA.register('SIM::MULTI', points=51, sweepTime=0, drift=1e6, noise=0)
+        vna = ttrvna.Ttrvna(start='2.3 GHz', stop='2.5 GHz', delay='0s', sParam='S21', trials=1, format='polar',
+                                writers=0, plotMode='none', outputs=(), resource=resource)
+        simulator = vna._instr._resource
+        for trial in range(2):
+            sweeps = vna.makeSweepMulti()
+            self.assertEqual(sorted(sweeps), ['S11','S12','S21','S22'])
+            for param, sweep in sweeps.items():
+                self.assertEqual(sweep.sParam, param)
+                self.assertEqual(sweep.trial, trial + 1)
+                self.assertIs(sweep.freqDomain, sweeps['S11'].freqDomain)
+                expected = simulator._sParameter(param, sweep.freqDomain, simulator.sweeps)
+                np.testing.assert_allclose(sweep.complex, expected, rtol=1e-12, err_msg=param)
+        self.assertEqual(simulator.sweeps, 2)                               # drifting resonance, one sweep per call
+        self.assertEqual(simulator.errors, [])
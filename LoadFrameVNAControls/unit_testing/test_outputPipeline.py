@@ -0,0 +1,64 @@
+"""
+test_outputPipeline
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of outputPipeline.py and of replacing the writers of a Ttrvna.
+"""
+
+# IMPORTS ===================================================================
+import gc
+import threading
+import time
+import unittest
+import weakref
+import outputPipeline as op
+import simulatedVNA
+import ttrvna
+
+
+# TESTS =====================================================================
+
+class TestOutputPipeline(unittest.TestCase):
+
+    def test_runsEveryJob(self):
+        done = []
+        pipeline = op.OutputPipeline(2, 4)
+        for job in range(20):
+            pipeline.submit(lambda job: (time.sleep(0.001), done.append(job)), job)
+        pipeline.flush()
+        self.assertEqual(sorted(done), list(range(20)))
+        pipeline.close()
+
+    def test_flushRaisesFailures(self):
+        pipeline = op.OutputPipeline(1, 4)
+        pipeline.submit(lambda: 1/0)
+        with self.assertRaises(ZeroDivisionError):
+            pipeline.flush()
+        pipeline.close()
+
+    def test_closeStopsWorkersAndReleases(self):
+        pipeline = op.OutputPipeline(3, 4)
+        pipeline.close()
+        self.assertFalse(any(thread.is_alive() for thread in pipeline._threads))
+        released = weakref.ref(pipeline)
+        del pipeline
+        gc.collect()
+        self.assertIsNone(released())                                      # atexit no longer holds it
+
+
+class TestSetWriters(unittest.TestCase):
+
+    def test_oldWritersAreClosed(self):
+        resource = simulatedVNA.register('SIM::WRITERS', sweepTime=0)
+        vna = ttrvna.Ttrvna(start='1 GHz', stop='2 GHz', writers=2, plotMode='none', outputs=(), resource=resource)
+        threads = threading.active_count()
+        for _ in range(5):
+            old = weakref.ref(vna._output)
+            vna.setWriters(2)
+            gc.collect()
+            self.assertIsNone(old())
+        self.assertEqual(threading.active_count(), threads)
+        vna.setWriters(0)
+        self.assertIsNone(vna._output)
+        self.assertEqual(threading.active_count(), threads - 2)
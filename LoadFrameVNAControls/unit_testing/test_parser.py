@@ -0,0 +1,46 @@
+"""
+test_parser
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of Ttrvna._parseFdata, the parser of the comma separated data the
+VNA sends in ascii mode, against the original _listify kept in
+benchmarks.py.
+"""
+
+# IMPORTS ===================================================================
+import unittest
+import numpy as np
+import benchmarks
+import ttrvna
+
+
+# TESTS =====================================================================
+
+class TestParseFdata(unittest.TestCase):
+
+    def test_matchesLegacy(self):
+        for points in [1, 2, 201]:
+            payload = benchmarks.makeFdataPayload(points)
+            values = ttrvna.Ttrvna._parseFdata(payload)
+            self.assertEqual(values.dtype, np.float64)
+            np.testing.assert_array_equal(values, benchmarks.listifyLegacy(payload.decode('latin_1')))
+
+    def test_strAndBytes(self):
+        text = '-1.5E+01, 2.25e-3,+3,4.0\n'
+        expected = [-15, 0.00225, 3, 4]
+        np.testing.assert_array_equal(ttrvna.Ttrvna._parseFdata(text), expected)
+        np.testing.assert_array_equal(ttrvna.Ttrvna._parseFdata(text.encode('latin_1')), expected)
+
+    def test_malformed(self):
+        for payload in [b'1.0,abc,3.0', b'1.0,,3.0', b'1.0', b'', b'1.0,2.0,3.0E+']:
+            with self.assertRaises(ValueError, msg=payload):
+                ttrvna.Ttrvna._parseFdata(payload)
+
+    def test_truncated(self):
+        payload = benchmarks.makeFdataPayload(201)
+        cut = payload.rfind(b'E')                                           # read stopped inside the last number
+        with self.assertRaises(ValueError):
+            ttrvna.Ttrvna._parseFdata(payload[:cut+2])
+        with self.assertRaises(ValueError):
+            ttrvna.Ttrvna._parseFdata(b'\x00\xff' + payload[:100])
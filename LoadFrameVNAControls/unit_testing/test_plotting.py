@@ -0,0 +1,72 @@
+"""
+test_plotting
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of plotting.py and the plot modes of Ttrvna: every way of rendering
+draws the same png, and deferred pngs are only written at the end of a
+run.
+"""
+
+# IMPORTS ===================================================================
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from matplotlib.image import imread
+import plotting
+import simulatedVNA
+import ttrvna
+
+
+# TESTS =====================================================================
+
+class TestPlotting(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.freqDomain = np.linspace(1e9, 2e9, 101)
+        self.traces = [np.sin(self.freqDomain/1e8), np.cos(self.freqDomain/2e8)*3]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def names(self,strategy):
+        return [os.path.join(self.directory, '%s%d.png' % (strategy, i)) for i in range(len(self.traces))]
+
+    def test_strategiesDrawTheSame(self):
+        plot = plotting.ReusablePlot()
+        jobs = []
+        for trace, new, reuse, deferred in zip(self.traces, self.names('new'), self.names('reuse'), self.names('deferred')):
+            plotting.renderSweepPlot(self.freqDomain, trace, new)
+            plot.render(self.freqDomain, trace, reuse)
+            jobs.append((self.freqDomain, trace, deferred))
+        plotting.renderDeferred(jobs, processes=2)
+        for new, reuse, deferred in zip(self.names('new'), self.names('reuse'), self.names('deferred')):
+            np.testing.assert_array_equal(imread(reuse), imread(new))
+            np.testing.assert_array_equal(imread(deferred), imread(new))
+
+
+class TestPlotModes(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.mkdtemp()
+        os.chdir(self.directory)
+        for directory in ['Graphs','Logs','CSVs']:
+            os.mkdir(directory)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory)
+
+    def test_deferredRendersAtTheEnd(self):
+        resource = simulatedVNA.register('SIM::PLOTMODES', points=21, sweepTime=0)
+        vna = ttrvna.Ttrvna(start='1 GHz', stop='2 GHz', delay='0s', sParam='S21', trials=2, writers=1,
+                                plotMode='deferred', outputs=('png',), resource=resource)
+        vna.makeSweep()
+        vna.flushOutput()
+        self.assertEqual(os.listdir('Graphs'), [])
+        vna.renderDeferredPlots(processes=1)
+        self.assertEqual(len(os.listdir('Graphs')), 1)
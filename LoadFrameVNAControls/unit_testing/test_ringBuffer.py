@@ -0,0 +1,89 @@
+"""
+test_ringBuffer
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of ringBuffer.py: rows come out in order, the oldest are dropped
+and counted when the consumer falls behind, and close() wakes a waiting
+pop().
+"""
+
+# IMPORTS ===================================================================
+import threading
+import time
+import unittest
+import numpy as np
+import ringBuffer as rb
+
+
+# TESTS =====================================================================
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_inOrder(self):
+        buffer = rb.RingBuffer(4, shape=(2,))
+        for i in range(3):
+            buffer.push([i, -i], timestamp=10.0 + i)
+        self.assertEqual(buffer.unread(), 3)
+        for i in range(3):
+            values, timestamp, sequence = buffer.pop(timeout=0)
+            np.testing.assert_array_equal(values, [i, -i])
+            self.assertEqual((timestamp, sequence), (10.0 + i, i))
+        self.assertIsNone(buffer.pop(timeout=0.01))
+        self.assertEqual(buffer.dropped, 0)
+
+    def test_oldestDropped(self):
+        buffer = rb.RingBuffer(3)
+        for i in range(5):
+            buffer.push(i, timestamp=i)
+        self.assertEqual(buffer.dropped, 2)
+        self.assertEqual(len(buffer), 3)
+        values, timestamps = buffer.snapshot()
+        np.testing.assert_array_equal(values, [2, 3, 4])
+        np.testing.assert_array_equal(timestamps, [2, 3, 4])
+        self.assertEqual(buffer.latest()[2], 4)
+        self.assertEqual([buffer.pop(timeout=0)[2] for _ in range(3)], [2, 3, 4])
+
+    def test_extend(self):
+        buffer = rb.RingBuffer(4)
+        buffer.push(-1, timestamp=0)
+        buffer.extend(np.arange(6), np.arange(6) + 10.0)
+        self.assertEqual((buffer.written, buffer.dropped), (7, 3))
+        values, timestamps = buffer.snapshot()
+        np.testing.assert_array_equal(values, [2, 3, 4, 5])
+        np.testing.assert_array_equal(timestamps, [12, 13, 14, 15])
+        self.assertEqual(buffer.pop(timeout=0)[2], 3)
+
+    def test_popIsACopy(self):
+        buffer = rb.RingBuffer(1, shape=(3,))
+        buffer.push([1, 2, 3])
+        values = buffer.pop(timeout=0)[0]
+        buffer.push([4, 5, 6])
+        np.testing.assert_array_equal(values, [1, 2, 3])
+
+    def test_closeWakesPop(self):
+        buffer = rb.RingBuffer(2)
+        results = []
+        thread = threading.Thread(target=lambda: results.append(buffer.pop()))
+        thread.start()
+        time.sleep(0.05)
+        buffer.close()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results, [None])
+
+    def test_waitFor(self):
+        buffer = rb.RingBuffer(4)
+        self.assertFalse(buffer.waitFor(1, timeout=0.01))
+        threading.Timer(0.02, lambda: [buffer.push(i) for i in range(3)]).start()
+        self.assertTrue(buffer.waitFor(3, timeout=1))
+        buffer.close()
+        self.assertFalse(buffer.waitFor(4))                                 # closed, returns at once
+
+    def test_acrossThreads(self):
+        buffer = rb.RingBuffer(1000)
+        thread = threading.Thread(target=lambda: [buffer.push(i) for i in range(500)])
+        thread.start()
+        popped = [int(buffer.pop(timeout=1)[0]) for _ in range(500)]
+        thread.join()
+        self.assertEqual(popped, list(range(500)))
@@ -0,0 +1,82 @@
+"""
+test_robustStats
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of robustStats.py, and of load measurements that use its estimators
+and stop once precise enough, against arduinoSimulator.py.
+"""
+
+# IMPORTS ===================================================================
+import time
+import unittest
+import numpy as np
+import arduinoSimulator as ard
+import pyLoadControl as lc
+import robustStats as rs
+
+
+# TESTS =====================================================================
+
+class TestEstimate(unittest.TestCase):
+
+    def setUp(self):
+        self.readings = np.random.RandomState(0).normal(10, 0.1, 41)
+        self.spiked = self.readings.copy()
+        self.spiked[[3, 17]] = [1e4, -5e3]                                  # corrupted reads
+
+    def test_mean(self):
+        value, error, count = rs.estimate(self.readings)
+        self.assertAlmostEqual(value, self.readings.mean())
+        self.assertAlmostEqual(error, self.readings.std(ddof=1)/np.sqrt(41))
+        self.assertEqual(count, 41)
+
+    def test_robustToSpikes(self):
+        for method in ['median','trimmed','clipped']:
+            value, error, count = rs.estimate(self.spiked, method)
+            self.assertAlmostEqual(value, 10, delta=0.05, msg=method)
+            self.assertLess(error, 0.05, msg=method)
+        self.assertEqual(rs.estimate(self.spiked, 'clipped')[2], 39)
+        self.assertEqual(rs.estimate(self.spiked, 'trimmed', proportion=0.1)[2], 33)
+        self.assertGreater(abs(rs.estimate(self.spiked)[0] - 10), 100)
+
+    def test_trimmed(self):
+        values = np.arange(10, dtype=np.float64)
+        values[9] = 100
+        self.assertAlmostEqual(rs.trimmedMean(values, proportion=0.1), np.mean(values[1:9]))
+
+    def test_nanIgnored(self):
+        values = np.append(self.readings, [np.nan, np.nan])
+        for method in rs.ESTIMATORS:
+            np.testing.assert_allclose(rs.estimate(values, method), rs.estimate(self.readings, method), err_msg=method)
+
+    def test_alongAnAxis(self):
+        table = np.column_stack((self.readings, self.spiked, self.readings*2))
+        for method in rs.ESTIMATORS:
+            values, errors, counts = rs.estimate(table, method, axis=0)
+            for column in range(3):
+                np.testing.assert_allclose((values[column], errors[column], counts[column]),
+                                            rs.estimate(table[:,column], method), err_msg=method)
+
+    def test_oneReading(self):
+        self.assertEqual(rs.estimate([5.0], 'median'), (5.0, np.inf, 1))
+
+
+@unittest.skipIf(ard.pty is None, "pseudo-terminals are not available on this system")
+class TestPreciseMeasurement(unittest.TestCase):
+
+    def test_stopsWhenPrecise(self):
+        with ard.ArduinoSimulator(stiffness=50, hx711Rate=80, noise=0.05, speed=5, bootTime=0.04) as arduino:
+            ser = arduino.connect(timeout=0.5)
+            ser.readline()
+            ser.timeout = 0.1
+            loadcell = lc.LoadCell(ser)
+            loadcell.startStreaming()
+            loadcell.setEstimator('clipped', precision=0.02, minSamples=4)
+            loadcell.takeMeasurement(200, False, since=time.time(), timeout=5)
+            value, error, used = loadcell.lastEstimate
+            loadcell.stopStreaming()
+            ser.close()
+        self.assertLessEqual(error, 0.02)
+        self.assertIn(used, [4, 8, 16, 32])                                 # doubled until precise, far short of 200
+        self.assertAlmostEqual(value, 0, delta=0.1)
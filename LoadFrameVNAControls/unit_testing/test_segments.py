@@ -0,0 +1,79 @@
+"""
+test_segments
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of segments.py: the planned segments put their points on the
+resonance of simulatedVNA.py, and the VNA sweeps the frequencies of the
+table it is sent.
+"""
+
+# IMPORTS ===================================================================
+import unittest
+import numpy as np
+import segments
+import simulatedVNA
+import ttrvna
+
+
+# Resonance of the simulated VNA in Hz
+RESONANCE = 2.4e9
+
+
+# TESTS =====================================================================
+
+class TestSegmentTable(unittest.TestCase):
+
+    def test_frequenciesAndCommand(self):
+        table = segments.SegmentTable([(1e9, 1.5e9, 3), (2e9, 2e9, 1)])
+        self.assertEqual(table.points, 4)
+        np.testing.assert_array_equal(table.frequencies(), [1e9, 1.25e9, 1.5e9, 2e9])
+        self.assertEqual(table.command(), 'sense1:segment:data 5,0,0,0,0,0,2,1000000000,1500000000,3,2000000000,2000000000,1')
+
+    def test_overlapRefused(self):
+        with self.assertRaises(AssertionError):
+            segments.SegmentTable([(1e9, 2e9, 3), (1.5e9, 2.5e9, 3)])
+
+
+class TestPlanSegments(unittest.TestCase):
+
+    def setUp(self):
+        resource = simulatedVNA.register('SIM::SEGMENTS', points=201, sweepTime=0, noise=0)
+        self.vna = ttrvna.Ttrvna(start='2 GHz', stop='3 GHz', delay='0s', sParam='S21', trials=1, writers=0,
+                                    plotMode='none', outputs=(), resource=resource, points=201)
+        self.vna.setSegments(None)
+        self.sweep = self.vna.makeSweep()
+
+    def densest(self,table):
+        """
+        Gets the middle of the segment with the finest point spacing.
+        """
+        spacing = (table.rows[:,1] - table.rows[:,0])/np.maximum(table.rows[:,2] - 1, 1)
+        start, stop = table.rows[np.argmin(spacing),:2]
+        return (start + stop)/2
+
+    def test_budget(self):
+        table = segments.planSegments(self.sweep.freqDomain, self.sweep.real, budget=101)
+        self.assertEqual(table.points, 101)
+        self.assertEqual(table.rows[0,0], 2e9)
+        self.assertEqual(table.rows[-1,1], 3e9)
+        self.assertLess(abs(self.densest(table) - RESONANCE), 1e9/16)
+        frequencies = table.frequencies()
+        self.assertTrue(np.all(np.diff(frequencies) > 0))
+
+    def test_resolution(self):
+        table = segments.planSegments(self.sweep.freqDomain, self.sweep.real, resolution=1e6)
+        spacing = np.diff(table.frequencies())
+        self.assertLessEqual(spacing.min(), 1e6)
+        self.assertLess(table.points, 1001)                                 # 1 MHz everywhere would take 1001
+        self.assertLess(abs(self.densest(table) - RESONANCE), 1e9/16)
+
+    def test_segmentedSweep(self):
+        table = segments.planSegments(self.sweep.freqDomain, self.sweep.real, budget=101)
+        self.vna.setSegments(table)
+        sweep = self.vna.makeSweep()
+        np.testing.assert_allclose(sweep.freqDomain, table.frequencies(), rtol=0, atol=1)
+        self.assertEqual(sweep.points, 101)
+        self.vna.setSegments(None)
+        self.assertEqual(self.vna.makeSweep().points, 201)
+        self.assertEqual(self.vna._instr._resource.errors, [])
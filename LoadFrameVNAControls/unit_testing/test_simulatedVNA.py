@@ -0,0 +1,67 @@
+"""
+test_simulatedVNA
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of simulatedVNA.py on its own: the SCPI it answers, the error queue,
+the time a sweep takes, and the data it sends in each format.
+"""
+
+# IMPORTS ===================================================================
+import time
+import unittest
+import numpy as np
+import simulatedVNA
+
+
+# TESTS =====================================================================
+
+class TestSimulatedTtr506a(unittest.TestCase):
+
+    def setUp(self):
+        self.simulator = simulatedVNA.SimulatedTtr506a(points=101, sweepTime=0.05, noise=0)
+        self.simulator.write('initiate1:continuous off;sense1:frequency:start 2.3e9;sense1:frequency:stop 2.5e9')
+
+    def trace(self,format):
+        self.simulator.write('calculate1:selected:format %s;initiate:immediate' % format)
+        self.simulator.query('*opc?')
+        values = np.array(self.simulator.query_ascii_values('calculate1:selected:data:fdata?'))
+        return values[0::2], values[1::2]
+
+    def test_errorQueue(self):
+        self.assertEqual(self.simulator.query('*idn?'), simulatedVNA.IDENTITY)
+        self.simulator.write('sense1:bogus 1')
+        self.assertEqual(self.simulator.errors, ['-113,"Undefined header; sense1:bogus 1"'])
+        self.assertEqual(self.simulator.query('system:error?'), '-113,"Undefined header; sense1:bogus 1"')
+        self.assertEqual(self.simulator.query('system:error?'), '0,"No error"')
+        with self.assertRaises(IOError):
+            self.simulator.read()
+
+    def test_sweepTakesSweepTime(self):
+        self.simulator.write('*ese 1;initiate:immediate;*opc')
+        self.assertEqual(self.simulator.query('*esr?'), '0')
+        start = time.perf_counter()
+        self.simulator.query('*opc?')
+        self.assertGreater(time.perf_counter() - start, 0.03)
+        self.assertEqual(self.simulator.query('*esr?'), '1')
+
+    def test_binaryBlocks(self):
+        self.simulator.write('calculate1:parameter1:define S21;format:border normal;format:data real32')
+        values = self.simulator.query_binary_values('sense1:frequency:data?', datatype='f', is_big_endian=True,
+                                                        container=np.array)
+        np.testing.assert_allclose(values, np.linspace(2.3e9, 2.5e9, 101), rtol=1e-7)
+
+    def test_formats(self):
+        self.simulator.write('calculate1:parameter1:define S21')
+        dB = self.trace('mlogarithmic')[0]
+        self.assertAlmostEqual(dB.min(), -30, delta=0.1)                    # notch depth at the resonance
+        self.assertAlmostEqual(np.linspace(2.3e9, 2.5e9, 101)[np.argmin(dB)], 2.4e9)
+        real, imag = self.trace('scomplex')
+        np.testing.assert_allclose(20*np.log10(np.hypot(real, imag)), dB)
+        for format in ['polar','slinear','slogarithmic','smith','sadmittance','plinear','plogarithmic']:
+            np.testing.assert_array_equal(self.trace(format), (real, imag), err_msg=format)
+
+    def test_resetRestoresDefaults(self):
+        self.simulator.write('sense1:sweep:points 11;*rst')
+        self.assertEqual(self.simulator.settings['points'], 101)
+        self.assertTrue(self.simulator.settings['continuous'])
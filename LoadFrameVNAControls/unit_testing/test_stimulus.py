@@ -0,0 +1,40 @@
+"""
+test_stimulus
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of the frequencies Ttrvna gives its sweeps: they are read from
+simulatedVNA.py, only again when the sweep settings change.
+"""
+
+# IMPORTS ===================================================================
+import unittest
+import numpy as np
+import simulatedVNA
+import ttrvna
+
+
+# TESTS =====================================================================
+
+class TestStimulus(unittest.TestCase):
+
+    def setUp(self):
+        resource = simulatedVNA.register('SIM::STIMULUS', points=101, sweepTime=0)
+        self.vna = ttrvna.Ttrvna(start='1 GHz', stop='1.000001 GHz', delay='0s', sParam='S21', trials=1,
+                                    transfer='real32', writers=0, plotMode='none', outputs=(), resource=resource, points=101)
+
+    def test_readFromTheVna(self):
+        sweep = self.vna.makeSweep()
+        np.testing.assert_allclose(sweep.freqDomain, np.linspace(1e9, 1.000001e9, 101), rtol=0, atol=1)   # float32 is 64 Hz apart here
+        self.assertFalse(sweep.freqDomain.flags.writeable)
+
+    def test_queriedOnlyWhenSettingsChange(self):
+        first = self.vna.makeSweep()
+        second = self.vna.makeSweep()
+        self.assertIs(second.freqDomain, first.freqDomain)
+        self.vna.setSweepDelay('0.001s')
+        self.assertIs(self.vna.makeSweep().freqDomain, first.freqDomain)
+        self.vna.setStopSweep('2 GHz')
+        self.vna.setPoints(11)
+        third = self.vna.makeSweep()
+        np.testing.assert_array_equal(third.freqDomain, np.linspace(1e9, 2e9, 11))
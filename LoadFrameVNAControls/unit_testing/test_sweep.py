@@ -0,0 +1,63 @@
+"""
+test_sweep
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of sweep.py: the complex view shares the buffer the VNA sent, and
+the logs and csvs are written from it.
+"""
+
+# IMPORTS ===================================================================
+import os
+import tempfile
+import unittest
+import numpy as np
+import simulatedVNA
+import sweep as sw
+import ttrvna
+
+
+# TESTS =====================================================================
+
+class TestSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.values = np.arange(10, dtype=np.float64)
+        self.sweep = sw.Sweep(self.values,'polar','S21',1,np.linspace(1e9,2e9,5))
+
+    def test_noCopies(self):
+        self.assertTrue(np.shares_memory(self.sweep.values, self.values))
+        self.assertTrue(np.shares_memory(self.sweep.complex, self.values))
+        self.assertTrue(np.shares_memory(self.sweep.real, self.values))
+        np.testing.assert_array_equal(self.sweep.complex, [0+1j, 2+3j, 4+5j, 6+7j, 8+9j])
+        np.testing.assert_array_equal(self.sweep.imag, [1, 3, 5, 7, 9])
+        self.assertEqual(self.sweep.points, 5)
+
+    def test_magnitudeAndPhase(self):
+        np.testing.assert_allclose(self.sweep.magnitude, np.abs(self.sweep.complex))
+        np.testing.assert_allclose(self.sweep.phase, np.angle(self.sweep.complex, deg=True))
+
+    def test_csvAndLog(self):
+        with tempfile.TemporaryDirectory() as directory:
+            csvName = os.path.join(directory,'sweep.csv')
+            logName = os.path.join(directory,'sweep.txt')
+            self.sweep.writeCsv(csvName)
+            self.sweep.writeLog(logName)
+            table = np.loadtxt(csvName, delimiter=',')
+            with open(logName) as f:
+                lines = f.read().splitlines()
+        np.testing.assert_array_equal(table, np.column_stack((self.sweep.freqDomain,self.sweep.real,self.sweep.imag)))
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[1].split('\t')[1:], ['2.0', '3.0'])
+
+
+class TestTtrvnaSweep(unittest.TestCase):
+
+    def test_componentsOfTheSimulatedTrace(self):
+        resource = simulatedVNA.register('SIM::SWEEP', points=51, sweepTime=0, noise=0)
+        vna = ttrvna.Ttrvna(start='2 GHz', stop='3 GHz', delay='0s', sParam='S21', trials=1, format='scomplex',
+                                writers=0, plotMode='none', outputs=(), resource=resource)
+        sweep = vna.makeSweep()
+        simulator = vna._instr._resource
+        expected = simulator._sParameter('S21', sweep.freqDomain, simulator.sweeps)
+        np.testing.assert_allclose(sweep.complex, expected, rtol=1e-12)
@@ -0,0 +1,119 @@
+"""
+test_sweepStats
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of sweepStats.py: the running statistics match NumPy over the same
+sweeps, and Ttrvna.makeSweepAveraged averages the noise of simulatedVNA.py
+away.
+"""
+
+# IMPORTS ===================================================================
+import unittest
+import numpy as np
+import simulatedVNA
+import sweep as sw
+import sweepStats
+import ttrvna
+
+
+# HELPER FUNCTIONS ==========================================================
+
+def makeSweeps(values,format):
+    """
+    Makes a sweep of every row of values, complex rows as two components.
+
+    Return: list of Sweep
+    """
+    sweeps = []
+    for row in values:
+        interleaved = np.zeros(2*len(row))
+        interleaved[0::2] = row.real
+        interleaved[1::2] = row.imag
+        sweeps.append(sw.Sweep(interleaved,format,'S21',1,np.arange(len(row))))
+    return sweeps
+
+
+# TESTS =====================================================================
+
+class TestSweepAccumulator(unittest.TestCase):
+
+    def setUp(self):
+        random = np.random.RandomState(0)
+        self.real = random.standard_normal((20, 7))
+        self.complex = self.real + 1j*random.standard_normal((20, 7))
+
+    def accumulate(self,values,format):
+        accumulator = sweepStats.SweepAccumulator()
+        for sweep in makeSweeps(values,format):
+            accumulator.add(sweep)
+        return accumulator
+
+    def test_matchesNumpy(self):
+        for values, format in ((self.real,'mlogarithmic'), (self.complex,'scomplex')):
+            accumulator = self.accumulate(values,format)
+            self.assertEqual(accumulator.count, 20)
+            np.testing.assert_allclose(accumulator.mean, values.mean(axis=0), err_msg=format)
+            np.testing.assert_allclose(accumulator.variance, np.var(values, axis=0, ddof=1), err_msg=format)
+            np.testing.assert_allclose(accumulator.standardError, np.std(values, axis=0, ddof=1)/np.sqrt(20))
+            np.testing.assert_allclose(accumulator.minimum, np.abs(values).min(axis=0) if format == 'scomplex'
+                                                                else values.min(axis=0))
+
+    def test_meanSweepKeepsTheFormat(self):
+        accumulator = self.accumulate(self.complex,'polar')
+        mean = accumulator.sweep(trial=4)
+        self.assertEqual((mean.format, mean.sParam, mean.trial), ('polar', 'S21', 4))
+        np.testing.assert_allclose(mean.complex, self.complex.mean(axis=0))
+
+    def test_componentsAveragedApart(self):
+        decibels = self.real - 20
+        degrees = 90*self.complex.imag
+        accumulator = self.accumulate(decibels + 1j*degrees,'slogarithmic')
+        self.assertFalse(accumulator.isComplex())
+        for column, values in enumerate((decibels, degrees)):
+            np.testing.assert_allclose(accumulator.mean[:,column], values.mean(axis=0))
+            np.testing.assert_allclose(accumulator.variance[:,column], np.var(values, axis=0, ddof=1))
+            np.testing.assert_allclose(accumulator.minimum[:,column], values.min(axis=0))
+            np.testing.assert_allclose(accumulator.maximum[:,column], values.max(axis=0))
+        mean = accumulator.sweep()
+        np.testing.assert_allclose(mean.real, decibels.mean(axis=0))
+        np.testing.assert_allclose(mean.imag, degrees.mean(axis=0))
+        self.assertTrue(accumulator.converged(1000))
+        self.assertFalse(accumulator.converged(1))                          # the degrees spread by ~90
+
+    def test_converged(self):
+        accumulator = self.accumulate(self.real[:2],'mlogarithmic')
+        self.assertFalse(accumulator.converged(100))                        # fewer than minSweeps
+        accumulator = self.accumulate(self.real,'mlogarithmic')
+        self.assertTrue(accumulator.converged(100))
+        self.assertFalse(accumulator.converged(0.01))
+
+    def test_formatsNotMixed(self):
+        accumulator = self.accumulate(self.real[:1],'mlogarithmic')
+        with self.assertRaises(AssertionError):
+            accumulator.add(makeSweeps(self.real[:1],'mlinear')[0])
+
+
+class TestMakeSweepAveraged(unittest.TestCase):
+
+    def setUp(self):
+        resource = simulatedVNA.register('SIM::AVERAGED', points=51, sweepTime=0, noise=0.01)
+        self.vna = ttrvna.Ttrvna(start='2.3 GHz', stop='2.5 GHz', delay='0s', sParam='S21', trials=1, format='scomplex',
+                                    writers=0, plotMode='none', outputs=(), resource=resource, points=51)
+        self.simulator = self.vna._instr._resource
+
+    def test_noiseAveragedAway(self):
+        mean = self.vna.makeSweepAveraged(100)
+        self.assertEqual(self.vna.accumulator.count, 100)
+        self.simulator.noise = 0
+        exact = self.simulator._sParameter('S21', mean.freqDomain, 0)
+        self.simulator.noise = 0.01
+        error = np.abs(mean.complex - exact)
+        self.assertLess(error.max(), 0.01)                                  # a single sweep is off by ~0.014 on average
+        self.assertEqual(mean.trial, 1)
+
+    def test_stopsAtTolerance(self):
+        self.vna.makeSweepAveraged(1000, tolerance=0.005)
+        count = self.vna.accumulator.count
+        self.assertLess(count, 1000)
+        self.assertTrue(np.all(self.vna.accumulator.halfWidth() <= 0.005))
@@ -0,0 +1,127 @@
+"""
+test_sweepStore
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of sweepStore.py: a run read back by StoredRun is the run that was
+stored, and a store is never written over.
+"""
+
+# IMPORTS ===================================================================
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import sweep as sw
+import sweepStore as ss
+
+
+def makeSweep(trial,format='mlogarithmic',sParam='S21',points=11):
+    """
+    Makes a sweep with known values.
+
+    Return: Sweep
+    """
+    values = np.arange(2*points, dtype=np.float64) + 100*trial
+    sweep = sw.Sweep(values,format,sParam,trial,np.linspace(1e9, 2e9, points))
+    sweep.timestamp = datetime.datetime(2026, 10, 17, 12, 0, 0, trial)
+    return sweep
+
+
+# TESTS =====================================================================
+
+class TestRawStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'run')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_roundTrip(self):
+        store = ss.SweepStore(self.filename,'mlogarithmic','raw',{'start':'1 GHz'})
+        stored = [makeSweep(trial) for trial in range(1, 6)]
+        for sweep in stored:
+            store.append(sweep)
+        store.close()
+
+        run = ss.StoredRun(self.filename)
+        self.assertEqual(run.sParams, ['S21'])
+        self.assertEqual(run.attributes['start'], '1 GHz')
+        self.assertEqual(run.data('S21').shape, (5, 11))
+        self.assertEqual(list(run.column('S21','trial')), [1, 2, 3, 4, 5])
+        self.assertEqual(list(run.column('S21','freqIndex')), [0]*5)
+        for original, read in zip(stored, run.sweeps('S21')):
+            np.testing.assert_array_equal(read.real, original.real)
+            np.testing.assert_array_equal(read.freqDomain, original.freqDomain)
+            self.assertEqual(read.timestamp, original.timestamp)
+        run.close()
+
+    def test_complexRoundTrip(self):
+        store = ss.SweepStore(self.filename,'smith','raw')
+        original = makeSweep(1,'smith','S11')
+        store.append(original)
+        store.close()
+        read = next(ss.StoredRun(self.filename).sweeps('S11'))
+        np.testing.assert_array_equal(read.complex, original.complex)
+
+    def test_readableWhileOpen(self):
+        store = ss.SweepStore(self.filename,'mlogarithmic','raw')
+        store.append(makeSweep(1))
+        store.append(makeSweep(2))
+        self.assertEqual(list(ss.StoredRun(self.filename).column('S21','trial')), [1, 2])
+        store.close()
+
+    def test_metaNotRewrittenPerSweep(self):
+        store = ss.SweepStore(self.filename,'mlogarithmic','raw')
+        store.append(makeSweep(1))
+        meta = os.path.join(self.filename, 'meta.json')
+        written = os.stat(meta).st_mtime_ns
+        size = os.path.getsize(meta)
+        for trial in range(2, 50):
+            store.append(makeSweep(trial))
+        self.assertEqual(os.stat(meta).st_mtime_ns, written)
+        self.assertEqual(os.path.getsize(meta), size)
+        store.close()
+
+    def test_neverWrittenOver(self):
+        ss.SweepStore(self.filename,'mlogarithmic','raw').close()
+        with self.assertRaises(FileExistsError):
+            ss.SweepStore(self.filename,'mlogarithmic','raw')
+
+    @unittest.skipIf(ss.h5py is None, "h5py is not installed")
+    def test_hdf5NeverWrittenOver(self):
+        ss.SweepStore(self.filename,'mlogarithmic','hdf5').close()
+        with self.assertRaises(OSError):
+            ss.SweepStore(self.filename,'mlogarithmic','hdf5')
+
+
+class TestRunStoreNames(unittest.TestCase):
+    """
+    Runs started within the same second used to share a store name.
+    """
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.mkdtemp()
+        os.chdir(self.directory)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory)
+
+    def test_runsInTheSameSecond(self):
+        import simulatedVNA
+        import ttrvna
+        resource = simulatedVNA.register('SIM::STORE_NAMES', points=21, sweepTime=0)
+        for _ in range(3):
+            vna = ttrvna.Ttrvna(start='1 GHz', stop='2 GHz', delay='0s', sParam='S21', trials=2, writers=0,
+                                plotMode='none', store='raw', outputs=(), resource=resource)
+            vna.run()
+        names = os.listdir('Runs')
+        self.assertEqual(len(names), 3)
+        for name in names:
+            self.assertEqual(list(ss.StoredRun(os.path.join('Runs', name)).column('S21','trial')), [1, 2])
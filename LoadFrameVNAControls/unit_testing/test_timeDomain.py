@@ -0,0 +1,100 @@
+"""
+test_timeDomain
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of timeDomain.py: reflections show up at their delay, a gate keeps
+only the one inside it, and sweeps of simulatedVNA.py are transformed
+through Ttrvna.timeDomain.
+"""
+
+# IMPORTS ===================================================================
+import unittest
+import numpy as np
+import simulatedVNA
+import sweep as sw
+import timeDomain as td
+import ttrvna
+
+
+# HELPER FUNCTIONS ==========================================================
+
+def makeSweep(values,freqDomain,format='scomplex'):
+    """
+    Makes a sweep of complex values.
+
+    Return: Sweep
+    """
+    interleaved = np.empty(2*len(values))
+    interleaved[0::2] = values.real
+    interleaved[1::2] = values.imag
+    return sw.Sweep(interleaved,format,'S11',1,freqDomain)
+
+
+# TESTS =====================================================================
+
+class TestFastLength(unittest.TestCase):
+
+    def test_smallestWithFactors235(self):
+        def smooth(n):
+            for factor in (2, 3, 5):
+                while n % factor == 0:
+                    n //= factor
+            return n == 1
+        for n in range(1, 500):
+            length = td.fastLength(n)
+            self.assertEqual(length, min(m for m in range(n, 2*n + 1) if smooth(m)), n)
+
+
+class TestTimeDomain(unittest.TestCase):
+
+    def setUp(self):
+        self.freqDomain = np.linspace(1e9, 3e9, 201)                       # 10 MHz apart, 100 ns of response
+        self.timeDomain = td.TimeDomain()
+
+    def reflection(self,delay,size=1.0):
+        return size*np.exp(-2j*np.pi*self.freqDomain*delay)
+
+    def test_flatPeaksAtZero(self):
+        times, response = self.timeDomain.transform(makeSweep(np.ones(201, dtype=np.complex128),self.freqDomain))
+        self.assertEqual(np.argmax(np.abs(response)), 0)
+        self.assertAlmostEqual(abs(response[0]), 1)
+        self.assertEqual(len(times), self.timeDomain.fftLength(201))
+        self.assertAlmostEqual(times[1]*len(times), 100e-9)
+
+    def test_peakAtTheDelay(self):
+        times, response = self.timeDomain.transform(makeSweep(self.reflection(12e-9, 0.5),self.freqDomain))
+        peak = np.argmax(np.abs(response))
+        self.assertLess(abs(times[peak] - 12e-9), times[1])
+        self.assertAlmostEqual(abs(response[peak]), 0.5, delta=0.02)
+
+    def test_gateKeepsOneReflection(self):
+        near, far = self.reflection(5e-9, 0.5), self.reflection(40e-9, 0.2)
+        gated = self.timeDomain.gate(makeSweep(near + far,self.freqDomain),0,20e-9)
+        self.assertEqual((gated.format, gated.points), ('scomplex', 201))
+        middle = slice(20, -20)                                             # the gate smears the edges of the span
+        np.testing.assert_allclose(gated.complex[middle], near[middle], rtol=0, atol=0.02)
+
+    def test_cachedPerPoints(self):
+        self.assertIs(self.timeDomain.windowFor(201), self.timeDomain.windowFor(201))
+        self.assertFalse(self.timeDomain.windowFor(201).flags.writeable)
+
+    def test_refusesUnverifiedFormats(self):
+        with self.assertRaises(ValueError):
+            self.timeDomain.transform(makeSweep(np.ones(201, dtype=np.complex128),self.freqDomain,'slinear'))
+
+
+class TestTtrvnaTimeDomain(unittest.TestCase):
+
+    def test_simulatedSweep(self):
+        resource = simulatedVNA.register('SIM::TIMEDOMAIN', points=201, sweepTime=0, noise=0)
+        vna = ttrvna.Ttrvna(start='2 GHz', stop='3 GHz', delay='0s', sParam='S21', trials=1, format='polar',
+                                writers=0, plotMode='none', outputs=(), resource=resource, points=201)
+        sweep = vna.makeSweep()
+        times, response = vna.timeDomain.transform(sweep)
+        self.assertEqual(np.argmax(np.abs(response)), 0)                    # S21 is mostly through, no delay
+        gated = np.abs(vna.timeDomain.gate(sweep, 3e-9, times[-1]*0.9).complex)       # past the through, only the
+        self.assertEqual(sweep.freqDomain[np.argmax(gated)], 2.4e9)                   # ringing of the resonance is left
+        self.assertGreater(gated.max(), 0.5)
+        offResonance = np.abs(sweep.freqDomain - 2.4e9) > 50e6
+        self.assertLess(gated[20:-20][offResonance[20:-20]].max(), 0.05)
@@ -0,0 +1,95 @@
+"""
+test_touchstone
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of touchstone.py: the complex S parameter is only taken from the
+formats whose components are known to be real and imaginary, and the
+files written read back as the values of the sweeps.
+"""
+
+# IMPORTS ===================================================================
+import csv
+import os
+import tempfile
+import unittest
+import numpy as np
+import sweep as sw
+import touchstone as ts
+
+
+# HELPER FUNCTIONS ==========================================================
+
+def makeSweep(values,format,sParam='S21'):
+    """
+    Makes a sweep of complex values in a two component format.
+
+    Return: Sweep
+    """
+    interleaved = np.empty(2*len(values))
+    interleaved[0::2] = values.real
+    interleaved[1::2] = values.imag
+    return sw.Sweep(interleaved,format,sParam,1,np.linspace(1e9,2e9,len(values)))
+
+
+# TESTS =====================================================================
+
+class TestComplexFormats(unittest.TestCase):
+
+    def setUp(self):
+        self.values = np.exp(1j*np.linspace(0,6,11))*np.linspace(0.1,0.9,11)
+
+    def test_realImaginaryRoundTrip(self):
+        for format in ts.COMPLEX_FORMATS:
+            np.testing.assert_allclose(ts.complexFromSweep(makeSweep(self.values,format)), self.values)
+            first, second = ts.componentsFromComplex(self.values,format)
+            np.testing.assert_allclose(first + 1j*second, self.values)
+
+    def test_refusesUnverifiedFormats(self):
+        for format in ['slinear','slogarithmic','plinear','plogarithmic','smith','sadmittance']:
+            with self.assertRaises(ValueError, msg=format):
+                ts.complexFromSweep(makeSweep(self.values,format))
+            with self.assertRaises(ValueError, msg=format):
+                ts.componentsFromComplex(self.values,format)
+
+
+class TestWriteTouchstone(unittest.TestCase):
+
+    def test_s1pReadsBack(self):
+        values = np.exp(1j*np.linspace(0,3,5))*0.5
+        sweep = makeSweep(values,'polar')
+        with tempfile.TemporaryDirectory() as directory:
+            filename = ts.writeTouchstone(os.path.join(directory,'test'),{'S21':sweep},form='RI')
+            self.assertTrue(filename.endswith('.s1p'))
+            with open(filename) as file:
+                rows = [line.split() for line in file if line.strip() and line[0] not in '!#']
+        data = np.array(rows, dtype=np.float64)
+        np.testing.assert_allclose(data[:,0], sweep.freqDomain)
+        np.testing.assert_allclose(data[:,1] + 1j*data[:,2], values)
+
+    def test_s2pMagnitudeAngle(self):
+        values = {param: np.exp(1j*np.linspace(0,3,5))*scale for param, scale in zip(ts.S2P_ORDER, [0.1,0.2,0.3,0.4])}
+        sweeps = {param: makeSweep(values[param],'scomplex',param) for param in ts.S2P_ORDER}
+        with tempfile.TemporaryDirectory() as directory:
+            filename = ts.writeTouchstone(os.path.join(directory,'test'),sweeps,form='MA')
+            self.assertTrue(filename.endswith('.s2p'))
+            data = np.loadtxt(filename, comments=['!','#'])
+        for column, param in enumerate(ts.S2P_ORDER):
+            magnitude, angle = data[:,1+2*column], data[:,2+2*column]
+            np.testing.assert_allclose(magnitude*np.exp(1j*np.deg2rad(angle)), values[param], err_msg=param)
+
+
+class TestTouchstoneSeries(unittest.TestCase):
+
+    def test_indexListsEveryStep(self):
+        sweep = makeSweep(np.ones(3, dtype=np.complex128),'polar')
+        with tempfile.TemporaryDirectory() as directory:
+            series = ts.TouchstoneSeries(directory,'run',columns=['force'])
+            names = [series.write(sweep,force=force) for force in [1.5, 2.5]]
+            with open(os.path.join(directory,'run_index.csv')) as csvfile:
+                rows = list(csv.reader(csvfile))
+            self.assertEqual(sorted(os.listdir(directory)), ['run_0001.s1p','run_0002.s1p','run_index.csv'])
+        self.assertEqual(rows[0], ['step','file','trial','timestamp','force'])
+        self.assertEqual([row[:3] + row[4:] for row in rows[1:]], [['1','run_0001.s1p','1','1.5'],
+                                                                    ['2','run_0002.s1p','1','2.5']])
+        self.assertEqual([os.path.basename(name) for name in names], ['run_0001.s1p','run_0002.s1p'])
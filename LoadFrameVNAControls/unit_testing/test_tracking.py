@@ -0,0 +1,51 @@
+"""
+test_tracking
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of tracking.py: the resonance of simulatedVNA.py is found in every
+format the tracker accepts.
+"""
+
+# IMPORTS ===================================================================
+import unittest
+import numpy as np
+import simulatedVNA
+import tracking
+import ttrvna
+
+
+# Resonance of the simulated VNA in Hz
+RESONANCE = 2.4e9
+
+
+# TESTS =====================================================================
+
+class TestFindFeature(unittest.TestCase):
+
+    def test_fitsBetweenPoints(self):
+        freqDomain = np.arange(11, dtype=np.float64)
+        values = (freqDomain - 4.3)**2
+        frequency, value, index = tracking.findFeature(freqDomain, values, 'notch')
+        self.assertEqual(index, 4)
+        self.assertAlmostEqual(frequency, 4.3)
+        self.assertAlmostEqual(value, 0)
+
+
+class TestResonanceTracker(unittest.TestCase):
+
+    def makeVna(self,format):
+        resource = simulatedVNA.register('SIM::TRACKING_' + format, points=201, sweepTime=0, noise=0)
+        return ttrvna.Ttrvna(start='2 GHz', stop='3 GHz', delay='0s', sParam='S21', trials=1, format=format,
+                                writers=0, plotMode='none', outputs=(), resource=resource, points=201)
+
+    def test_formats(self):
+        for format in ['mlogarithmic','mlinear','polar','scomplex']:
+            tracker = tracking.ResonanceTracker(self.makeVna(format), kind='notch', span='50 MHz', points=101)
+            frequencies = tracker.run(3)
+            np.testing.assert_allclose(frequencies, RESONANCE, rtol=0, atol=0.5e6, err_msg=format)
+
+    def test_refusesUnconvertibleFormats(self):
+        for format in ['slinear','slogarithmic','plinear','plogarithmic','smith','sadmittance']:
+            with self.assertRaises(ValueError, msg=format):
+                tracking.ResonanceTracker(self.makeVna(format))
@@ -0,0 +1,40 @@
+"""
+test_transfer
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of how Ttrvna reads traces (transfer='real64', 'real32' or 'ascii')
+against simulatedVNA.py, which answers in the format:data and
+format:border it was sent.
+"""
+
+# IMPORTS ===================================================================
+import unittest
+import numpy as np
+import simulatedVNA
+import ttrvna
+
+
+# TESTS =====================================================================
+
+class TestTransfer(unittest.TestCase):
+
+    def makeSweep(self,transfer,format):
+        resource = simulatedVNA.register('SIM::TRANSFER_%s_%s' % (transfer, format), points=101, sweepTime=0, noise=0)
+        vna = ttrvna.Ttrvna(start='2 GHz', stop='3 GHz', delay='0s', sParam='S21', trials=1, format=format,
+                                transfer=transfer, writers=0, plotMode='none', outputs=(), resource=resource)
+        return vna, vna.makeSweep()
+
+    def test_modesAgree(self):
+        for format in ['mlogarithmic','polar']:
+            reference = self.makeSweep('real64',format)[1]
+            self.assertEqual(reference.points, 101)
+            self.assertEqual(reference.values.dtype, np.float64)
+            for transfer, rtol in (('real32',1e-6), ('ascii',1e-10)):
+                sweep = self.makeSweep(transfer,format)[1]
+                np.testing.assert_allclose(sweep.values, reference.values, rtol=rtol, err_msg=transfer)
+
+    def test_real32SendsSinglePrecision(self):
+        vna, sweep = self.makeSweep('real32','mlogarithmic')
+        np.testing.assert_array_equal(sweep.values, sweep.values.astype(np.float32))
+        self.assertEqual(vna._instr._resource.errors, [])
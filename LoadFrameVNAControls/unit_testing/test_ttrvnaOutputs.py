@@ -0,0 +1,78 @@
+"""
+test_ttrvnaOutputs
+Created: 10/17/2026
+Python 3.6.0 64-bit (Anaconda 4.3.0)
+
+Tests of the files Ttrvna writes per sweep, run against simulatedVNA.py
+in a temporary directory.
+"""
+
+# IMPORTS ===================================================================
+import os
+import shutil
+import tempfile
+import unittest
+import simulatedVNA
+import sweepStore
+import ttrvna
+
+
+# Directories the per sweep files are written to
+DIRECTORIES = ['Graphs','Logs','CSVs','Touchstone','Runs']
+
+
+# TESTS =====================================================================
+
+class TestOutputs(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.mkdtemp()
+        os.chdir(self.directory)
+        for directory in DIRECTORIES:
+            os.mkdir(directory)
+        self.resource = simulatedVNA.register('SIM::OUTPUTS', points=21, sweepTime=0)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory)
+
+    def makeVna(self,**settings):
+        options = dict(start='1 GHz', stop='2 GHz', delay='0s', sParam='S21', trials=10, format='polar', writers=0,
+                        plotMode='new', outputs=('png','txt','csv','snp'), resource=self.resource)
+        options.update(settings)
+        return ttrvna.Ttrvna(**options)
+
+    def test_writesInlineByDefault(self):
+        vna = ttrvna.Ttrvna(start='1 GHz', stop='2 GHz', delay='0s', sParam='S21', trials=1, plotMode='none',
+                            outputs=('csv',), resource=self.resource)
+        self.assertIsNone(vna._output)
+        shutil.rmtree('CSVs')
+        with self.assertRaises(OSError):                                    # fails the sweep, not a later flush
+            vna.makeSweep()
+
+    def test_sweepsInTheSameSecond(self):
+        self.makeVna().run()                                                # 10 sweeps take well under a second
+        for directory in ['Graphs','Logs','CSVs','Touchstone']:
+            self.assertEqual(len(os.listdir(directory)), 10, directory)
+        for name in os.listdir('CSVs'):
+            with open(os.path.join('CSVs', name)) as f:
+                self.assertEqual(len(f.read().splitlines()), 21)    # one sweep per file, not several appended
+
+    def test_filenamesHaveTheTrial(self):
+        self.makeVna(trials=3).run()
+        trials = sorted(name.split('_trial')[1] for name in os.listdir('Logs'))
+        self.assertEqual(trials, ['1_S21.txt', '2_S21.txt', '3_S21.txt'])
+
+    def test_multiSweepWritesEveryParameter(self):
+        vna = self.makeVna(store='raw')
+        sweeps = vna.makeSweepMulti(('S11','S21'))
+        vna.closeStore()
+        self.assertIs(vna._sweep, sweeps['S11'])
+        for directory in ['Graphs','Logs','CSVs','Touchstone']:
+            names = sorted(os.listdir(directory))
+            self.assertEqual(len(names), 2, directory)
+            self.assertIn('_trial1_S11', names[0])
+            self.assertIn('_trial1_S21', names[1])
+        run = os.listdir('Runs')[0]
+        self.assertEqual(sorted(sweepStore.StoredRun(os.path.join('Runs', run)).sParams), ['S11','S21'])
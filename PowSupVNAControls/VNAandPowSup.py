@@ -97,7 +97,6 @@ class PowSupVNA(object):
         Runs trials, collects data into _runData
         as a list with format [voltages,[[frequency],[range]]]
         """
-        self._vna.makeSweepUnprocessed()   # run dud trial here
         print('Beginning Data Collection')
         time.sleep(10)
 
@@ -123,7 +122,6 @@ class PowSupVNA(object):
         designated by the user. Then processes and records data in
         ._processData().
         """
-        self._vna.makeSweepUnprocessed()
         print('Beginning Data Collection')
 
         vnaData = []
@@ -164,7 +162,6 @@ class PowSupVNA(object):
         Sweeps from -15V to 15V by self._voltageStep. Meant to be
         used in conjunction with plotFreqSpecific.
         """
-        self._vna.makeSweepUnprocessed()
         print('Beginning Data Collection')
 
         vnaData = []
@@ -16,11 +16,16 @@ the VNA in conjunction with a Power Supply.
 """
 
 # IMPORTS ===================================================================
-import visa
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 import time
 import csv
+
+# instrument.py (Instrument, BatchedSession, and the session pool) is the one in
+# ../LoadFrameVNAControls, appended so the modules of this folder still come first
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'LoadFrameVNAControls'))
 import instrument as instr
 
 # Ttrvna ===============================================================
@@ -31,7 +36,7 @@ class Ttrvna(instr.Instrument):
     TTR506A VNA where the user may set up an automated design of experiment.
 
     Attributes:
-        _rm                 : ResourceManager   : instance of visa's Resource Manager class
+        _rm                 : ResourceManager   : visa's Resource Manager, shared by every instrument (see instrument.py), None if simulated
         _instr              : Resource          : instrument, TTR506A VNA in this case
         startFreqSweep      : str as SI unit    : determines start frequency for frequency sweep
         stopFreqSweep       : str as SI unit    : determines stop frequency for frequency sweep
@@ -42,10 +47,11 @@ class Ttrvna(instr.Instrument):
         _measuredRange      : list of ints      : y values for the eventual output, usually s parameter
         _freqDomain         : list of ints      : x values in frequency for the eventual output
         _trial              : int               : current trial number
+        resource            : str               : VISA resource name of the VNA
     """
 
 
-    def __init__(self,start=None,stop=None,delay=None,sParam=None,trials=None,format='mlogarithmic'):
+    def __init__(self,start=None,stop=None,delay=None,sParam=None,trials=None,format='mlogarithmic',resource='GPIB8::1::INSTR'):
         """
         Constructor that initializes attributes of Ttrvna instance.
         By default the data format is 'mlogarithmic'.
@@ -57,9 +63,11 @@ class Ttrvna(instr.Instrument):
                 sParam      : str               : determines which S Parameter is measured
                 trials      : int > 0           : determines the number of trials/sweeps
                 format      : str               : determines format for the data to be outputted into
+                resource    : str               : VISA resource name of the VNA
         """
-        self._rm = visa.ResourceManager()
-        self._instr = self._rm.open_resource('GPIB8::1::INSTR')
+        self._rm = None if instr.isSimulated(resource) else instr.getResourceManager()
+        self._instr = instr.openSession(resource)     # same session as any other instance on this resource
+        self.resource = resource
 
         if start is not None:
             self.setStartSweep(start)
@@ -156,10 +164,6 @@ class Ttrvna(instr.Instrument):
 
         self._initDataAcquisition()
 
-        self._instr.write('calculate1:parameter1:define {}'.format(self.sParam))
-        time.sleep(1)       # delay sometimes needed to ensure commands are used in sequence
-        self._instr.write('calculate1:selected:format %s' % self.format)
-
         measurement = self._instr.query('calculate1:selected:data:fdata?')
 
         if self.isTwoComponents():                                         # If two components, create list of containing both components
@@ -191,18 +195,17 @@ class Ttrvna(instr.Instrument):
         between each sweep. Logs data in three ways, text file, plot as 
         png, and csv.
 
-        The Conditionals with the trials is used because it usually takes
-        the VNA a trial to adjust to it the commanded settings.
-        So the first trial is not recorded until I find a better way to do this.
+        The measured parameter and format are configured before the sweep is
+        started, so every trial, including the first, is recorded.
         """
 
-        self._configInst()
-        self.setMeasuredRange()
+        with self._instr.lock:          # no other instance may use the VNA between configuring and reading
+            self._configInst()
+            self.setMeasuredRange()
         self.setFreqDomain()
-        if self._trial > 1:          # Ensures that the first trial is not recorded
-            self._createPlot()   # png
-            self._logger()       # txt
-            self._csvWriter()    # csv
+        self._createPlot()   # png
+        self._logger()       # txt
+        self._csvWriter()    # csv
         self._trial += 1
 
     
@@ -211,8 +214,9 @@ class Ttrvna(instr.Instrument):
         Same as makeSweep, but it does not process the data. It merely returns the data
         as a list.
         """
-        self._configInst()
-        self.setMeasuredRange()
+        with self._instr.lock:
+            self._configInst()
+            self.setMeasuredRange()
         self.setFreqDomain()
         if self.isTwoComponents():
             self._getMagnitudes()
@@ -247,28 +251,74 @@ class Ttrvna(instr.Instrument):
     def _configInst(self):
         """
         Configures the instrument to the constants specified
-        by the user.
+        by the user. Only the settings that changed since they were
+        last sent are written to the instrument, so calling this before
+        every sweep costs nothing once the instrument is set up. The
+        instrument is not reset; call resetInst() for that.
 
         Precondition: startFreqSweep < stopFreqSweep
         """
-        assert self.startFreqSweep < self.stopFreqSweep
+        assert self.unitConverter(self.startFreqSweep) < self.unitConverter(self.stopFreqSweep)
+
+        self._configSession()
+        self._applySetting('display:enable','display:enable 1')
+        self._applySetting('initiate1:continuous','initiate1:continuous off')     # sweep only when initiated
+        self._applySetting('sense1:frequency:start','sense1:frequency:start {}'.format(self.unitConverter(self.startFreqSweep)))
+        self._applySetting('sense1:frequency:stop','sense1:frequency:stop {}'.format(self.unitConverter(self.stopFreqSweep)))
+        self._applySetting('sense1:sweep:delay','sense1:sweep:delay {}'.format(self.unitConverter(self.sweepDelay)))
+        if self._applySetting('calculate1:parameter1:define','calculate1:parameter1:define {}'.format(self.sParam)):
+            self._instr.query('*opc?')      # wait for the trace to be redefined before it is selected and formatted
+        self._applySetting('calculate1:selected','calculate1:parameter1:select')
+        self._applySetting('calculate1:parameter1:format','calculate1:selected:format %s' % self.format)
 
+
+    def _configSession(self):
+        """
+        Sets up the communication with the instrument the first time
+        the session is used, by this or any other instance.
+        """
+        if self._instr.identity is not None:
+            return
         self._instr.timeout = 10000
         self._instr.encoding = 'latin_1'
         self._instr.write_termination = None
         self._instr.read_termination = '\n'
-        if self.trials is None or self._trial == 1:
-            print(self._instr.query('*idn?'))
+        print(self._instr.identify())
+
+
+    def _applySetting(self,setting,command):
+        """
+        Writes command to the instrument unless it is the same command that was
+        last sent for setting. 
+
+        Return: True if the command was written
+
+        Parameters:
+                setting : str : name of the instrument setting (e.g. 'sense1:frequency:start')
+                command : str : full SCPI command that puts setting in the wanted state
+        """
+        if self._instr.state.get(setting) == command:
+            return False
+        self._instr.write(command)
+        self._instr.state[setting] = command
+        return True
+
+
+    def resetInst(self):
+        """
+        Turns the instrument settings back to factory default and clears
+        its status. This is not done by the sweeps; call it explicitly
+        if the instrument may have been left in an unknown state (e.g. it was
+        used from the front panel). Every setting is sent again on the next sweep.
+        """
+        self._configSession()
         self._instr.write('*rst')   # turns instrument settings to factory default
         self._instr.write('*cls')   # Clears these analyzer status data structures: 
                                     # Event Queue, Status Byte Register (except the MAV bit), Standard Event Status Register (SESR)
 
         self._instr.write('abort')  # Aborts the current measurement and changes the trigger sequence to idle state for all channel
-
-        self._instr.write('display:enable 1')
-        self._instr.write('sense1:frequency:start {}'.format(self.unitConverter(self.startFreqSweep)))
-        self._instr.write('sense1:frequency:stop {}'.format(self.unitConverter(self.stopFreqSweep)))
-        self._instr.write('sense1:sweep:delay {}'.format(self.unitConverter(self.sweepDelay)))
+        self._instr.flush()         # reset now rather than with the next query
+        self._instr.state.clear()
 
 
     def _createPlot(self):